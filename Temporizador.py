@@ -1,10 +1,19 @@
-import tkinter as tk
-from tkinter.font import Font
-from time import sleep
-from threading import Thread, Event
+import time
+STARTUP_T0 = time.perf_counter() # Reference for --profile-startup
+
+from array import array
+import argparse
+import bisect
+import heapq
+import json
+import math
 import os
-import pygame
-from tkinter import messagebox
+import queue
+import re
+import select
+import signal
+import struct
+from threading import Thread, Event, Lock, Semaphore
 import sys
 import configparser
 
@@ -16,155 +25,13 @@ ICON = os.path.join(ICON_DIR, "icon_89.ico")
 ALARMA = os.path.join(ICON_DIR, "beep_beep.wav")
 CONFIG_FILE = os.path.join(MAIN_DIR, "config.ini")
 INSTRUCTIONS_FILE = os.path.join(MAIN_DIR, "instrucciones.txt")
+JOURNAL_FILE = os.path.join(MAIN_DIR, "temporizador.journal")
+LOCK_FILE = os.path.join(MAIN_DIR, "temporizador.lock")
+INSTANCE_FILE = os.path.join(MAIN_DIR, "temporizador.instance")
+LOG_FILE = os.path.join(MAIN_DIR, "temporizador.log")
+HISTORY_FILE = os.path.join(MAIN_DIR, "temporizador.history.sqlite")
 
-# Timer Thresholds
-WARNING_THRESHOLD_SECONDS_RED = 29
-WARNING_THRESHOLD_SECONDS_ORANGE = 59
-
-# Minimum Window Sizes
-MIN_WIDTH = 260
-MIN_HEIGHT = 95
-
-class Timer(tk.Frame):
-    """
-    A customizable desktop timer application with advanced window controls and
-    color customization via an INI file.
-    """
-    def __init__(self, parent):
-        self.root = parent
-
-        # --- Load Configuration ---
-        self.config_settings = self._load_config()
-        self.colors = self.config_settings['colors']
-        self.alarm_repeat_count = self.config_settings['alarm_repeat_count']
-        
-        tk.Frame.__init__(self, parent, bg=self.colors['bg_dark'])
-        
-        self.active = False
-        self.kill = False
-        self.playing = False
-        self.show_title = True
-        self.siempre_en_primer_plano = True
-
-        # --- Timer Variables ---
-        self.start_hours = tk.StringVar(value="0")
-        self.start_minutes = tk.StringVar(value="0")
-        self.start_seconds = tk.StringVar(value="0")
-        
-        self.start_hours.trace("w", lambda name, index, mode, var=self.start_hours: self._validate_time_input(var, 99))
-        self.start_minutes.trace("w", lambda name, index, mode, var=self.start_minutes: self._validate_time_input(var, 59))
-        self.start_seconds.trace("w", lambda name, index, mode, var=self.start_seconds: self._validate_time_input(var, 59))
-
-        self.hours_left = 0
-        self.minutes_left = 0
-        self.seconds_left = 0
-        self.time_remaining = "00:00:00"
-        self.clock = None
-
-        # --- UI Elements Creation ---
-        self._create_widgets()
-        self._pack_initial_widgets()
-
-        # --- Threading and Event Handling ---
-        self.update_event = Event()
-        self.thread = Thread(target=self._update_timer_loop, daemon=True)
-        self.thread.start()
-
-        # --- Window Event Bindings ---
-        self.resize_delay = None
-        self.last_height = 1
-        self.last_width = 1 # Initialize last_width
-        self.root.bind("<Configure>", self._on_window_resize)
-        self.root.bind("<Control-Up>", self._adjust_transparency)
-        self.root.bind("<Control-Down>", self._adjust_transparency)
-        self.root.bind("<Control-t>", self._toggle_title_bar)
-        self.root.bind("<Control-T>", self._toggle_title_bar)
-        self.root.bind("<Control-f>", self._toggle_always_on_top)
-        self.root.bind("<Control-F>", self._toggle_always_on_top)
-        
-        self.root.bind("<Button-1>", self._start_move)
-        self.root.bind("<B1-Motion>", self._do_move)
-        
-        self.root.bind("<ButtonPress-3>", self._start_resize)
-        self.root.bind("<B3-Motion>", self._do_resize)
-        self.root.bind("<ButtonRelease-3>", self._stop_resize)
-
-        self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
-
-        # Initialize pygame mixer once
-        try:
-            pygame.mixer.init()
-        except pygame.error as e:
-            messagebox.showerror("Error de Audio", f"No se pudo inicializar Pygame Mixer: {e}\nLa alarma podría no funcionar.")
-            self.alarm_enabled = False
-        else:
-            self.alarm_enabled = True
-            if not os.path.exists(ALARMA):
-                messagebox.showwarning("Advertencia", f"No se encontró el archivo de alarma: {ALARMA}\nLa alarma podría no funcionar.")
-                self.alarm_enabled = False
-
-        self.root.update_idletasks()
-        self._update_text_size()
-        self._create_instructions_file()
-
-    def _load_config(self):
-        """Loads configuration from config.ini or creates a default."""
-        config = configparser.ConfigParser()
-        
-        # Default color settings
-        default_colors = {
-            'bg_dark': "#2e2e2e",
-            'bg_lighter': "#363636",
-            'button_color': "#006f9c",
-            'button_active_color': "#185973",
-            'spinbox_text_color': "#006f9c",
-            'clock_color_normal': "white",
-            'clock_color_orange': "orange",
-            'clock_color_red': "red"
-        }
-        
-        # Default general settings
-        default_settings = {
-            'alarm_repeat_count': str(30) # Stored as string, convert to int later
-        }
-
-        # Combine for initial config object if file doesn't exist
-        full_config = configparser.ConfigParser()
-        full_config['Colors'] = default_colors
-        full_config['Settings'] = default_settings
-
-        if os.path.exists(CONFIG_FILE):
-            try:
-                config.read(CONFIG_FILE)
-                # Overwrite defaults with values from file
-                if 'Colors' in config:
-                    for key in default_colors:
-                        default_colors[key] = config['Colors'].get(key, default_colors[key])
-                if 'Settings' in config:
-                    for key in default_settings:
-                        default_settings[key] = config['Settings'].get(key, default_settings[key])
-            except Exception as e:
-                messagebox.showwarning("Error de Configuración", f"Error al leer config.ini: {e}. Usando valores por defecto.")
-        else:
-            # Create default config file if it doesn't exist
-            try:
-                with open(CONFIG_FILE, 'w') as f:
-                    full_config.write(f)
-            except Exception as e:
-                messagebox.showwarning("Error de Archivo", f"No se pudo crear config.ini: {e}. Continuará sin archivo de configuración.")
-        
-        # Return parsed settings
-        return {
-            'colors': default_colors,
-            'alarm_repeat_count': int(default_settings['alarm_repeat_count'])
-        }
-
-    def _create_instructions_file(self):
-        """Creates the instructions.txt file if it doesn't exist."""
-        if not os.path.exists(INSTRUCTIONS_FILE):
-            try:
-                with open(INSTRUCTIONS_FILE, 'w', encoding='utf-8') as f:
-                    f.write("""
+INSTRUCTIONS_TEXT = """
 ###################################################
 #            INSTRUCCIONES DE USO                 #
 #          Temporizador Personalizable            #
@@ -222,14 +89,57 @@ Este programa es un temporizador de cuenta regresiva que puedes ajustar a tus ne
         * `button_active_color`: Color de fondo de los botones cuando pasas el ratón por encima (estado activo).
         * `spinbox_text_color`: Color de los números en los campos de Horas/Minutos/Segundos.
         * `clock_color_normal`: Color del texto del reloj cuando hay mucho tiempo restante.
-        * `clock_color_orange`: Color del texto del reloj cuando el tiempo restante es menor a un umbral (por defecto, menos de 1 minuto).
-        * `clock_color_red`: Color del texto del reloj cuando el tiempo restante es muy bajo (por defecto, menos de 30 segundos) y cuando la alarma está sonando.
+        * `clock_color_orange`: Color del texto del reloj cuando el tiempo restante es menor a un umbral (por defecto, menos de 1 minuto; ver [Thresholds]).
+        * `clock_color_red`: Color del texto del reloj cuando el tiempo restante es muy bajo (por defecto, menos de 30 segundos; ver [Thresholds]) y cuando la alarma está sonando.
 
     * SECCIÓN [Settings]:
         * `alarm_repeat_count`: Número de veces que la alarma sonará cuando el temporizador llegue a cero. Por defecto es `30`. Puedes cambiar este número a tu gusto.
+        * `suspend_aware`: Si es `yes` (por defecto), el tiempo que el equipo pase suspendido se descuenta de la cuenta regresiva; si el plazo venció durante la suspensión, la alarma suena al reanudar. Con `no`, la cuenta se congela mientras el equipo duerme.
+        * `control_socket`: Ruta de un socket Unix para controlar el temporizador desde otros programas (solo Linux/macOS). Vacío (por defecto) lo desactiva.
+        * `single_instance`: Con `yes`, abrir el programa de nuevo no crea otro proceso: el programa que ya está abierto muestra una ventana de temporizador nueva. Por defecto es `no`.
+        * `display_precision`: Decimales que muestra el reloj: `0` (segundos), `1` (décimas) o `2` (centésimas). Por defecto es `0`. Con la ventana minimizada el reloj se actualiza solo una vez por segundo.
+        * `clock_renderer`: Con `canvas`, el reloj se dibuja con dígitos pre-renderizados y en cada segundo solo se redibujan los que cambian, lo que aligera las ventanas muy grandes (pantallas 4K). Por defecto es `label`.
+        * `terminal_alarm_command`: Comando que suena como alarma en el modo `--terminal` (por ejemplo `paplay alarma.wav`). Vacío (por defecto) usa el timbre de la terminal.
+        * `sync_role`: Sincroniza varias pantallas en la red local. Con `source`, este programa publica su cuenta regresiva; con `follower`, muestra la del programa `source` (iniciar, pausar y cancelar incluidos), con unos pocos milisegundos de diferencia. Por defecto es `off`.
+        * `sync_group`: Grupo multicast y puerto que comparten el `source` y los `follower`. Por defecto es `239.255.42.99:47999`.
+        * `sequence_cue`: Con `yes` (por defecto), al empezar cada etapa de una secuencia suena un fragmento corto de la alarma. Con `no`, las etapas cambian en silencio.
+        * `action_timeout`: Segundos que puede durar cada acción de la sección [Actions] antes de cancelarse. Por defecto es `30`.
+        * `action_workers`: Número de acciones que pueden ejecutarse a la vez. Por defecto es `2`.
+
+    * SECCIÓN [Presets]:
+        * Preajustes con nombre para iniciar sin pasar por la pantalla de configuración, en la forma `nombre = duración`.
+        * Ejemplo: `te = 3m`, `pomodoro = 25m`, `reunion = 1h30m` (también se acepta `1:30:00` o un número de segundos).
+
+    * SECCIÓN [Sequences] (opcional):
+        * Secuencias de temporizadores encadenados (Pomodoro, entrenamiento por intervalos), en la forma `nombre = etapa, etapa, ...`. Cada etapa es `nombre duración`; el nombre es opcional.
+        * Un grupo entre paréntesis seguido de `xN` se repite N veces. Ejemplo: `pomodoro = (trabajo 25m, descanso 5m) x4, descanso largo 15m`.
+        * Cada etapa empieza justo cuando termina la anterior, sin pasar por la pantalla de configuración; la alarma suena solo al final de la última etapa.
+        * Se inicia con `--sequence nombre`.
+
+    * SECCIÓN [Thresholds]:
+        * Etapas de aviso antes del final, en la forma `duración = color, opciones`. Cada etapa empieza cuando el tiempo restante llega a esa duración.
+        * El color puede ser un color o el nombre de una clave de [Colors]. Opciones: `blink` (el reloj parpadea), `sound` (suena la alarma una vez) y `action: tipo: argumento` (una acción como las de [Actions]; debe ir al final).
+        * Ejemplo: `10m = yellow`, `5m = orange`, `1m = red, sound`, `10s = red, blink, action: command: notify-send "10 segundos"`.
+        * Por defecto: `59s = clock_color_orange` y `29s = clock_color_red`. Usa duraciones como `1m` o `90s` (no `1:00`).
+
+    * SECCIÓN [Schedules] (opcional):
+        * Reglas para que el temporizador se active solo a ciertas horas, en la forma `nombre = regla`. El programa debe estar abierto.
+        * `salida = at 17:30 on mon-fri`: Suena la alarma a las 17:30 de lunes a viernes. Se pueden poner varias horas: `at 08:00, 13:00`.
+        * `pausa = every 45m from 09:00 to 18:00 on lun-vie start 5m`: Cada 45 minutos entre las 09:00 y las 18:00 abre un temporizador de 5 minutos.
+        * Días: `mon tue wed thu fri sat sun` o `lun mar mie jue vie sab dom`, separados por comas o como rango (`mon-fri`). Sin `on`, todos los días.
+        * Los cambios de horario de verano y los ajustes del reloj se respetan: cada regla suena a su hora local.
+
+    * SECCIÓN [Actions] (opcional):
+        * Acciones que se ejecutan en segundo plano cuando el temporizador llega a cero, en la forma `nombre = tipo: argumento`.
+        * `aviso = command: notify-send "Tiempo cumplido"`: Ejecuta un comando.
+        * `apagar = shutdown` / `dormir = suspend`: Apaga o suspende el equipo.
+        * `registro = file: C:\\ruta\\fin.txt`: Añade una línea al archivo.
+        * `webhook = http: http://127.0.0.1:8080/fin`: Envía un POST con los datos del evento.
+        * El resultado de cada acción se registra en `temporizador.log`.
 
     * IMPORTANTE:
-        * Después de realizar cambios en `config.ini`, **debes cerrar y volver a abrir el programa** para que los nuevos valores surtan efecto.
+        * Los cambios en `config.ini` se aplican solos mientras el programa está abierto, sin reiniciarlo. Solo `control_socket`, `single_instance` y `clock_renderer` requieren cerrar y volver a abrir el programa.
+        * Si al recargar un valor no es válido, se ignora ese valor y se conserva el anterior; el resto del archivo se aplica igualmente.
         * Asegúrate de que los valores de color sean válidos (códigos hexadecimales de 6 dígitos o nombres de colores web).
         * Asegúrate de que los valores de la sección `[Settings]` sean números enteros válidos. Un valor inválido puede causar errores.
 
@@ -243,6 +153,8 @@ Este programa es un temporizador de cuenta regresiva que puedes ajustar a tus ne
     * CONTROL + FLECHA ABAJO: Disminuye la transparencia de la ventana (se vuelve más transparente).
     * CONTROL + T: (Alternar) Muestra u oculta la barra de título de la ventana.
     * CONTROL + F: (Alternar) Activa o desactiva la función "Siempre en primer plano" (la ventana se mantendrá siempre visible sobre otras).
+    * CONTROL + M: (Alternar) Muestra u oculta las estadísticas de precisión (retraso de cada tick, tiempo de dibujo y demora de la alarma: mediana, p99 y máximo).
+    * CONTROL + D: (Alternar) Cambia el reloj entre segundos, décimas (00:00:00.0) y centésimas (00:00:00.00).
 
     * ARRASTRAR VENTANA:
         * Haz clic y arrastra con el **botón izquierdo del ratón** en cualquier parte de la ventana para moverla.
@@ -252,435 +164,2979 @@ Este programa es un temporizador de cuenta regresiva que puedes ajustar a tus ne
 
 ---
 
+4.  INICIO RÁPIDO (LÍNEA DE COMANDOS)
+
+    * `--start 1h30m`: Inicia la cuenta regresiva de inmediato con esa duración.
+    * `--preset te`: Inicia de inmediato el preajuste `te` de la sección [Presets].
+    * `--sequence pomodoro`: Inicia de inmediato la secuencia `pomodoro` de la sección [Sequences]. El nombre de la etapa actual se muestra sobre el reloj.
+    * `--stopwatch`: Abre un cronómetro. ESPACIO inicia o pausa, ENTER o L marca una vuelta y R lo reinicia.
+      Las vueltas se guardan mientras se marcan en `vueltas-AAAAMMDD-HHMMSS.csv`, junto al programa
+      (columnas: numero, vuelta_ns, total_ns, vuelta, total).
+    * `--terminal`: Muestra el temporizador en la terminal, sin ventana (útil por SSH). Se combina con `--start` o `--preset`; sin ellos pregunta la duración.
+      Teclas: ESPACIO pausa o reanuda, Q cancela y sale; cualquier tecla detiene la alarma.
+    * `--stats`: Muestra por día cuántos temporizadores se usaron, el tiempo total y cuántos terminaron o se cancelaron.
+      Se puede limitar con `--since 2026-01-01` y `--until 2026-02-01`. El historial se guarda en `temporizador.history.sqlite`.
+    * `--metrics-dump [RUTA]`: Al cerrar el programa, escribe las estadísticas de precisión (las de CONTROL + M) en RUTA o en la consola.
+
+---
+
 ¡Disfruta de tu temporizador!
-""")
-            except Exception as e:
-                messagebox.showwarning("Error de Archivo", f"No se pudo crear instrucciones.txt: {e}")
-
-    def _create_widgets(self):
-        """Creates all the Tkinter widgets for the application."""
-        self.spinbox_frame = tk.Frame(self, bg=self.colors['bg_dark'])
-        
-        self.hours_frame = tk.LabelFrame(self.spinbox_frame, text="Horas:", fg="white", bg=self.colors['bg_lighter'])
-        self.hours_select = tk.Spinbox(self.hours_frame, from_=0, to=99, width=2, textvariable=self.start_hours, 
-                                       font=Font(family='Helvetica', size=34, weight='bold'),
-                                       bg=self.colors['bg_dark'], fg=self.colors['spinbox_text_color'], justify='center', wrap=True)
-        
-        self.minutes_frame = tk.LabelFrame(self.spinbox_frame, text="Minutos:", fg="white", bg=self.colors['bg_lighter'])
-        self.minutes_select = tk.Spinbox(self.minutes_frame, from_=0, to=59, textvariable=self.start_minutes,
-                                         font=Font(family='Helvetica', size=34, weight='bold'),
-                                         width=2, bg=self.colors['bg_dark'], fg=self.colors['spinbox_text_color'], justify='center', wrap=True)
-        
-        self.seconds_frame = tk.LabelFrame(self.spinbox_frame, text="Segundos:", fg="white", bg=self.colors['bg_lighter'])
-        self.seconds_select = tk.Spinbox(self.seconds_frame, from_=0, to=59, textvariable=self.start_seconds,
-                                         font=Font(family='Helvetica', size=34, weight='bold'),
-                                         width=2, bg=self.colors['bg_dark'], fg=self.colors['spinbox_text_color'], justify='center', wrap=True)
-
-        self.button_frame = tk.Frame(self, bg=self.colors['bg_dark'])
-        self.active_button = tk.Button(self.button_frame, text="Iniciar", command=self.start, 
-                                       bg=self.colors['button_color'], fg="white", relief="raised", anchor="center", 
-                                       activebackground=self.colors['button_active_color'])
-        self.stop_button = tk.Button(self.button_frame, text="Cancelar", command=self.stop, 
-                                     bg=self.colors['button_color'], fg="white", relief="raised", anchor="center", 
-                                     activebackground=self.colors['button_active_color'])
-        self.pause_button = tk.Button(self.button_frame, text="  Pausar   ", command=self.pause, 
-                                      bg=self.colors['button_color'], fg="white", relief="raised", anchor="center", 
-                                      activebackground=self.colors['button_active_color'])
-        
-        self.clock = tk.Label(self, text=self.time_remaining, font=Font(family='Helvetica', size=36, weight='bold'), bg=self.colors['bg_dark'], fg=self.colors['clock_color_normal'])
-        self.clock.bind("<Double-Button-1>", self._toggle_buttons_visibility)
-
-    def _pack_initial_widgets(self):
-        """Packs the initial widgets for the timer setup phase."""
-        self.spinbox_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=5)
-        self.hours_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=1, padx=2, pady=2)
-        self.minutes_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=1, padx=2, pady=2)
-        self.seconds_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=1, padx=2, pady=2)
-        self.hours_select.pack(fill=tk.BOTH, expand=4)
-        self.minutes_select.pack(fill=tk.BOTH, expand=4)
-        self.seconds_select.pack(fill=tk.BOTH, expand=4)
-
-        self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
-        self.active_button.pack(fill=tk.BOTH, expand=1)
-
-    def _validate_time_input(self, var, max_val):
+"""
+# Written in binary so the on-disk check does not depend on newline translation
+INSTRUCTIONS_BYTES = INSTRUCTIONS_TEXT.replace("\n", os.linesep).encode('utf-8')
+
+# Colors used for the [Colors] keys that config.ini does not set (or sets to
+# something Tk does not accept)
+DEFAULT_COLORS = {
+    'bg_dark': "#2e2e2e",
+    'bg_lighter': "#363636",
+    'button_color': "#006f9c",
+    'button_active_color': "#185973",
+    'spinbox_text_color': "#006f9c",
+    'clock_color_normal': "white",
+    'clock_color_orange': "orange",
+    'clock_color_red': "red"
+}
+
+# Warning stages used when config.ini has no [Thresholds] section: the clock
+# turns orange from 59 s left and red from 29 s left. A stage color may name a
+# [Colors] key, so customized clock colors keep working.
+DEFAULT_THRESHOLDS = {
+    '59s': 'clock_color_orange',
+    '29s': 'clock_color_red'
+}
+BLINK_INTERVAL_MS = 500
+SEQUENCE_CUE_MS = 1500 # Length of the alarm excerpt that marks a new sequence stage
+SEQUENCE_MAX_REPEATS = 99
+
+# Minimum Window Sizes
+MIN_WIDTH = 260
+MIN_HEIGHT = 95
+
+NS_PER_SECOND = 1_000_000_000
+
+# A gap between the suspend-inclusive clock and the monotonic clock larger than
+# this is treated as a system suspend. The wall-clock fallback needs more slack
+# because NTP may slew it.
+SUSPEND_GAP_NS = 250_000_000
+SUSPEND_GAP_WALL_NS = 2 * NS_PER_SECOND
+
+# Geometry updates while dragging are coalesced to at most one per frame
+FRAME_INTERVAL_MS = 16
+
+# Digits shown after the seconds in each display precision (0 = HH:MM:SS)
+DISPLAY_PRECISIONS = (0, 1, 2)
+
+# State journal: buffered records are fsync'ed together after this delay, and the
+# file is compacted to the live timers once it holds this many records
+JOURNAL_FLUSH_MS = 1000
+JOURNAL_COMPACT_RECORDS = 256
+# Processes running at once that each get their own journal file
+JOURNAL_MAX_INSTANCES = 8
+
+# Control API: longest accepted countdown and the largest backlog a slow
+# subscriber may accumulate before it is disconnected
+MAX_DURATION_SECONDS = 99 * 3600 + 59 * 60 + 59
+CONTROL_MAX_BUFFER = 256 * 1024
+
+# Single instance: how long a forwarded launch waits for the running process to
+# open it before it is acknowledged anyway (it stays queued)
+SINGLE_INSTANCE_ACK_S = 1.5
+
+# config.ini watching: inotify events are coalesced for this long, and without
+# inotify the file's mtime and size are checked at this interval
+CONFIG_DEBOUNCE_MS = 200
+CONFIG_POLL_MS = 2000
+
+# Expiry actions: kinds accepted in the [Actions] section and how many may wait
+# for a worker (per worker) before new ones are dropped
+ACTION_KINDS = ('command', 'shutdown', 'suspend', 'file', 'http')
+ACTION_QUEUE_PER_WORKER = 4
+
+# pygame is imported on a worker thread after the first frame; the Tk thread
+# checks at this interval whether it is ready
+AUDIO_POLL_MS = 50
+
+# Maximum number of tkinter Font objects kept alive by FontCache
+FONT_CACHE_SIZE = 24
+
+# Terminal frontend: 3x5 block glyphs for the large clock, and the curses color
+# of each basic color name (other colors are matched by their RGB bits)
+BIG_GLYPHS = {
+    '0': ("███", "█ █", "█ █", "█ █", "███"), '1': ("  █", "  █", "  █", "  █", "  █"),
+    '2': ("███", "  █", "███", "█  ", "███"), '3': ("███", "  █", "███", "  █", "███"),
+    '4': ("█ █", "█ █", "███", "  █", "  █"), '5': ("███", "█  ", "███", "  █", "███"),
+    '6': ("███", "█  ", "███", "█ █", "███"), '7': ("███", "  █", "  █", "  █", "  █"),
+    '8': ("███", "█ █", "███", "█ █", "███"), '9': ("███", "█ █", "███", "  █", "███"),
+    ':': (" ", "█", " ", "█", " ")
+}
+TERMINAL_COLORS = {'black': 0, 'red': 1, 'green': 2, 'yellow': 3, 'orange': 3, 'blue': 4,
+                   'magenta': 5, 'purple': 5, 'cyan': 6, 'white': 7}
+
+# Schedules: the longest the schedule job sleeps before re-reading the wall
+# clock, so a clock change or a suspend is noticed within this time
+SCHEDULE_RECHECK_MS = 60_000
+
+# Stopwatch: redraws of the running clock are at least this far apart, and lap
+# lines are flushed to the CSV file after this many laps (and on pause/close)
+STOPWATCH_FRAME_MS = 33
+LAPS_FLUSH_EVERY = 64
+
+# Display sync: state heartbeat of the source, clock probes of each follower
+# (a burst on joining, then one per interval) and the deadline error a
+# follower tolerates before re-aiming its countdown
+SYNC_DEFAULT_GROUP = "239.255.42.99:47999"
+SYNC_HEARTBEAT_MS = 1000
+SYNC_PROBE_BURST = 8
+SYNC_PROBE_INTERVAL_S = 10
+SYNC_TOLERANCE_NS = 2_000_000
+
+# Tick instrumentation: samples kept per series, and how often the overlay refreshes
+METRICS_SAMPLES = 4096
+METRICS_OVERLAY_MS = 1000
+
+# Slot states of the multi-timer table
+SLOT_FREE = 0
+SLOT_RUNNING = 1
+SLOT_PAUSED = 2
+SLOT_EXPIRED = 3
+
+class MonotonicClock:
+    """
+    Default time source of the countdown engine: time.monotonic_ns().
+    Any object with a now_ns() method can be used instead.
+    """
+    if hasattr(time, 'CLOCK_BOOTTIME'):
+        # Linux: CLOCK_BOOTTIME keeps counting while suspended, CLOCK_MONOTONIC does not
+        suspend_gap_ns = SUSPEND_GAP_NS
+
+        def since_boot_ns(self):
+            """Returns a time that keeps advancing while the system is suspended."""
+            return time.clock_gettime_ns(time.CLOCK_BOOTTIME)
+    else:
+        suspend_gap_ns = SUSPEND_GAP_WALL_NS
+
+        def since_boot_ns(self):
+            """Returns a time that keeps advancing while the system is suspended."""
+            return time.time_ns()
+
+    def now_ns(self):
+        """Returns the current monotonic time in nanoseconds."""
+        return time.monotonic_ns()
+
+class FakeClock:
+    """
+    Virtual clock that only moves when advanced, so countdowns can be fast-forwarded.
+    """
+    suspend_gap_ns = SUSPEND_GAP_NS
+
+    def __init__(self, start_ns=0):
+        self.now = start_ns
+        self.suspended = 0
+
+    def now_ns(self):
+        """Returns the current virtual time in nanoseconds."""
+        return self.now
+
+    def since_boot_ns(self):
+        """Returns the virtual time including simulated suspends."""
+        return self.now + self.suspended
+
+    def advance(self, ns):
+        """Moves the virtual time forward."""
+        self.now += ns
+
+    def suspend(self, ns):
+        """Simulates a system suspend: only the suspend-inclusive time moves."""
+        self.suspended += ns
+
+class VirtualScheduler:
+    """
+    Headless stand-in for Tk's after()/after_cancel() driven by a FakeClock. It lets
+    the tick scheduling run without Tk and much faster than real time, and counts
+    every wakeup. `lateness_ns` may return extra delay to simulate a busy machine.
+    """
+    def __init__(self, clock, lateness_ns=None):
+        self.clock = clock
+        self.lateness_ns = lateness_ns
+        self.queue = []
+        self.cancelled = set()
+        self.next_job = 0
+        self.wakeups = 0
+
+    def after(self, ms, func, *args):
+        """Schedules `func(*args)` after `ms` virtual milliseconds and returns a job ID."""
+        self.next_job += 1
+        heapq.heappush(self.queue, (self.clock.now_ns() + ms * 1_000_000, self.next_job, func, args))
+        return self.next_job
+
+    def after_cancel(self, job):
+        """Cancels a scheduled job."""
+        self.cancelled.add(job)
+
+    def run_until(self, end_ns):
+        """Runs every job due before `end_ns`, advancing the clock to each one."""
+        queue = self.queue
+        while queue and queue[0][0] <= end_ns:
+            when, job, func, args = heapq.heappop(queue)
+            if job in self.cancelled:
+                self.cancelled.discard(job)
+                continue
+            if self.lateness_ns is not None:
+                when += self.lateness_ns()
+            self.clock.now = max(self.clock.now, when)
+            self.wakeups += 1
+            func(*args)
+        self.clock.now = max(self.clock.now, end_ns)
+
+    def run_for(self, ns):
+        """Runs the jobs due in the next `ns` virtual nanoseconds."""
+        self.run_until(self.clock.now_ns() + ns)
+
+    def jump(self, ns):
         """
-        Validates spinbox input to ensure it's numeric and within bounds.
+        Moves the clock `ns` forward at once, as if nothing could run meanwhile,
+        then runs the jobs that became due. A countdown derived from its deadline
+        catches up in one wakeup instead of one per skipped second.
         """
-        current_val = var.get()
-        cleaned_val = "".join(filter(str.isdigit, current_val))
-        
-        if not cleaned_val:
-            var.set("0")
-            return
+        self.clock.advance(ns)
+        self.run_until(self.clock.now_ns())
 
-        try:
-            num_val = int(cleaned_val)
-            if num_val > max_val:
-                var.set(str(max_val))
-            elif num_val < 0:
-                var.set("0")
-            else:
-                var.set(str(num_val))
-        except ValueError:
-            var.set("0")
+class SelectScheduler:
+    """
+    Real-time after()/after_cancel() on a select() loop, for frontends that run
+    without Tk. File descriptors registered with add_reader() wake the loop; the
+    rest of the time it sleeps until the next job is due.
+    """
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.queue = []
+        self.cancelled = set()
+        self.next_job = 0
+        self.readers = {}
+        self.running = False
+
+    def after(self, ms, func, *args):
+        """Schedules `func(*args)` after `ms` milliseconds and returns a job ID."""
+        self.next_job += 1
+        heapq.heappush(self.queue, (self.clock.now_ns() + ms * 1_000_000, self.next_job, func, args))
+        return self.next_job
+
+    def after_cancel(self, job):
+        """Cancels a scheduled job."""
+        self.cancelled.add(job)
+
+    def add_reader(self, fd, callback):
+        """Calls `callback()` whenever `fd` becomes readable."""
+        self.readers[fd] = callback
+
+    def run(self):
+        """Runs until stop() is called."""
+        queue = self.queue
+        self.running = True
+        while self.running:
+            while queue and queue[0][1] in self.cancelled:
+                self.cancelled.discard(heapq.heappop(queue)[1])
+            timeout = max(0, (queue[0][0] - self.clock.now_ns()) / NS_PER_SECOND) if queue else None
+            try:
+                ready, _, _ = select.select(list(self.readers), [], [], timeout)
+            except InterruptedError:
+                ready = []
+            for fd in ready:
+                self.readers[fd]()
+            now = self.clock.now_ns()
+            while self.running and queue and queue[0][0] <= now:
+                _, job, func, args = heapq.heappop(queue)
+                if job in self.cancelled:
+                    self.cancelled.discard(job)
+                    continue
+                func(*args)
+
+    def stop(self):
+        """Makes run() return after the current callback."""
+        self.running = False
 
-    def _update_timer_loop(self):
+class Countdown:
+    """
+    Countdown engine anchored to a single absolute monotonic deadline.
+    Remaining time is always derived from the deadline instead of being accumulated
+    tick by tick, so scheduler jitter never adds up over long countdowns.
+
+    When `suspend_aware` is set, a suspend-inclusive clock is tracked alongside the
+    monotonic one; time the system spent asleep is subtracted from the deadline
+    in one step the next time the countdown is read.
+    """
+    def __init__(self, clock=None, suspend_aware=False):
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.suspend_aware = suspend_aware
+        self.deadline_ns = 0
+        self.paused_remaining_ns = 0
+        self.running = False
+        self.anchor_ns = 0
+        self.anchor_boot_ns = 0
+
+    def _anchor(self):
+        """Records both clocks so a later suspend gap can be measured."""
+        if self.suspend_aware:
+            self.anchor_ns = self.clock.now_ns()
+            self.anchor_boot_ns = self.clock.since_boot_ns()
+
+    def reconcile(self):
         """
-        Runs in a separate thread to update the timer countdown.
+        Moves the deadline earlier by any suspend time since the last check.
+        Returns the detected gap in nanoseconds (0 if there was none).
         """
-        while not self.kill:
-            self.update_event.wait()
-            
-            if self.active and self.clock is not None:
-                if self.hours_left + self.minutes_left + self.seconds_left > 0:
-                    self._update_clock_display()
-                    sleep(1)
-                    if self.seconds_left > 0:
-                        self.seconds_left -= 1
-                    elif self.minutes_left > 0:
-                        self.seconds_left = 59
-                        self.minutes_left -= 1
-                    elif self.hours_left > 0:
-                        self.minutes_left = 59
-                        self.hours_left -= 1
-                else:
-                    self._timer_end()
-            else:
-                sleep(0.1)
+        if not (self.suspend_aware and self.running):
+            return 0
+        now = self.clock.now_ns()
+        boot = self.clock.since_boot_ns()
+        gap = (boot - self.anchor_boot_ns) - (now - self.anchor_ns)
+        self.anchor_ns = now
+        self.anchor_boot_ns = boot
+        if gap > self.clock.suspend_gap_ns:
+            self.deadline_ns -= gap
+            return gap
+        return 0
+
+    def start(self, duration_seconds):
+        """Starts counting down from the given number of seconds."""
+        self.start_ns(duration_seconds * NS_PER_SECOND)
+
+    def start_ns(self, duration_ns):
+        """Starts counting down from the given number of nanoseconds."""
+        self.deadline_ns = self.clock.now_ns() + duration_ns
+        self.paused_remaining_ns = 0
+        self.running = True
+        self._anchor()
+
+    def start_after_ns(self, previous_deadline_ns, duration_ns):
+        """
+        Starts counting down to `duration_ns` after an earlier deadline instead of
+        after now, so back-to-back countdowns do not drift by the handling delay.
+        """
+        self.deadline_ns = previous_deadline_ns + duration_ns
+        self.paused_remaining_ns = 0
+        self.running = True
+        self._anchor()
+
+    def pause(self):
+        """Freezes the countdown, keeping the remaining nanoseconds."""
+        if self.running:
+            self.reconcile()
+            self.paused_remaining_ns = max(0, self.deadline_ns - self.clock.now_ns())
+            self.running = False
 
-    def _update_clock_display(self):
+    def resume(self):
+        """Continues a paused countdown with a new deadline."""
+        if not self.running and self.paused_remaining_ns > 0:
+            self.deadline_ns = self.clock.now_ns() + self.paused_remaining_ns
+            self.paused_remaining_ns = 0
+            self.running = True
+            self._anchor()
+
+    def stop(self):
+        """Discards the current countdown."""
+        self.running = False
+        self.deadline_ns = 0
+        self.paused_remaining_ns = 0
+
+    def set_deadline_ns(self, deadline_ns):
+        """Moves the deadline of a running countdown (e.g. to follow a sync source)."""
+        if self.running:
+            self.deadline_ns = deadline_ns
+            self._anchor()
+
+    def set_paused_ns(self, remaining_ns):
+        """Replaces the time left of a paused countdown."""
+        if not self.running:
+            self.paused_remaining_ns = max(0, remaining_ns)
+
+    def remaining_ns(self):
+        """Returns the remaining time in nanoseconds (never negative)."""
+        if self.running:
+            self.reconcile()
+            return max(0, self.deadline_ns - self.clock.now_ns())
+        return self.paused_remaining_ns
+
+    def remaining_seconds(self):
+        """Returns the remaining whole seconds, rounded up as shown on the clock."""
+        return -(-self.remaining_ns() // NS_PER_SECOND)
+
+    def wall_deadline_ns(self):
+        """Returns the deadline as wall-clock time, which survives a reboot."""
+        return time.time_ns() + self.remaining_ns()
+
+    def time_to_next_tick(self, unit_ns=NS_PER_SECOND):
+        """Returns the seconds until the displayed value (in steps of `unit_ns`) changes next."""
+        remaining = self.remaining_ns()
+        if remaining <= 0:
+            return 0
+        return (remaining % unit_ns or unit_ns) / NS_PER_SECOND
+
+class TickMetrics:
+    """
+    Fixed-size ring buffers of timing samples in nanoseconds, one per series:
+
+        lateness  how long after the scheduled instant a tick actually ran
+        render    time spent updating the clock in a tick or frame
+        alarm     delay from the deadline to the alarm starting
+
+    Recording is one clock read and one array store; percentiles are only
+    computed when a summary is requested. One instance is shared per process.
+    """
+    SERIES = ('lateness', 'render', 'alarm')
+    instance = None
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide metrics, creating them on first use."""
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    def __init__(self, size=METRICS_SAMPLES):
+        self.size = size
+        self.samples = {name: array('q', bytes(8 * size)) for name in self.SERIES}
+        self.counts = dict.fromkeys(self.SERIES, 0)
+
+    def record(self, series, value_ns):
+        """Stores one sample, overwriting the oldest once the ring is full."""
+        count = self.counts[series]
+        self.samples[series][count % self.size] = value_ns
+        self.counts[series] = count + 1
+
+    def summary(self):
+        """Returns {series: (samples, p50_ns, p99_ns, max_ns)} for the series with data."""
+        result = {}
+        for name in self.SERIES:
+            count = min(self.counts[name], self.size)
+            if count:
+                values = sorted(self.samples[name][:count])
+                result[name] = (self.counts[name], values[(count - 1) // 2], values[(count * 99 - 1) // 100], values[-1])
+        return result
+
+    def format(self):
+        """Returns the summary as text lines in milliseconds."""
+        labels = {'lateness': "Retraso del tick", 'render': "Dibujo", 'alarm': "Fin → alarma"}
+        lines = [f"{labels[name]}: p50 {p50 / 1e6:.2f} ms · p99 {p99 / 1e6:.2f} ms · máx {peak / 1e6:.2f} ms ({count})"
+                 for name, (count, p50, p99, peak) in self.summary().items()]
+        return "\n".join(lines) or "Sin muestras todavía."
+
+class CountdownRunner:
+    """
+    Drives a Countdown from any after()/after_cancel() scheduler, such as the Tk root
+    or a VirtualScheduler: one wakeup per displayed second, none while idle or paused.
+    """
+    def __init__(self, scheduler, countdown, on_tick, on_expire, metrics=None):
+        self.scheduler = scheduler
+        self.countdown = countdown
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.metrics = metrics
+        self.job = None
+        self.due_ns = 0 # Instant the pending tick is meant for
+        self.expired_deadline_ns = 0 # Deadline of the last countdown that expired
+
+    def start(self, duration_seconds):
+        """Starts the countdown and reports the first value right away."""
+        self.start_ns(duration_seconds * NS_PER_SECOND)
+
+    def start_ns(self, duration_ns):
+        """Starts the countdown from a duration in nanoseconds."""
+        self.countdown.start_ns(duration_ns)
+        self._on_tick()
+
+    def skip_ended_ns(self, durations_ns):
         """
-        Updates the clock display and changes its color based on remaining time.
+        Counts the leading `durations_ns` that, chained from the deadline that
+        just expired, have already ended too (after a suspend or a stalled main
+        loop), and moves the expired deadline past them, so chain_ns() starts
+        the first one still running instead of expiring once per ended one.
         """
-        if self.clock:
-            hours = f"{self.hours_left:02}"
-            minutes = f"{self.minutes_left:02}"
-            seconds = f"{self.seconds_left:02}"
-            self.time_remaining = f"{hours}:{minutes}:{seconds}"
-            self.clock.config(text=self.time_remaining)
-
-            total_seconds = self.hours_left * 3600 + self.minutes_left * 60 + self.seconds_left
-            if total_seconds <= WARNING_THRESHOLD_SECONDS_RED:
-                self.clock.config(fg=self.colors['clock_color_red'])
-            elif total_seconds <= WARNING_THRESHOLD_SECONDS_ORANGE:
-                self.clock.config(fg=self.colors['clock_color_orange'])
-            else:
-                self.clock.config(fg=self.colors['clock_color_normal'])
+        now = self.countdown.clock.now_ns()
+        skipped = 0
+        for duration_ns in durations_ns:
+            if self.expired_deadline_ns + duration_ns > now:
+                break
+            self.expired_deadline_ns += duration_ns
+            skipped += 1
+        return skipped
+
+    def chain_ns(self, duration_ns):
+        """Starts a countdown of `duration_ns` from the deadline that just expired."""
+        self.countdown.start_after_ns(self.expired_deadline_ns, duration_ns)
+        self._on_tick()
 
-    def _timer_end(self):
+    def pause(self):
+        """Pauses the countdown; nothing stays scheduled."""
+        self.countdown.pause()
+        self.cancel()
+
+    def resume(self):
+        """Resumes the countdown and schedules the next tick."""
+        self.countdown.resume()
+        self._schedule()
+
+    def stop(self):
+        """Discards the countdown and its pending tick."""
+        self.countdown.stop()
+        self.cancel()
+
+    def reschedule(self):
+        """Re-aims the pending tick after the countdown's deadline moved."""
+        self._schedule()
+
+    def cancel(self):
+        """Cancels the pending tick, if any."""
+        if self.job is not None:
+            self.scheduler.after_cancel(self.job)
+            self.job = None
+
+    def _schedule(self):
+        """Schedules the next tick at the next whole-second boundary."""
+        self.cancel()
+        if self.countdown.running:
+            delay = self.countdown.time_to_next_tick()
+            self.due_ns = self.countdown.clock.now_ns() + int(delay * NS_PER_SECOND)
+            self.job = self.scheduler.after(max(1, math.ceil(delay * 1000)), self._on_tick)
+
+    def _on_tick(self):
+        self.job = None
+        if not self.countdown.running:
+            return
+        if self.metrics is not None and self.due_ns:
+            self.metrics.record('lateness', self.countdown.clock.now_ns() - self.due_ns)
+            self.due_ns = 0
+        remaining = self.countdown.remaining_seconds()
+        if remaining > 0:
+            self.on_tick(remaining)
+            self._schedule()
+        else:
+            self.expired_deadline_ns = self.countdown.deadline_ns
+            self.countdown.stop()
+            self.on_expire()
+
+class TimerEngine:
+    """
+    The part of a timer that does not depend on how it is shown: a Countdown
+    driven by a CountdownRunner, the warning stage it is in (one scheduled event
+    per stage, none per tick) and the [Actions] of the stages and the expiry.
+    The Tk Timer and the curses TerminalTimer both use it and only draw and
+    sound. `on_stage(index, crossed)` is called when the stage changes;
+    `crossed` is True when the running clock reached it, so it is announced.
+    """
+    def __init__(self, scheduler, settings, on_tick, on_stage, on_expire, clock=None, timer_id=0, metrics=None):
+        self.scheduler = scheduler
+        self.timer_id = timer_id
+        self.thresholds = settings.thresholds
+        self.on_stage = on_stage
+        self.countdown = Countdown(clock, suspend_aware=settings.suspend_aware)
+        self.runner = CountdownRunner(scheduler, self.countdown, on_tick, on_expire, metrics)
+        self.actions = ActionRunner.shared(settings)
+        self.stage_index = -1
+        self.stage_job = None
+
+    def set_thresholds(self, thresholds):
+        """Switches to a reloaded [Thresholds] table."""
+        self.thresholds = thresholds
+        if self.countdown.running or self.countdown.paused_remaining_ns:
+            self.sync_stage()
+
+    def sync_stage(self):
         """
-        Handles the actions when the timer reaches zero (plays alarm, changes UI).
+        Looks up the stage for the current remaining time (after a start, resume
+        or reload) and schedules the next one. Stages skipped this way do not
+        sound or run their action.
         """
-        self.active = False
-        self.time_remaining = "00:00:00"
-        self.clock.config(text=self.time_remaining, fg=self.colors['clock_color_red'])
-        
-        self.playing = True
-        
-        self.clock.unbind("<Double-Button-1>")
-
-        self.pause_button.pack_forget()
-        self.stop_button.pack_forget()
-        self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
-        self.active_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
-        self.active_button.config(text="Detener", command=self._stop_alarm)
-
-        if self.alarm_enabled:
-            pygame.mixer.music.load(ALARMA)
-            for _ in range(self.alarm_repeat_count):
-                if not self.playing:
-                    break
-                pygame.mixer.music.play()
-                while pygame.mixer.music.get_busy() and self.playing:
-                    sleep(0.1)
+        self.cancel_stage()
+        self.stage_index = self.thresholds.index_for(self.countdown.remaining_seconds())
+        self.on_stage(self.stage_index, False)
+        self._schedule_stage()
+
+    def _schedule_stage(self):
+        """Schedules an event for the moment the clock reaches the next stage."""
+        following = self.stage_index + 1
+        if self.stage_job is None and self.countdown.running and following < len(self.thresholds):
+            delay_ns = self.countdown.remaining_ns() - self.thresholds.stages[following][0] * NS_PER_SECOND
+            self.stage_job = self.scheduler.after(max(0, math.ceil(delay_ns / 1_000_000)), self._on_stage)
+
+    def _on_stage(self):
+        self.stage_job = None
+        if not self.countdown.running:
+            return
+        remaining = self.countdown.remaining_seconds()
+        index = self.thresholds.index_for(remaining)
+        try:
+            if index > self.stage_index:
+                # After a suspend several stages may have passed; only the last one fires
+                self.stage_index = index
+                action = self.thresholds.stages[index][4]
+                if action is not None:
+                    self.actions.run({'event': 'stage', 'timer': self.timer_id, 'remaining': remaining}, [action])
+                self.on_stage(index, True)
+        finally:
+            self._schedule_stage() # A failing stage must not cancel the ones after it
+
+    def cancel_stage(self):
+        """Cancels the pending stage event, if any."""
+        if self.stage_job is not None:
+            self.scheduler.after_cancel(self.stage_job)
+            self.stage_job = None
+
+    def end_stages(self):
+        """Drops the stage state when the countdown ends or is cancelled."""
+        self.cancel_stage()
+        self.stage_index = -1
+
+    def run_expiry_actions(self):
+        """Queues the expiry [Actions]; they run on worker threads."""
+        self.actions.run({'event': 'expired', 'timer': self.timer_id, 'time': time.strftime("%Y-%m-%dT%H:%M:%S%z")})
+
+class Stopwatch:
+    """
+    Counts up on the same clock as Countdown. Laps are stored as elapsed
+    nanoseconds in an array('q') (8 bytes per lap), so 100k laps take under 1 MB.
+    """
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.started_ns = 0
+        self.accumulated_ns = 0
+        self.running = False
+        self.laps = array('q')
 
-        self._reset_interface()
+    def start(self):
+        """Starts or resumes counting."""
+        if not self.running:
+            self.started_ns = self.clock.now_ns()
+            self.running = True
+
+    def pause(self):
+        """Stops counting, keeping the elapsed time."""
+        if self.running:
+            self.accumulated_ns += self.clock.now_ns() - self.started_ns
+            self.running = False
+
+    def reset(self):
+        """Clears the elapsed time and the laps."""
+        self.running = False
+        self.accumulated_ns = 0
+        self.laps = array('q')
+
+    def elapsed_ns(self):
+        """Returns the elapsed time in nanoseconds."""
+        if self.running:
+            return self.accumulated_ns + self.clock.now_ns() - self.started_ns
+        return self.accumulated_ns
+
+    def lap(self):
+        """Records a lap at the current elapsed time and returns its index."""
+        self.laps.append(self.elapsed_ns())
+        return len(self.laps) - 1
+
+    def lap_ns(self, index):
+        """Returns the duration of lap `index`."""
+        return self.laps[index] - (self.laps[index - 1] if index else 0)
+
+class TimerTable:
+    """
+    Headless engine for many parallel countdowns. Timers live in flat arrays indexed
+    by their ID and the running deadlines are ordered in a min-heap, so a single
+    wakeup always serves the earliest expiry.
+    """
+    __slots__ = ('clock', 'deadlines', 'paused_remaining', 'states', 'labels', 'free_ids', 'heap')
+
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.deadlines = array('q')
+        self.paused_remaining = array('q')
+        self.states = bytearray()
+        self.labels = []
+        self.free_ids = []
+        self.heap = []
+
+    def add(self, duration_seconds, label=""):
+        """Starts a new countdown and returns its timer ID."""
+        deadline = self.clock.now_ns() + duration_seconds * NS_PER_SECOND
+        if self.free_ids:
+            timer_id = self.free_ids.pop()
+            self.deadlines[timer_id] = deadline
+            self.paused_remaining[timer_id] = 0
+            self.states[timer_id] = SLOT_RUNNING
+            self.labels[timer_id] = label
+        else:
+            timer_id = len(self.states)
+            self.deadlines.append(deadline)
+            self.paused_remaining.append(0)
+            self.states.append(SLOT_RUNNING)
+            self.labels.append(label)
+        heapq.heappush(self.heap, (deadline, timer_id))
+        return timer_id
+
+    def pause(self, timer_id):
+        """Freezes a running countdown."""
+        if self.states[timer_id] == SLOT_RUNNING:
+            self.paused_remaining[timer_id] = max(0, self.deadlines[timer_id] - self.clock.now_ns())
+            self.states[timer_id] = SLOT_PAUSED
+
+    def resume(self, timer_id):
+        """Continues a paused countdown; its old heap entry becomes stale."""
+        if self.states[timer_id] == SLOT_PAUSED:
+            deadline = self.clock.now_ns() + self.paused_remaining[timer_id]
+            self.deadlines[timer_id] = deadline
+            self.states[timer_id] = SLOT_RUNNING
+            heapq.heappush(self.heap, (deadline, timer_id))
+
+    def cancel(self, timer_id):
+        """Removes a countdown and frees its ID for reuse."""
+        if self.states[timer_id] != SLOT_FREE:
+            self.states[timer_id] = SLOT_FREE
+            self.labels[timer_id] = ""
+            self.free_ids.append(timer_id)
+
+    def state(self, timer_id):
+        """Returns the SLOT_* state of a timer."""
+        return self.states[timer_id]
+
+    def remaining_ns(self, timer_id, now=None):
+        """Returns the remaining nanoseconds of a timer (never negative)."""
+        state = self.states[timer_id]
+        if state == SLOT_RUNNING:
+            return max(0, self.deadlines[timer_id] - (self.clock.now_ns() if now is None else now))
+        if state == SLOT_PAUSED:
+            return self.paused_remaining[timer_id]
+        return 0
+
+    def _is_live(self, entry):
+        deadline, timer_id = entry
+        return self.states[timer_id] == SLOT_RUNNING and self.deadlines[timer_id] == deadline
+
+    def next_deadline_ns(self):
+        """Returns the earliest running deadline, or None if nothing is running."""
+        heap = self.heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_expired(self, now=None):
+        """Marks every timer whose deadline has passed as expired and returns their IDs."""
+        if now is None:
+            now = self.clock.now_ns()
+        expired = []
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                self.states[entry[1]] = SLOT_EXPIRED
+                expired.append(entry[1])
+        return expired
+
+def lock_file(handle):
+    """
+    Takes a non-blocking exclusive lock on an open file, held until the handle
+    is closed or the process exits. Returns False if another process holds it.
+    """
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
 
-    def _stop_alarm(self):
+class StateJournal:
+    """
+    Append-only journal of countdown events with absolute wall-clock deadlines, so
+    running timers survive a crash or reboot. Each record is one short line:
+
+        S <id> <deadline_ns>   started or resumed, expires at the wall-clock deadline
+        P <id> <remaining_ns>  paused with the given time left
+        C <id> 0               cancelled or finished
+
+    Records are buffered and written with one fsync per batch. Loading replays the
+    file and rewrites it with only the live timers, which keeps it bounded.
+
+    Each running process owns one journal file (see shared()), so processes never
+    overwrite each other's records or restore the same timer. With `path` None
+    (every slot taken) nothing is journaled.
+    """
+    instances = {}
+
+    def __init__(self, path, scheduler=None, flush_ms=JOURNAL_FLUSH_MS, lock_handle=None):
+        self.path = path
+        self.scheduler = scheduler
+        self.flush_ms = flush_ms
+        self.lock_handle = lock_handle
+        self.pending = []
+        self.flush_job = None
+        self.records = 0
+
+    @classmethod
+    def shared(cls, path, scheduler=None):
         """
-        Stops the alarm sound and resets the interface.
+        Returns this process's journal, creating it once. The process locks the
+        first free slot among `path`, `path`.1, `path`.2... and keeps it until
+        it exits, so a relaunch after a crash or reboot finds slot 0 again.
         """
-        self.playing = False
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
-        self._reset_interface()
-
-    def _reset_interface(self):
-        """Resets the UI to its initial state for setting a new timer."""
-        if self.clock.winfo_ismapped():
-            self.clock.pack_forget()
-        
-        self.spinbox_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=5)
-        self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
-        self.active_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
-        self.pause_button.pack_forget()
-        self.stop_button.pack_forget()
-        
-        self.active_button.config(text="Iniciar", command=self.start, 
-                                  bg=self.colors['button_color'], fg="white", relief="raised", anchor="center")
-        
-        self.start_hours.set("0")
-        self.start_minutes.set("0")
-        self.start_seconds.set("0")
-        self.clock.config(fg=self.colors['clock_color_normal'])
-
-        self.clock.bind("<Double-Button-1>", self._toggle_buttons_visibility)
-        
-        self.root.overrideredirect(False)
-        self.root.attributes("-alpha", 1.0)
-        self.show_title = True
-        self.siempre_en_primer_plano = True
-        self.root.wm_attributes("-topmost", 1)
-
-        self.root.update_idletasks()
-        self._update_text_size()
-
-    def _toggle_buttons_visibility(self, event=None):
+        journal = cls.instances.get(path)
+        if journal is None:
+            slot_path, handle = cls._claim_slot(path)
+            journal = cls.instances[path] = cls(slot_path, scheduler, lock_handle=handle)
+        elif journal.scheduler is None:
+            journal.scheduler = scheduler
+        return journal
+
+    @staticmethod
+    def _claim_slot(path):
+        """Locks the first free journal slot; returns (slot path, lock handle) or (None, None)."""
+        for slot in range(JOURNAL_MAX_INSTANCES):
+            slot_path = path if slot == 0 else f"{path}.{slot}"
+            try:
+                handle = open(slot_path + ".lock", 'a+b')
+            except OSError:
+                break
+            if lock_file(handle):
+                return slot_path, handle
+            handle.close()
+        return None, None
+
+    def load(self):
         """
-        Toggles the visibility of pause/stop buttons and adjusts clock display.
+        Replays the journal and returns {timer_id: (event, value)} for every timer
+        that was still running ('S') or paused ('P'). The file is compacted.
         """
-        if self.active and not self.playing:
-            if self.pause_button.winfo_ismapped():
-                self.pause_button.pack_forget()
-                self.stop_button.pack_forget()
-                self.button_frame.pack_forget()
-                self.clock.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
-            else:
-                self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
-                self.stop_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
-                self.pause_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
-                self.clock.pack(side=tk.TOP, fill=tk.BOTH, expand=3)
+        live = {}
+        if self.path is None:
+            return live
+        try:
+            with open(self.path, 'r', encoding='ascii', errors='replace') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 3:
+                        continue # Torn write at the end of the file
+                    try:
+                        timer_id, value = int(parts[1]), int(parts[2])
+                    except ValueError:
+                        continue
+                    if parts[0] in ('S', 'P'):
+                        live[timer_id] = (parts[0], value)
+                    elif parts[0] == 'C':
+                        live.pop(timer_id, None)
+        except OSError:
+            return {}
+        self._compact(live)
+        return live
+
+    def _compact(self, live):
+        """Atomically replaces the journal with one record per live timer."""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='ascii') as f:
+                for timer_id, (event, value) in live.items():
+                    f.write(f"{event} {timer_id} {value}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.records = len(live)
+        except OSError:
+            pass # The journal is best effort; the timer keeps working without it
+
+    def record(self, event, timer_id, value=0):
+        """Queues a record; it reaches the disk with the next batched flush."""
+        self.pending.append(f"{event} {timer_id} {int(value)}\n")
+        if self.scheduler is None:
+            self.flush()
+        elif self.flush_job is None:
+            self.flush_job = self.scheduler.after(self.flush_ms, self.flush)
+
+    def flush(self):
+        """Writes the queued records with a single fsync."""
+        if self.flush_job is not None:
+            self.scheduler.after_cancel(self.flush_job)
+            self.flush_job = None
+        if not self.pending:
+            return
+        if self.path is None:
+            self.pending.clear()
+            return
+        try:
+            with open(self.path, 'a', encoding='ascii') as f:
+                f.writelines(self.pending)
+                f.flush()
+                os.fsync(f.fileno())
+            self.records += len(self.pending)
+        except OSError:
+            pass # The journal is best effort; the timer keeps working without it
+        self.pending.clear()
+        if self.records > JOURNAL_COMPACT_RECORDS:
+            self.load()
+
+class SessionHistory:
+    """
+    SQLite history with one row per finished countdown. Rows are queued from the
+    Tk main loop and written by a background thread, which commits everything
+    queued so far in one transaction. One instance (and writer thread) is shared
+    per file; the thread is started on the first record and stopped by close().
+    """
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        " started_at INTEGER NOT NULL," # Unix time (seconds)
+        " ended_at INTEGER NOT NULL,"
+        " planned_ms INTEGER NOT NULL,"
+        " focused_ms INTEGER NOT NULL," # Countdown time actually consumed
+        " paused_ms INTEGER NOT NULL,"
+        " pauses INTEGER NOT NULL,"
+        " reason TEXT NOT NULL)", # 'completed', 'cancelled' or 'closed'
+        "CREATE INDEX IF NOT EXISTS sessions_started_at ON sessions (started_at)",
+    )
+    instances = {}
+
+    @classmethod
+    def shared(cls, path):
+        """Returns the history for `path`, creating it once per process."""
+        history = cls.instances.get(path)
+        if history is None:
+            history = cls.instances[path] = cls(path)
+        return history
+
+    def __init__(self, path):
+        self.path = path
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def record(self, started_at, ended_at, planned_ms, focused_ms, paused_ms, pauses, reason):
+        """Queues one finished session; never blocks the caller."""
+        self.queue.put((started_at, ended_at, planned_ms, focused_ms, paused_ms, pauses, reason))
+        if self.thread is None:
+            self.thread = Thread(target=self._write_loop, name="historial", daemon=True)
+            self.thread.start()
+
+    def close(self, timeout=2):
+        """Writes the queued sessions and stops the writer thread."""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _write_loop(self):
+        import sqlite3
+        try:
+            connection = sqlite3.connect(self.path)
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+        except sqlite3.Error:
+            connection = None # The history is best effort; the queue is still drained
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            rows = [row for row in batch if row is not None]
+            if rows and connection is not None:
+                try:
+                    with connection:
+                        connection.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                except sqlite3.Error:
+                    pass
+        if connection is not None:
+            connection.close()
+
+def history_stats(path, since=None, until=None):
+    """
+    Returns [(day, sessions, completed, cancelled, focused_ms)] per local day for
+    the sessions started in [since, until) (Unix seconds, None = unbounded). The
+    range is answered from the index on started_at.
+    """
+    import sqlite3
+    if not os.path.exists(path):
+        return []
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return connection.execute(
+            "SELECT date(started_at, 'unixepoch', 'localtime') AS day, count(*),"
+            " sum(reason = 'completed'), sum(reason = 'cancelled'), sum(focused_ms)"
+            " FROM sessions WHERE started_at >= ? AND started_at < ?"
+            " GROUP BY day ORDER BY day",
+            (since if since is not None else -2**63, until if until is not None else 2**63 - 1)).fetchall()
+    finally:
+        connection.close()
+
+class MainLoopWakeup:
+    """
+    Runs `callback()` on the Tk main loop on behalf of worker threads, which never
+    call Tk themselves: wake() writes a byte to a pipe that Tk watches with
+    createfilehandler. Where Tk has no file handlers (Windows) wake() posts a
+    virtual event instead, which tkinter hands over to the Tk thread. Either
+    way nothing runs while no wakeup is pending. Wakeups that come before
+    mainloop() runs are kept until it does.
+    """
+    def __init__(self, root, callback):
+        self.root = root
+        self.callback = callback
+        self.pending = Event()
+        self.wake_r = self.wake_w = None
+        self.event = None
+        self.job = None
 
     def start(self):
+        """Starts watching; call on the Tk thread."""
+        import tkinter as tk
+        if hasattr(self.root.tk, 'createfilehandler'):
+            self.wake_r, self.wake_w = os.pipe()
+            os.set_blocking(self.wake_r, False)
+            os.set_blocking(self.wake_w, False)
+            self.root.tk.createfilehandler(self.wake_r, tk.READABLE, self._on_readable)
+        else:
+            self.event = f"<<Wakeup{id(self)}>>"
+            self.root.bind(self.event, lambda event: self._run())
+            self.job = self.root.after_idle(self._on_idle) # Wakeups posted before mainloop()
+
+    def wake(self):
+        """Asks the main loop to run the callback soon; safe from any thread."""
+        self.pending.set()
+        wake_w = self.wake_w
+        if wake_w is not None:
+            try:
+                os.write(wake_w, b"\0")
+            except OSError:
+                pass # The pipe is full (a wakeup is already pending) or closed
+        elif self.event is not None:
+            import tkinter as tk
+            try:
+                self.root.event_generate(self.event, when='tail')
+            except (RuntimeError, tk.TclError):
+                pass # mainloop() has not started (see _on_idle) or the window is gone
+
+    def _on_readable(self, fd, mask):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._run()
+
+    def _on_idle(self):
+        self.job = None
+        self._run()
+
+    def _run(self):
+        if self.pending.is_set():
+            self.pending.clear()
+            self.callback()
+
+    def close(self):
+        """Stops watching; call on the Tk thread."""
+        import tkinter as tk
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.event is not None:
+            self.root.unbind(self.event)
+            self.event = None
+        if self.wake_r is not None:
+            try:
+                self.root.tk.deletefilehandler(self.wake_r)
+            except tk.TclError:
+                pass # The Tk interpreter is already gone
+            wake_r, wake_w = self.wake_r, self.wake_w
+            self.wake_r = self.wake_w = None
+            os.close(wake_r)
+            os.close(wake_w)
+
+class ControlServer:
+    """
+    Optional local control API: an asyncio server on a Unix socket speaking
+    line-delimited JSON. Its event loop runs in a daemon thread; each command is
+    handed to the Tk main loop through a wakeup pipe, so widgets are only touched
+    from the Tk thread and neither side polls.
+
+    Commands: {"cmd": "start", "seconds": 90}, {"cmd": "sequence", "name": "pomodoro"},
+    {"cmd": "pause"}, {"cmd": "resume"}, {"cmd": "cancel"}, {"cmd": "remaining"} and
+    {"cmd": "subscribe"}, after which the connection also receives every event
+    published by the timer.
+    """
+    def __init__(self, root, handler, path):
+        self.root = root
+        self.handler = handler
+        self.path = path
+        self.loop = None
+        self.thread = None
+        self.requests = queue.SimpleQueue()
+        self.subscribers = set()
+        self.wakeup = MainLoopWakeup(root, self._drain_requests)
+
+    @staticmethod
+    def is_supported():
+        """Returns True if this platform has Unix sockets."""
+        import socket
+        return hasattr(socket, 'AF_UNIX')
+
+    def start(self):
+        """Binds the socket and starts serving; raises OSError if that fails."""
+        if self._socket_in_use():
+            raise OSError(f"Otro proceso ya usa {self.path}")
+        if os.path.exists(self.path):
+            os.unlink(self.path) # Stale socket left by a crash
+
+        self.wakeup.start()
+
+        ready = Event()
+        errors = []
+        self.thread = Thread(target=self._run, args=(ready, errors), daemon=True)
+        self.thread.start()
+        ready.wait()
+        if errors:
+            self.close()
+            raise errors[0]
+
+    def _socket_in_use(self):
+        import socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.path)
+            except OSError:
+                return False
+        return True
+
+    def _run(self, ready, errors):
+        """Event loop thread."""
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        try:
+            server = self.loop.run_until_complete(asyncio.start_unix_server(self._serve_client, path=self.path))
+        except Exception as e:
+            errors.append(e)
+            ready.set()
+            self.loop.close()
+            return
+        ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            server.close()
+            self.loop.run_until_complete(server.wait_closed())
+            self.loop.close()
+
+    async def _serve_client(self, reader, writer):
+        """Serves one connection until it closes."""
+        import asyncio
+        import concurrent.futures
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    reply = {'ok': False, 'error': "se esperaba un objeto JSON por línea"}
+                else:
+                    if request.get('cmd') == 'subscribe':
+                        self.subscribers.add(writer)
+                        reply = {'ok': True}
+                    else:
+                        future = concurrent.futures.Future()
+                        self.requests.put((request, future))
+                        self.wakeup.wake()
+                        reply = await asyncio.wrap_future(future)
+                writer.write(json.dumps(reply).encode('utf-8') + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def _drain_requests(self):
+        """Runs the queued commands on the Tk main loop."""
+        while True:
+            try:
+                request, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                reply = self.handler(request)
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            future.set_result(reply)
+
+    def publish(self, event):
+        """Sends an event to every subscriber; called from the Tk main loop."""
+        if self.subscribers and self.loop is not None:
+            data = json.dumps(event).encode('utf-8') + b"\n"
+            self.loop.call_soon_threadsafe(self._broadcast, data)
+
+    def _broadcast(self, data):
+        for writer in list(self.subscribers):
+            if writer.is_closing() or writer.transport.get_write_buffer_size() > CONTROL_MAX_BUFFER:
+                # Drop subscribers that stopped reading instead of buffering forever
+                self.subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(data)
+
+    def close(self):
+        """Stops the server and removes the socket file."""
+        if self.loop is not None and self.thread is not None and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=1)
+        self.wakeup.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+def send_control_commands(path, commands, timeout=5.0):
+    """
+    Minimal stand-in client for the control API: sends each command and yields
+    every JSON line received. After a 'subscribe' command it keeps yielding events
+    until the server closes the connection.
+    """
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        stream = sock.makefile('rwb')
+        subscribed = False
+        for command in commands:
+            stream.write(json.dumps(command).encode('utf-8') + b"\n")
+            stream.flush()
+            yield json.loads(stream.readline())
+            subscribed = subscribed or command.get('cmd') == 'subscribe'
+        if subscribed:
+            sock.settimeout(None)
+            for line in stream:
+                yield json.loads(line)
+
+class SingleInstance:
+    """
+    Single-instance mode. The first process holds an exclusive lock on
+    temporizador.lock and listens on a loopback port, written together with a
+    random token to temporizador.instance. Later launches find the lock taken,
+    forward their command-line arguments to that port and exit.
+    """
+    def __init__(self, lock_path=LOCK_FILE, info_path=INSTANCE_FILE):
+        self.lock_path = lock_path
+        self.info_path = info_path
+        self.lock_handle = None
+        self.listener = None
+        self.token = None
+        self.launches = queue.SimpleQueue()
+        self.wakeup = None
+
+    def acquire(self):
+        """Returns True if this process is now the single instance."""
+        try:
+            handle = open(self.lock_path, 'a+b')
+        except OSError:
+            return False
+        if not lock_file(handle):
+            handle.close()
+            return False
+        self.lock_handle = handle
+
+        import secrets
+        import socket
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(8)
+        self.token = secrets.token_hex(16)
+        with open(self.info_path, 'w', encoding='ascii') as f:
+            f.write(f"{self.listener.getsockname()[1]} {self.token}\n")
+        return True
+
+    def forward(self, argv, timeout=2.0):
+        """
+        Hands `argv` to the running instance. Returns False if it cannot be
+        reached, in which case the caller should start normally.
+        """
+        import socket
+        deadline = time.monotonic_ns() + int(timeout * NS_PER_SECOND)
+        while True:
+            try:
+                with open(self.info_path, 'r', encoding='ascii') as f:
+                    port, token = f.read().split()
+                with socket.create_connection(("127.0.0.1", int(port)), timeout=timeout) as sock:
+                    sock.sendall(json.dumps({'token': token, 'argv': argv}).encode('utf-8') + b"\n")
+                    return json.loads(sock.makefile('rb').readline()).get('ok', False)
+            except (OSError, ValueError):
+                # The running instance may still be starting up; retry briefly
+                if time.monotonic_ns() >= deadline:
+                    return False
+                time.sleep(0.05)
+
+    def serve(self, root, on_launch):
         """
-        Initiates the timer countdown. Validates input and changes UI state.
+        Accepts forwarded launches on a daemon thread and calls `on_launch(argv)`
+        for each of them on the Tk main loop.
         """
+        self.on_launch = on_launch
+        self.wakeup = MainLoopWakeup(root, self._drain_launches)
+        self.wakeup.start()
+        Thread(target=self._accept_loop, args=(self.listener,), daemon=True).start()
+
+    def _accept_loop(self, listener):
+        import concurrent.futures
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                if listener.fileno() == -1:
+                    return # Listener closed
+                time.sleep(0.1) # E.g. out of file descriptors; keep serving
+                continue
+            with conn:
+                try:
+                    conn.settimeout(2)
+                    request = json.loads(conn.makefile('rb').readline(65536))
+                    if request.get('token') != self.token or not isinstance(request.get('argv'), list):
+                        continue
+                    delivered = concurrent.futures.Future()
+                    self.launches.put((request['argv'], delivered))
+                    self.wakeup.wake()
+                    try:
+                        delivered.result(timeout=SINGLE_INSTANCE_ACK_S)
+                    except concurrent.futures.TimeoutError:
+                        pass # Queued; the main loop opens it as soon as it is free
+                    conn.sendall(b'{"ok": true}\n')
+                except (OSError, ValueError, AttributeError):
+                    continue
+
+    def _drain_launches(self):
+        while True:
+            try:
+                argv, delivered = self.launches.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self.on_launch(argv)
+            finally:
+                delivered.set_result(True)
+
+    def close(self):
+        """Stops listening and releases the lock."""
+        if self.wakeup is not None:
+            self.wakeup.close()
+            self.wakeup = None
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+        if self.lock_handle is not None:
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+            self.lock_handle.close()
+            self.lock_handle = None
+
+class ConfigWatcher:
+    """
+    Calls `on_change` on the Tk main loop when config.ini changes. On Linux it
+    waits on inotify events for the file's directory (editors often replace the
+    file instead of writing it in place); elsewhere it compares the file's
+    mtime and size on a slow timer. Either way the callback only runs when that
+    signature actually changed.
+    """
+    # inotify(7) flags
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self, root, path, on_change, poll_ms=CONFIG_POLL_MS):
+        self.root = root
+        self.path = path
+        self.on_change = on_change
+        self.poll_ms = poll_ms
+        self.signature = self._signature()
+        self.inotify_fd = None
+        self.job = None
+
+    def _signature(self):
         try:
-            hours = int(self.start_hours.get())
-            minutes = int(self.start_minutes.get())
-            seconds = int(self.start_seconds.get())
-        except ValueError:
-            messagebox.showerror("Error de Entrada", "Por favor, ingrese solo números válidos en los campos de tiempo.")
-            return
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
 
-        if hours == 0 and minutes == 0 and seconds == 0:
+    def start(self):
+        """Starts watching, with inotify when available."""
+        if not self._start_inotify():
+            self.job = self.root.after(self.poll_ms, self._poll)
+
+    def _start_inotify(self):
+        if not sys.platform.startswith('linux') or not hasattr(self.root.tk, 'createfilehandler'):
+            return False
+        import ctypes
+        import tkinter as tk
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(os.path.dirname(self.path) or '.'), mask) < 0:
+            os.close(fd)
+            return False
+        self.inotify_fd = fd
+        self.root.tk.createfilehandler(fd, tk.READABLE, self._on_inotify)
+        return True
+
+    def _on_inotify(self, fd, mask):
+        name = os.fsencode(os.path.basename(self.path))
+        relevant = False
+        while True:
+            try:
+                data = os.read(fd, 4096)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + 16 <= len(data):
+                length = struct.unpack_from('iIII', data, offset)[3]
+                if data[offset + 16:offset + 16 + length].rstrip(b'\0') == name:
+                    relevant = True
+                offset += 16 + length
+        # The journal and log share the directory; only config.ini events count,
+        # and a burst of them (write, close, rename) is checked once
+        if relevant and self.job is None:
+            self.job = self.root.after(CONFIG_DEBOUNCE_MS, self._check)
+
+    def _poll(self):
+        self.job = self.root.after(self.poll_ms, self._poll)
+        self._check(rescheduled=True)
+
+    def _check(self, rescheduled=False):
+        if not rescheduled:
+            self.job = None
+        signature = self._signature()
+        if signature is not None and signature != self.signature:
+            self.signature = signature
+            self.on_change()
+
+    def close(self):
+        """Stops watching."""
+        import tkinter as tk
+        if self.job is not None:
+            try:
+                self.root.after_cancel(self.job)
+            except tk.TclError:
+                pass # The window is already destroyed, and its timers with it
+            self.job = None
+        if self.inotify_fd is not None:
+            self.root.tk.deletefilehandler(self.inotify_fd)
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+def _enable_file_logging():
+    """
+    Returns the program's logger, sending it to temporizador.log next to
+    config.ini the first time. logging is only imported once something logs.
+    """
+    import logging
+    logger = logging.getLogger("temporizador")
+    if not logger.handlers:
+        try:
+            handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+        except OSError:
+            return logger
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    return logger
+
+class ActionRunner:
+    """
+    Runs the expiry actions of the [Actions] section on a bounded worker pool, so
+    a slow action never delays the alarm, the UI or other timers. Every action has
+    its own timeout, and its queueing delay and duration are logged. One runner is
+    shared per process (see shared()), so `workers` bounds the whole process.
+    """
+    instance = None
+
+    def __init__(self, actions, timeout=30, workers=2):
+        self.actions = actions
+        self.timeout = timeout
+        self.workers = workers
+        self.executor = None
+        self.slots = None
+        self.logger = None
+
+    @classmethod
+    def shared(cls, settings):
+        """Returns the runner of this process, creating it from `settings` once."""
+        if cls.instance is None:
+            cls.instance = cls(settings.actions, settings.action_timeout, settings.action_workers)
+        return cls.instance
+
+    def run(self, context, actions=None):
+        """Queues every configured action (or just `actions`); returns immediately."""
+        if actions is None:
+            actions = self.actions
+        if not actions:
             return
+        if self.executor is None:
+            import concurrent.futures
+            self.logger = _enable_file_logging()
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="accion")
+            self.slots = Semaphore(self.workers * ACTION_QUEUE_PER_WORKER)
+        for action in actions:
+            if not self.slots.acquire(blocking=False):
+                self.logger.warning("Acción %s descartada: la cola de acciones está llena", action[0])
+                continue
+            submitted = False
+            try:
+                self.executor.submit(self._run_one, action, context, time.perf_counter(), self.slots)
+                submitted = True
+            finally:
+                if not submitted:
+                    self.slots.release()
+
+    def _run_one(self, action, context, queued_at, slots):
+        name, kind, argument = action
+        started = time.perf_counter()
+        self.logger.info("Acción %s (%s) iniciada tras %.1f ms en cola", name, kind, (started - queued_at) * 1000)
+        finished = Event()
+        errors = []
+
+        def execute():
+            try:
+                self._execute(kind, argument, context)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                finished.set()
+                slots.release()
+
+        if kind in ('file', 'http'):
+            # Neither open() nor urlopen() has an overall timeout, so they run on a
+            # helper thread that the worker stops waiting for. The slot is only freed
+            # when the call really returns, so stuck actions still count in the bound.
+            Thread(target=execute, daemon=True, name=f"accion-{name}").start()
+        else:
+            execute() # subprocess.run enforces the timeout itself
+        if not finished.wait(self.timeout):
+            self.logger.error("Acción %s abandonada: superó %d s", name, self.timeout)
+        elif errors:
+            self.logger.error("Acción %s falló tras %.1f ms: %s", name, (time.perf_counter() - started) * 1000, errors[0])
+        else:
+            self.logger.info("Acción %s terminada en %.1f ms", name, (time.perf_counter() - started) * 1000)
+
+    def _execute(self, kind, argument, context):
+        import subprocess
+        if kind == 'command':
+            subprocess.run(argument, shell=True, timeout=self.timeout, check=True,
+                           stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elif kind in ('shutdown', 'suspend'):
+            subprocess.run(_power_command(kind), timeout=self.timeout, check=True,
+                           stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elif kind == 'file':
+            with open(argument, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(context, ensure_ascii=False) + "\n")
+        elif kind == 'http':
+            import urllib.request
+            request = urllib.request.Request(argument, data=json.dumps(context).encode('utf-8'),
+                                             headers={'Content-Type': 'application/json'}, method='POST')
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+
+    def shutdown(self):
+        """Lets running actions finish in the background and drops queued ones."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def reconfigure(self, actions, timeout, workers):
+        """Applies reloaded settings; actions already queued still run."""
+        self.actions = actions
+        self.timeout = timeout
+        if workers != self.workers:
+            self.workers = workers
+            if self.executor is not None:
+                self.executor.shutdown(wait=False)
+                self.executor = None # Recreated with the new size on the next run
+
+def _power_command(kind):
+    """Returns the command that shuts down or suspends this system."""
+    if os.name == 'nt':
+        if kind == 'shutdown':
+            return ["shutdown", "/s", "/t", "0"]
+        return ["rundll32.exe", "powrprof.dll,SetSuspendState", "0,1,0"]
+    if sys.platform == 'darwin':
+        if kind == 'shutdown':
+            return ["osascript", "-e", 'tell app "System Events" to shut down']
+        return ["pmset", "sleepnow"]
+    return ["systemctl", "poweroff" if kind == 'shutdown' else "suspend"]
+
+def parse_sync_group(text):
+    """Parses 'group:port' (e.g. 239.255.42.99:47999) into (group, port)."""
+    import socket
+    host, _, port = text.strip().rpartition(':')
+    try:
+        socket.inet_aton(host)
+        port = int(port)
+    except (OSError, ValueError):
+        raise ValueError(f"dirección de sincronización no válida: {text!r}")
+    if not 0 < port < 65536:
+        raise ValueError(f"puerto de sincronización no válido: {port}")
+    return (host, port)
+
+class SyncSource:
+    """
+    Publishes one countdown to follower displays over UDP multicast. A state
+    message (deadline on this machine's monotonic clock, or the paused time left)
+    goes out on every change and once per second while a countdown exists, so the
+    message rate does not depend on the number of followers. The same socket
+    answers each follower's clock probes with receive/send timestamps.
+    """
+    def __init__(self, scheduler, countdown, group=None):
+        self.scheduler = scheduler
+        self.countdown = countdown
+        self.group = group if group is not None else parse_sync_group(SYNC_DEFAULT_GROUP)
+        self.sock = None
+        self.seq = 0
+        self.job = None
 
-        self.hours_left = hours
-        self.minutes_left = minutes
-        self.seconds_left = seconds
-        
-        self.spinbox_frame.pack_forget()
-        self.active_button.pack_forget()
-        self.button_frame.pack_forget()
-        
-        self.clock.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
-        self.pause_button.config(text="  Pausar   ", command=self.pause)
+    def start(self):
+        """Opens the socket and starts answering probes; raises OSError if that fails."""
+        import socket
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1) # Stay on the local network
+        self.sock.bind(('', 0))
+        Thread(target=self._answer_probes, args=(self.sock,), daemon=True).start()
+        self.send_state()
+
+    def publish(self, event):
+        """Timer listener: sends the new state when the countdown changes."""
+        if event['event'] in ('started', 'paused', 'resumed', 'cancelled', 'expired'):
+            self.send_state(expired=event['event'] == 'expired')
+
+    def send_state(self, expired=False):
+        """Multicasts the current state and keeps the heartbeat going while needed."""
+        if self.job is not None:
+            self.scheduler.after_cancel(self.job)
+            self.job = None
+        if self.sock is None:
+            return
+        countdown = self.countdown
+        if expired:
+            message = {'state': 'expired'} # Followers ring on their own deadline
+        elif countdown.running:
+            countdown.reconcile() # Apply any suspend gap before publishing the deadline
+            message = {'state': 'running', 'deadline': countdown.deadline_ns}
+        elif countdown.paused_remaining_ns:
+            message = {'state': 'paused', 'remaining': countdown.paused_remaining_ns}
+        else:
+            message = {'state': 'idle'}
+        self.seq += 1
+        message.update(v=1, seq=self.seq)
+        try:
+            self.sock.sendto(json.dumps(message).encode('ascii'), self.group)
+        except OSError:
+            pass # The network may come back; the next heartbeat retries
+        if message['state'] in ('running', 'paused'):
+            self.job = self.scheduler.after(SYNC_HEARTBEAT_MS, self.send_state)
+
+    def _answer_probes(self, sock):
+        while True:
+            try:
+                data, address = sock.recvfrom(64)
+            except OSError:
+                return # Socket closed
+            received = time.monotonic_ns()
+            if len(data) == 9 and data[:1] == b'P':
+                try:
+                    sock.sendto(b'R' + data[1:] + struct.pack('!qq', received, time.monotonic_ns()), address)
+                except OSError:
+                    pass
+
+    def close(self):
+        """Stops publishing."""
+        if self.job is not None:
+            self.scheduler.after_cancel(self.job)
+            self.job = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+class SyncFollower:
+    """
+    Receives a SyncSource's state and estimates the source's clock offset
+    NTP-style: each probe records the send and receive times on both machines,
+    offset = ((t1 - t0) + (t2 - t3)) / 2, and the sample with the smallest round
+    trip among the recent ones wins. Both run on daemon threads, which share
+    their state under `lock` and never touch Tk: a MainLoopWakeup passes each
+    new state and offset to `on_update(message, offset_ns)` on the Tk thread.
+    """
+    def __init__(self, root, on_update, group=None):
+        self.on_update = on_update
+        self.wakeup = MainLoopWakeup(root, self._deliver)
+        self.group = group if group is not None else parse_sync_group(SYNC_DEFAULT_GROUP)
+        self.listener = None
+        self.prober = None
+        self.lock = Lock() # Guards source, samples, offset_ns, latest and last_seq
+        self.source = None
+        self.samples = []
+        self.offset_ns = None
+        self.latest = None
+        self.last_seq = 0
+        self.source_heard = Event() # Probing starts once a source is known
+        self.closed = False
 
-        self.root.overrideredirect(True)
-        self._update_text_size()
+    def start(self):
+        """Joins the multicast group; raises OSError if that fails. Call on the Tk thread."""
+        import socket
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1) # Several followers per machine
+        if hasattr(socket, 'SO_REUSEPORT'):
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        listener.bind(('', self.group[1]))
+        membership = struct.pack('4s4s', socket.inet_aton(self.group[0]), socket.inet_aton('0.0.0.0'))
+        listener.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.listener = listener
+        self.prober = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.prober.settimeout(0.5)
+        self.wakeup.start()
+        Thread(target=self._listen, daemon=True).start()
+        Thread(target=self._probe, daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                data, address = self.listener.recvfrom(1024)
+                message = json.loads(data)
+            except OSError:
+                return # Socket closed
+            except ValueError:
+                continue
+            if not isinstance(message, dict) or message.get('v') != 1:
+                continue
+            with self.lock:
+                if address != self.source:
+                    # A new or restarted source: its clock is unknown until probed again
+                    self.source = address
+                    self.samples = []
+                    self.offset_ns = None
+                    self.last_seq = 0
+                    self.source_heard.set()
+                elif message.get('seq', 0) <= self.last_seq:
+                    continue # Late duplicate
+                self.last_seq = message.get('seq', 0)
+                self.latest = message
+                ready = self.offset_ns is not None
+            if ready:
+                self.wakeup.wake()
+
+    def _probe(self):
+        sent = 0
+        while not self.closed:
+            self.source_heard.wait()
+            if self.closed:
+                return
+            with self.lock:
+                source = self.source
+            t0 = time.monotonic_ns()
+            try:
+                self.prober.sendto(b'P' + struct.pack('!q', t0), source)
+                while True:
+                    data = self.prober.recv(64)
+                    t3 = time.monotonic_ns()
+                    if len(data) == 25 and struct.unpack('!q', data[1:9])[0] == t0:
+                        break # Ignore the late answer to an earlier probe
+            except OSError:
+                if self.closed:
+                    return
+                time.sleep(1)
+                continue
+            t1, t2 = struct.unpack('!qq', data[9:])
+            with self.lock:
+                ready = False
+                if source == self.source:
+                    self.samples = (self.samples + [((t3 - t0) - (t2 - t1), ((t1 - t0) + (t2 - t3)) // 2)])[-SYNC_PROBE_BURST:]
+                    ready = self.offset_ns is None and self.latest is not None
+                    self.offset_ns = min(self.samples)[1]
+            if ready:
+                self.wakeup.wake()
+            sent += 1
+            time.sleep(0.05 if sent < SYNC_PROBE_BURST else SYNC_PROBE_INTERVAL_S)
+
+    def poll(self):
+        """Returns (latest state message, offset_ns) once the offset is known, else None."""
+        with self.lock:
+            if self.latest is None or self.offset_ns is None:
+                return None
+            message, self.latest = self.latest, None
+            return message, self.offset_ns
+
+    def _deliver(self):
+        update = self.poll()
+        if update is not None:
+            self.on_update(*update)
+
+    def close(self):
+        """Leaves the group and stops the threads. Call on the Tk thread."""
+        self.closed = True
+        self.wakeup.close()
+        for sock in (self.listener, self.prober):
+            if sock is not None:
+                sock.close()
+        self.source_heard.set()
+
+class BellAlarm:
+    """
+    Alarm for the terminal frontend with the same play()/stop()/is_playing()
+    interface as AlarmPlayer: it rings the terminal bell once per second, or runs
+    `command` once per repeat (each run waits for the previous one to exit).
+    """
+    def __init__(self, scheduler, bell, command=""):
+        self.scheduler = scheduler
+        self.bell = bell
+        self.command = command
+        self.remaining = 0
+        self.process = None
+        self.job = None
+        self.on_finished = None
+
+    def play(self, repeats, on_finished=None):
+        """Rings `repeats` times and calls `on_finished` when it ends."""
+        self.stop()
+        self.remaining = max(1, repeats)
+        self.on_finished = on_finished
+        self._ring()
+
+    def _ring(self):
+        self.job = None
+        if self.process is not None and self.process.poll() is None:
+            self.job = self.scheduler.after(100, self._ring) # Previous run still going
+            return
+        self.process = None
+        if self.remaining == 0:
+            on_finished, self.on_finished = self.on_finished, None
+            if on_finished is not None:
+                on_finished()
+            return
+        self.remaining -= 1
+        if self.command:
+            import subprocess
+            try:
+                self.process = subprocess.Popen(self.command, shell=True, stdin=subprocess.DEVNULL,
+                                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError:
+                self.bell()
+        else:
+            self.bell()
+        self.job = self.scheduler.after(1000, self._ring)
 
-        self.active = True
-        self.update_event.set()
+    def is_playing(self):
+        """Returns True while the alarm is still ringing."""
+        return self.job is not None
 
-    def pause(self):
-        """Pauses the timer countdown."""
-        if self.active:
-            self.active = False
-            self.update_event.clear()
-            self.pause_button.config(text="Reanudar", command=self.resume)
+    def stop(self):
+        """Silences the alarm immediately without calling `on_finished`."""
+        if self.job is not None:
+            self.scheduler.after_cancel(self.job)
+            self.job = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+        self.process = None
+        self.remaining = 0
+        self.on_finished = None
+
+class AlarmPlayer:
+    """
+    Alarm engine that decodes the alarm sound once into an in-memory Sound buffer
+    and lets the mixer queue the repeats natively. Completion is reported by a
+    single after() callback aimed at the end of the last repeat instead of
+    polling the mixer.
+    """
+    def __init__(self, root, pygame, path):
+        self.root = root
+        self.sound = pygame.mixer.Sound(path)
+        self.length_ms = max(1, math.ceil(self.sound.get_length() * 1000))
+        self.channel = None
+        self.job = None
+        self.on_finished = None
+
+    def play(self, repeats, on_finished=None):
+        """Plays the alarm `repeats` times and calls `on_finished` when it ends."""
+        self.stop()
+        self.on_finished = on_finished
+        if repeats <= 0:
+            self._finish()
+            return
+        self.channel = self.sound.play(loops=repeats - 1)
+        if self.channel is None:
+            # No free mixer channel: finish right away instead of waiting
+            self._finish()
+            return
+        self.job = self.root.after(self.length_ms * max(1, repeats), self._check_finished)
+
+    def is_playing(self):
+        """Returns True while the alarm is still sounding."""
+        return self.channel is not None and self.channel.get_busy() and self.channel.get_sound() is self.sound
+
+    def _check_finished(self):
+        """Runs when the last repeat should have ended."""
+        self.job = None
+        if self.is_playing():
+            # The mixer started late; check again shortly
+            self.job = self.root.after(20, self._check_finished)
+            return
+        self._finish()
 
-    def resume(self):
-        """Resumes the timer countdown."""
-        if not self.active:
-            self.active = True
-            self.update_event.set()
-            self.pause_button.config(text="  Pausar   ", command=self.pause)
-            self._toggle_buttons_visibility()
+    def _finish(self):
+        self.channel = None
+        on_finished, self.on_finished = self.on_finished, None
+        if on_finished is not None:
+            on_finished()
 
     def stop(self):
-        """Stops the timer and asks for confirmation."""
-        response = messagebox.askyesno("Confirmación", "¿Estás seguro de que deseas cancelar el temporizador?")
-        if response:
-            self.active = False
-            self.playing = False
-            self.update_event.clear()
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.stop()
-            self._reset_interface()
-
-    def _on_closing(self):
-        """Handles the graceful shutdown of the application."""
-        self.kill = True
-        self.update_event.set()
-        
-        if self.thread.is_alive():
-            self.thread.join(timeout=1)
-        
-        if pygame.mixer.get_init():
-            pygame.mixer.quit()
-
-        self.root.destroy()
-
-    # --- Window Control Functions ---
-
-    def _toggle_always_on_top(self, event=None):
-        """Toggles the 'always on top' attribute of the window."""
-        self.siempre_en_primer_plano = not self.siempre_en_primer_plano
-        self.root.wm_attributes("-topmost", 1 if self.siempre_en_primer_plano else 0)
-        
-    def _toggle_title_bar(self, event=None):
-        """Toggles the visibility of the window's title bar."""
-        self.show_title = not self.show_title
-        self.root.overrideredirect(not self.show_title)
-
-    def _adjust_transparency(self, event):
-        """Adjusts the window's transparency."""
-        current_alpha = self.root.attributes("-alpha")
-        step = 0.05
-        if event.keysym == "Up":
-            self.root.attributes("-alpha", min(current_alpha + step, 1.0))
-        elif event.keysym == "Down":
-            self.root.attributes("-alpha", max(current_alpha - step, 0.2))
-
-    def _start_move(self, event):
-        """Records initial mouse position for window dragging."""
-        self.x_offset = event.x_root
-        self.y_offset = event.y_root
-
-    def _do_move(self, event):
-        """Moves the window based on mouse drag."""
-        x = self.root.winfo_x() + (event.x_root - self.x_offset)
-        y = self.root.winfo_y() + (event.y_root - self.y_offset)
-        self.root.geometry(f"+{x}+{y}")
-        self.x_offset = event.x_root
-        self.y_offset = event.y_root
-
-    def _on_window_resize(self, event):
-        """Debounces window resize events to update text size efficiently."""
-        if self.resize_delay:
-            self.root.after_cancel(self.resize_delay)
-        self.resize_delay = self.root.after(50, self._update_text_size)
-
-    def _update_text_size(self, event=None):
+        """Silences the alarm immediately without calling `on_finished`."""
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+        if self.is_playing():
+            self.channel.stop()
+        self.channel = None
+        self.on_finished = None
+
+def format_hms(total_seconds):
+    """Formats a number of seconds as HH:MM:SS."""
+    hours, rest = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}"
+
+def format_elapsed(elapsed_ns, precision=2):
+    """Formats an elapsed time as HH:MM:SS.dd, truncating like a stopwatch does."""
+    steps = 10 ** precision
+    total_seconds, fraction = divmod(elapsed_ns * steps // NS_PER_SECOND, steps)
+    return f"{format_hms(total_seconds)}.{fraction:0{precision}}"
+
+def format_clock(remaining_ns, precision=0):
+    """
+    Formats a remaining time as HH:MM:SS, or HH:MM:SS.d / HH:MM:SS.dd with
+    `precision` 1 or 2, rounding up like the whole-second clock does.
+    """
+    if precision == 0:
+        return format_hms(-(-remaining_ns // NS_PER_SECOND))
+    steps = 10 ** precision
+    units = -(-remaining_ns * steps // NS_PER_SECOND)
+    total_seconds, fraction = divmod(units, steps)
+    return f"{format_hms(total_seconds)}.{fraction:0{precision}}"
+
+class Settings:
+    """
+    Settings read from config.ini and shared by every window. A reload updates
+    the instance in place (see update()), so every window sees the new values.
+    """
+    # Attributes that can change while the program runs; the others (control
+    # socket, single instance, clock renderer) are only read at startup
+    RELOADABLE = ('alarm_repeat_count', 'suspend_aware', 'presets', 'actions', 'action_timeout',
+                  'action_workers', 'display_precision', 'thresholds', 'schedules', 'sequences', 'sequence_cue')
+
+    def __init__(self, colors, alarm_repeat_count, suspend_aware=True, control_socket="", single_instance=False,
+                 presets=None, actions=None, action_timeout=30, action_workers=2, display_precision=0,
+                 clock_renderer='label', thresholds=None, terminal_alarm_command="", schedules=None,
+                 sync_role='off', sync_group=SYNC_DEFAULT_GROUP, sequences=None, sequence_cue=True):
+        self.colors = colors
+        self.sequences = sequences if sequences is not None else {}
+        self.sequence_cue = sequence_cue
+        self.sync_role = sync_role
+        self.sync_group = sync_group
+        self.schedules = schedules if schedules is not None else []
+        self.terminal_alarm_command = terminal_alarm_command
+        self.thresholds = thresholds if thresholds is not None else ThresholdTable.default()
+        self.clock_renderer = clock_renderer
+        self.display_precision = display_precision
+        self.presets = presets if presets is not None else {}
+        self.actions = actions if actions is not None else []
+        self.action_timeout = action_timeout
+        self.action_workers = action_workers
+        self.alarm_repeat_count = alarm_repeat_count
+        self.suspend_aware = suspend_aware
+        self.control_socket = control_socket
+        self.single_instance = single_instance
+
+    def drop_invalid_colors(self, is_color, fallback_colors=DEFAULT_COLORS):
         """
-        Updates the font sizes of various widgets based on the current window height.
+        Replaces each [Colors] value that `is_color` rejects with the one in
+        `fallback_colors`, and skips the warning stages whose color it rejects, the
+        way malformed actions are skipped. Colors can only be checked by Tk, so
+        this runs as soon as a Tk root exists, before any window uses them.
         """
-        current_height = self.root.winfo_height()
-        current_width = self.root.winfo_width()
+        for key, value in self.colors.items():
+            if not is_color(value):
+                self.colors[key] = fallback_colors[key]
+        self.thresholds = ThresholdTable(stage for stage in self.thresholds.stages
+                                         if is_color(self.colors.get(stage[1], stage[1])))
 
-        if ((abs(current_height - self.last_height) < 5 and self.last_height != 1 and current_height != 0) and 
-            (abs(current_width - self.last_width) < 5 and self.last_width != 1 and current_width != 0)):
-            return
-        
-        font_size_buttons = max(10, min(53, int(current_height / 14)))
-        font_size_spin = max(28, min(220, int(current_height / 7)))
-        font_size_text = max(10, min(50, int(current_height / 23)))
-        
-        button_font = Font(family='Helvetica', size=font_size_buttons, weight='bold')
-        text_font = Font(family='Helvetica', size=font_size_text)
-        spin_font = Font(family='Helvetica', size=font_size_spin, weight='bold')
-
-        self.active_button.config(font=button_font)
-        self.stop_button.config(font=button_font)
-        self.pause_button.config(font=button_font)
-
-        self.hours_frame.config(font=text_font)
-        self.minutes_frame.config(font=text_font)
-        self.seconds_frame.config(font=text_font)
-
-        self.hours_select.config(font=spin_font)
-        self.minutes_select.config(font=spin_font)
-        self.seconds_select.config(font=spin_font)
-       
-        if self.clock is not None:
-            font_size_clock = max(47, int(current_height / 4))
-            self.clock.config(font=Font(family='Helvetica', size=font_size_clock, weight='bold'))
-        
-        self.last_height = current_height
-        self.last_width = current_width
-
-    def _start_resize(self, event):
+    def update(self, new):
         """
-        Records the initial position and determines the corner for resizing.
+        Copies the reloadable values of `new` and returns the names of the ones
+        that changed: attribute names and the keys of the colors that changed.
         """
-        margin = 25
-        self.start_x = event.x_root
-        self.start_y = event.y_root
-
-        self.win_x = self.root.winfo_x()
-        self.win_y = self.root.winfo_y()
-        self.win_width = self.root.winfo_width()
-        self.win_height = self.root.winfo_height()
-
-        self.resize_corner = None
-        if event.x <= margin and event.y <= margin:
-            self.resize_corner = "top_left"
-        elif event.x >= self.win_width - margin and event.y <= margin:
-            self.resize_corner = "top_right"
-        elif event.x <= margin and event.y >= self.win_height - margin:
-            self.resize_corner = "bottom_left"
-        elif event.x >= self.win_width - margin and event.y >= self.win_height - margin:
-            self.resize_corner = "bottom_right"
-
-    def _do_resize(self, event):
+        changed = set()
+        for key, value in new.colors.items():
+            if self.colors.get(key) != value:
+                self.colors[key] = value
+                changed.add(key)
+        for name in self.RELOADABLE:
+            value = getattr(new, name)
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                changed.add(name)
+        return changed
+
+DURATION_UNITS_PATTERN = re.compile(r'(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?')
+
+def parse_duration(text):
+    """
+    Parses a duration such as '1h30m', '25m', '90s', '90' (seconds) or '1:30:00'
+    into seconds. Raises ValueError if it is malformed or out of range.
+    """
+    text = text.strip().lower().replace(" ", "")
+    if ':' in text:
+        parts = text.split(':')
+        if len(parts) > 3 or not all(part.isdigit() for part in parts):
+            raise ValueError(f"duración no válida: {text!r}")
+        seconds = 0
+        for part in parts:
+            seconds = seconds * 60 + int(part)
+    elif text.isdigit():
+        seconds = int(text)
+    else:
+        match = DURATION_UNITS_PATTERN.fullmatch(text)
+        if not text or match is None:
+            raise ValueError(f"duración no válida: {text!r}")
+        hours, minutes, secs = (int(group or 0) for group in match.groups())
+        seconds = hours * 3600 + minutes * 60 + secs
+
+    if not 0 < seconds <= MAX_DURATION_SECONDS:
+        raise ValueError(f"la duración debe estar entre 1 s y {format_hms(MAX_DURATION_SECONDS)}")
+    return seconds
+
+SEQUENCE_ITEM_PATTERN = re.compile(r'\s*(?:\(([^()]*)\)\s*[x×]\s*(\d+)|([^,()]*[^,()\s]))\s*(?:,|$)')
+
+def parse_sequence(text):
+    """
+    Parses a [Sequences] entry such as '(trabajo 25m, descanso 5m) x4, descanso 15m'
+    into a tuple of (label, seconds) stages, expanding the repeated groups.
+    Raises ValueError if a stage or a repeat count is malformed.
+    """
+    text = text.strip()
+    stages = []
+    position = 0
+    while position < len(text):
+        match = SEQUENCE_ITEM_PATTERN.match(text, position)
+        if match is None:
+            raise ValueError(f"secuencia no válida: {text!r}")
+        group, repeats, single = match.groups()
+        if group is not None:
+            if not 0 < int(repeats) <= SEQUENCE_MAX_REPEATS:
+                raise ValueError(f"las repeticiones deben estar entre 1 y {SEQUENCE_MAX_REPEATS}")
+            stages.extend([_parse_sequence_stage(stage) for stage in group.split(',')] * int(repeats))
+        else:
+            stages.append(_parse_sequence_stage(single))
+        position = match.end()
+    if not stages:
+        raise ValueError("la secuencia está vacía")
+    return tuple(stages)
+
+def _parse_sequence_stage(text):
+    """Parses one 'label duration' stage; the label is optional."""
+    label, _, duration = text.strip().rpartition(' ')
+    return (label.strip(), parse_duration(duration))
+
+def parse_action(name, value):
+    """
+    Parses an [Actions] entry such as 'command: notify-send Fin', 'shutdown',
+    'file: C:\\fin.txt' or 'http: http://127.0.0.1:8080/fin' into (name, kind, argument).
+    Raises ValueError if the kind is unknown or its argument is missing.
+    """
+    kind, _, argument = value.partition(':')
+    kind = kind.strip().lower()
+    argument = argument.strip()
+    if kind not in ACTION_KINDS:
+        raise ValueError(f"tipo de acción desconocido: {kind!r}")
+    if kind in ('command', 'file', 'http') and not argument:
+        raise ValueError(f"la acción {kind!r} necesita un argumento")
+    return (name, kind, argument)
+
+class ThresholdTable:
+    """
+    Warning stages compiled once from [Thresholds] and sorted from the earliest
+    (largest) threshold. Each stage is (seconds, color, blink, sound, action).
+    index_for() finds the stage for any remaining time with a binary search, so
+    a countdown only needs it when it starts or jumps; afterwards it just waits
+    for the next stage.
+    """
+    def __init__(self, stages):
+        self.stages = tuple(sorted(stages, key=lambda stage: -stage[0]))
+        self.bounds = [-stage[0] for stage in self.stages] # Ascending, for bisect
+
+    @classmethod
+    def default(cls):
+        """Returns the stages used when config.ini defines none."""
+        return cls(parse_threshold(key, value) for key, value in DEFAULT_THRESHOLDS.items())
+
+    def __len__(self):
+        return len(self.stages)
+
+    def __eq__(self, other):
+        return isinstance(other, ThresholdTable) and self.stages == other.stages
+
+    def index_for(self, remaining_seconds):
+        """Returns the index of the stage active with this much time left, or -1."""
+        return bisect.bisect_right(self.bounds, -remaining_seconds) - 1
+
+    def color(self, index, colors):
+        """Returns the clock color of a stage (-1 = no stage yet)."""
+        if index < 0:
+            return colors['clock_color_normal']
+        color = self.stages[index][1]
+        return colors.get(color, color)
+
+def parse_threshold(key, value):
+    """
+    Parses a [Thresholds] entry such as '10s = red, blink, sound, action: command: beep'
+    into (seconds, color, blink, sound, action). Raises ValueError if it is malformed.
+    """
+    seconds = parse_duration(key)
+    color, _, rest = value.partition(',')
+    color = color.strip()
+    if not color:
+        raise ValueError(f"falta el color del umbral {key!r}")
+    blink = sound = False
+    action = None
+    while rest.strip():
+        part, _, tail = rest.partition(',')
+        option = part.strip().lower()
+        if option.startswith('action'):
+            # The action goes last and may itself contain commas
+            action = parse_action(key, rest.strip()[len('action'):].lstrip(' :'))
+            break
+        if option == 'blink':
+            blink = True
+        elif option == 'sound':
+            sound = True
+        elif option:
+            raise ValueError(f"opción de umbral desconocida: {option!r}")
+        rest = tail
+    return (seconds, color, blink, sound, action)
+
+WEEKDAYS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+            'lun': 0, 'mar': 1, 'mie': 2, 'mié': 2, 'jue': 3, 'vie': 4, 'sab': 5, 'sáb': 5, 'dom': 6}
+SCHEDULE_PATTERN = re.compile(
+    r'(?:at\s+(?P<at>\d{1,2}:\d{2}(?:\s*,\s*\d{1,2}:\d{2})*)'
+    r'|every\s+(?P<every>\S+)(?:\s+from\s+(?P<begin>\d{1,2}:\d{2})\s+to\s+(?P<end>\d{1,2}:\d{2}))?)'
+    r'(?:\s+on\s+(?P<days>[^\s,]+(?:\s*,\s*[^\s,]+)*))?'
+    r'(?:\s+start\s+(?P<start>\S+))?')
+
+def _parse_clock_time(text):
+    """Parses 'HH:MM' into seconds since midnight."""
+    hours, minutes = (int(part) for part in text.split(':'))
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise ValueError(f"hora no válida: {text!r}")
+    return hours * 3600 + minutes * 60
+
+def _parse_weekdays(text):
+    """Parses 'mon-fri', 'sat,sun' or 'lun-vie' into a bitmask (bit 0 = Monday)."""
+    mask = 0
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        try:
+            day, last_day = WEEKDAYS[first], WEEKDAYS[last or first]
+        except KeyError:
+            raise ValueError(f"día no válido: {part.strip()!r}")
+        mask |= 1 << day
+        while day != last_day: # Ranges may wrap around, e.g. fri-mon
+            day = (day + 1) % 7
+            mask |= 1 << day
+    return mask
+
+def _local_timestamp(wall):
+    """
+    Returns the timestamp of a naive local time. A time skipped by a DST change
+    maps to the change itself, the first instant after the gap.
+    """
+    import datetime
+    timestamp = wall.timestamp()
+    if datetime.datetime.fromtimestamp(timestamp) == wall:
+        return timestamp
+    # In a gap the two folds straddle the change: the local time jumps over
+    # `wall` between them, so search for the instant it does
+    before, after = math.floor(wall.replace(fold=1).timestamp()), math.ceil(timestamp)
+    while after - before > 1:
+        middle = (before + after) // 2
+        if datetime.datetime.fromtimestamp(middle) >= wall:
+            after = middle
+        else:
+            before = middle
+    return float(after)
+
+class ScheduleRule:
+    """
+    A [Schedules] rule compiled into the wall-clock times it fires at:
+
+        at 17:30 on mon-fri
+        every 45m from 09:00 to 18:00 on lun-vie start 5m
+
+    next_fire() works on local wall-clock dates and converts each candidate to
+    a timestamp, so rules keep their local time across DST changes; a time that
+    does not exist that day fires at the moment the clocks change (02:30 on a
+    night that skips from 02:00 to 03:00 fires at 03:00), and a repeated time
+    fires once, at its first occurrence.
+    """
+    def __init__(self, name, text):
+        match = SCHEDULE_PATTERN.fullmatch(text.strip().lower())
+        if match is None:
+            raise ValueError(f"regla no válida: {text!r}")
+        self.name = name
+        self.text = text.strip()
+        if match['at']:
+            self.times = sorted(_parse_clock_time(part) for part in match['at'].split(','))
+            self.interval = 0
+        else:
+            self.interval = parse_duration(match['every'])
+            self.begin = _parse_clock_time(match['begin']) if match['begin'] else 0
+            self.end = _parse_clock_time(match['end']) if match['end'] else 86400 - 1
+            if self.end < self.begin:
+                raise ValueError(f"el intervalo termina antes de empezar: {text!r}")
+        self.weekdays = _parse_weekdays(match['days']) if match['days'] else 0b1111111
+        self.start_seconds = parse_duration(match['start']) if match['start'] else None
+
+    def __eq__(self, other):
+        return isinstance(other, ScheduleRule) and (self.name, self.text) == (other.name, other.text)
+
+    def _times_from(self, after):
+        """Yields the day's firing times (seconds since midnight) from about `after` on."""
+        after -= 3600 # DST slack: the caller checks each candidate's real timestamp
+        if not self.interval:
+            yield from self.times[bisect.bisect_left(self.times, after):]
+            return
+        first = max(0, -(-(after - self.begin) // self.interval))
+        for seconds in range(self.begin + first * self.interval, self.end + 1, self.interval):
+            yield seconds
+
+    def next_fire(self, now_ts):
+        """Returns the first firing timestamp strictly after `now_ts`, or None."""
+        import datetime
+        now = datetime.datetime.fromtimestamp(now_ts)
+        midnight = datetime.datetime.combine(now.date(), datetime.time())
+        elapsed = int((now - midnight).total_seconds())
+        for offset in range(8):
+            day = midnight + datetime.timedelta(days=offset)
+            if not self.weekdays >> day.weekday() & 1:
+                continue
+            for seconds in self._times_from(elapsed if offset == 0 else 0):
+                timestamp = _local_timestamp(day + datetime.timedelta(seconds=seconds))
+                if timestamp > now_ts:
+                    return timestamp
+        return None
+
+class ScheduleQueue:
+    """
+    Min-heap holding only the next firing time of each rule. Firing a rule
+    computes its following occurrence lazily, so between firings the rules cost
+    nothing but the single wakeup aimed at the earliest one.
+    """
+    def __init__(self, rules, now_ts):
+        self.rules = rules
+        self.heap = []
+        for index, rule in enumerate(rules):
+            timestamp = rule.next_fire(now_ts)
+            if timestamp is not None:
+                self.heap.append((timestamp, index))
+        heapq.heapify(self.heap)
+
+    def next_timestamp(self):
+        """Returns when the earliest rule fires, or None if none will."""
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now_ts):
         """
-        Performs the window resizing based on the detected corner.
+        Returns the rules due at `now_ts` and queues their next occurrences. A
+        rule whose occurrences were all missed (clock jump, suspend) fires once.
         """
-        if not self.resize_corner:
-            return
+        due = []
+        while self.heap and self.heap[0][0] <= now_ts:
+            _, index = heapq.heappop(self.heap)
+            rule = self.rules[index]
+            due.append(rule)
+            timestamp = rule.next_fire(now_ts)
+            if timestamp is not None:
+                heapq.heappush(self.heap, (timestamp, index))
+        return due
+
+def parse_bool(value, default):
+    """Parses an INI boolean ('1', 'yes', 'true', 'on' / '0', 'no', 'false', 'off')."""
+    value = str(value).strip().lower()
+    if value in ('1', 'yes', 'true', 'on', 'si', 'sí'):
+        return True
+    if value in ('0', 'no', 'false', 'off'):
+        return False
+    return default
+
+def load_settings(previous=None, warn=None):
+    """
+    Loads configuration from config.ini, creating the file only when it does not exist.
+    Keys and sections missing from an existing file take their defaults in memory; the
+    file is never rewritten, so the user's comments and layout survive upgrades. With `previous` (a reload), the file is never written, no dialogs are shown and
+    every invalid value keeps its value from `previous` instead of the default.
+    Problems are reported with `warn(title, message)`, a Tk dialog by default.
+    """
+    if warn is None:
+        from tkinter import messagebox
+        warn = messagebox.showwarning
+    config = configparser.ConfigParser()
+
+    # Default color settings
+    default_colors = dict(DEFAULT_COLORS)
+
+    # Default general settings
+    default_settings = {
+        'alarm_repeat_count': str(30), # Stored as string, convert to int later
+        'suspend_aware': 'yes', # Subtract the time the computer spent suspended
+        'control_socket': '', # Unix socket path of the control API; empty disables it
+        'single_instance': 'no', # Forward new launches to the running process
+        'action_timeout': '30', # Seconds each expiry action may run
+        'action_workers': '2', # Expiry actions running at the same time
+        'display_precision': '0', # 0 = seconds, 1 = tenths, 2 = hundredths
+        'clock_renderer': 'label', # 'canvas' draws the clock from cached digit glyphs
+        'terminal_alarm_command': '', # Alarm of --terminal; empty rings the terminal bell
+        'sync_role': 'off', # 'source' publishes the countdown, 'follower' mirrors it
+        'sync_group': SYNC_DEFAULT_GROUP, # Multicast group:port shared by source and followers
+        'sequence_cue': 'yes' # Play a short excerpt of the alarm when a sequence stage begins
+    }
+
+    # Example presets, only written when the section does not exist yet
+    default_presets = {
+        'te': '3m',
+        'pomodoro': '25m',
+        'descanso': '5m'
+    }
+
+    sections = {'Colors': default_colors, 'Settings': default_settings}
+    exists = os.path.exists(CONFIG_FILE)
+
+    if exists:
+        try:
+            config.read(CONFIG_FILE)
+            # Overwrite defaults with values from file
+            for section, values in sections.items():
+                if section in config:
+                    for key in values:
+                        if key in config[section]:
+                            values[key] = config[section][key]
+        except Exception as e:
+            if previous is not None:
+                return previous # Probably caught mid-save; the next change reloads it
+            warn("Error de Configuración", f"Error al leer config.ini: {e}. Usando valores por defecto.")
+    elif previous is not None:
+        return previous
+
+    if 'Presets' not in config:
+        config['Presets'] = default_presets
+    if 'Thresholds' not in config:
+        config['Thresholds'] = DEFAULT_THRESHOLDS
+
+    if not exists and previous is None:
+        # First run: write every default so the options can be discovered
+        for section, values in sections.items():
+            config[section] = values
+        try:
+            with open(CONFIG_FILE, 'w') as f:
+                config.write(f)
+        except Exception as e:
+            warn("Error de Archivo", f"No se pudo crear config.ini: {e}. Continuará sin archivo de configuración.")
+
+    # Invalid values fall back per key: to the defaults on startup, to the
+    # current values on a reload
+    fallback = previous if previous is not None else Settings(None, 30)
+
+    try:
+        alarm_repeat_count = max(0, int(default_settings['alarm_repeat_count']))
+    except ValueError:
+        alarm_repeat_count = fallback.alarm_repeat_count
+
+    actions = []
+    if 'Actions' in config:
+        for name, value in config.items('Actions', raw=True): # Commands may contain '%'
+            try:
+                actions.append(parse_action(name, value))
+            except ValueError:
+                pass # A malformed action is skipped; the others still run
+
+    schedules = []
+    if 'Schedules' in config:
+        for name, value in config.items('Schedules', raw=True):
+            try:
+                schedules.append(ScheduleRule(name, value))
+            except ValueError:
+                pass # A malformed rule is skipped; the others still fire
 
-        dx = event.x_root - self.start_x
-        dy = event.y_root - self.start_y
-
-        new_width = self.win_width
-        new_height = self.win_height
-        new_x = self.win_x
-        new_y = self.win_y
-
-        if self.resize_corner == "bottom_right":
-            new_width = max(self.win_width + dx, MIN_WIDTH)
-            new_height = max(self.win_height + dy, MIN_HEIGHT)
-        elif self.resize_corner == "top_left":
-            new_width = max(self.win_width - dx, MIN_WIDTH)
-            new_height = max(self.win_height - dy, MIN_HEIGHT)
-            new_x = self.win_x + (self.win_width - new_width)
-            new_y = self.win_y + (self.win_height - new_height)
-        elif self.resize_corner == "top_right":
-            new_width = max(self.win_width + dx, MIN_WIDTH)
-            new_height = max(self.win_height - dy, MIN_HEIGHT)
-            new_y = self.win_y + (self.win_height - new_height)
-        elif self.resize_corner == "bottom_left":
-            new_width = max(self.win_width - dx, MIN_WIDTH)
-            new_height = max(self.win_height + dy, MIN_HEIGHT)
-            new_x = self.win_x + (self.win_width - new_width)
-
-        self.root.geometry(f"{new_width}x{new_height}+{int(new_x)}+{int(new_y)}")
-
-    def _stop_resize(self, event):
-        """Finalizes the resizing process."""
-        self.resize_corner = None
+    sequences = {}
+    if 'Sequences' in config:
+        for name, value in config.items('Sequences', raw=True):
+            try:
+                sequences[name] = parse_sequence(value)
+            except ValueError:
+                pass # A malformed sequence is skipped; the others stay usable
+
+    stages = []
+    for key, value in config.items('Thresholds', raw=True):
+        try:
+            stages.append(parse_threshold(key, value))
+        except ValueError:
+            pass # A malformed stage is skipped; the others still apply
+
+    presets = {}
+    for name, value in config['Presets'].items():
+        try:
+            presets[name] = parse_duration(value)
+        except ValueError:
+            pass # A malformed preset is skipped; the others stay usable
+
+    renderer = default_settings['clock_renderer'].strip().lower()
+    sync_role = default_settings['sync_role'].strip().lower()
+    return Settings(default_colors, alarm_repeat_count,
+                    suspend_aware=parse_bool(default_settings['suspend_aware'], fallback.suspend_aware),
+                    control_socket=default_settings['control_socket'].strip(),
+                    single_instance=parse_bool(default_settings['single_instance'], fallback.single_instance),
+                    presets=presets,
+                    actions=actions,
+                    action_timeout=_parse_positive_int(default_settings['action_timeout'], fallback.action_timeout),
+                    action_workers=_parse_positive_int(default_settings['action_workers'], fallback.action_workers),
+                    display_precision=_parse_precision(default_settings['display_precision'], fallback.display_precision),
+                    clock_renderer=renderer if renderer in ('label', 'canvas') else fallback.clock_renderer,
+                    thresholds=ThresholdTable(stages),
+                    terminal_alarm_command=default_settings['terminal_alarm_command'].strip(),
+                    schedules=schedules,
+                    sync_role=sync_role if sync_role in ('off', 'source', 'follower') else fallback.sync_role,
+                    sync_group=default_settings['sync_group'].strip(),
+                    sequences=sequences,
+                    sequence_cue=parse_bool(default_settings['sequence_cue'], fallback.sequence_cue))
+
+def _parse_precision(value, default=0):
+    """Parses display_precision, falling back to `default`."""
+    try:
+        precision = int(value)
+    except ValueError:
+        return default
+    return precision if precision in DISPLAY_PRECISIONS else default
+
+def _parse_positive_int(value, default):
+    """Parses a positive integer setting, falling back to `default`."""
+    try:
+        number = int(value)
+    except ValueError:
+        return default
+    return number if number > 0 else default
+
+def import_pygame():
+    """Imports pygame on first use so startup does not pay for it."""
+    import pygame
+    return pygame
+
+def _benchmark_runner(clock, scheduler, duration_seconds, render_ns=0):
+    """Starts a headless CountdownRunner and returns it with its expiry record."""
+    countdown = Countdown(clock)
+    expired_at = []
+
+    def on_tick(remaining):
+        format_hms(remaining)
+        clock.advance(render_ns)
+
+    runner = CountdownRunner(scheduler, countdown, on_tick, lambda: expired_at.append(clock.now_ns()))
+    runner.start(duration_seconds)
+    return runner, countdown.deadline_ns, expired_at
+
+def run_benchmarks():
+    """
+    Measures the timing path headless, on a virtual clock unless noted, and prints
+    the results. Used to catch regressions without Tk or real waiting.
+    """
+    import random
+    rng = random.Random(1234)
+    results = []
+
+    # Fast-forward a full 99:59:59 countdown: jump to its last second, then tick out
+    clock = FakeClock()
+    scheduler = VirtualScheduler(clock)
+    t0 = time.perf_counter()
+    runner, deadline, expired_at = _benchmark_runner(clock, scheduler, MAX_DURATION_SECONDS)
+    scheduler.jump(deadline - NS_PER_SECOND - clock.now_ns())
+    scheduler.run_until(deadline + NS_PER_SECOND)
+    results.append(("Avance rápido de 99:59:59", f"{(time.perf_counter() - t0) * 1000:.2f} ms reales, {scheduler.wakeups} despertares"))
+
+    # Cumulative drift over simulated hours on a busy machine (0-30 ms late wakeups, 5 ms renders)
+    hours = 10
+    render_ns = 5_000_000
+
+    def lateness():
+        return rng.randrange(0, 30_000_000)
+
+    clock = FakeClock()
+    scheduler = VirtualScheduler(clock, lateness)
+    runner, deadline, expired_at = _benchmark_runner(clock, scheduler, hours * 3600, render_ns)
+    scheduler.run_until(deadline + NS_PER_SECOND)
+    error_ms = (expired_at[0] - deadline) / 1e6 if expired_at else float('nan')
+    # The old sleep(1)-and-decrement loop paid every delay on every tick
+    legacy_s = sum(lateness() + render_ns for _ in range(hours * 3600)) / NS_PER_SECOND
+    results.append((f"Error al expirar tras {hours} h simuladas", f"{error_ms:.1f} ms (sleep(1) y decremento: {legacy_s:.0f} s)"))
+
+    # Wakeups per minute while idle, paused and running
+    clock = FakeClock()
+    scheduler = VirtualScheduler(clock)
+    scheduler.run_for(60 * NS_PER_SECOND)
+    idle = scheduler.wakeups
+    runner, deadline, expired_at = _benchmark_runner(clock, scheduler, 600)
+    runner.pause()
+    scheduler.wakeups = 0
+    scheduler.run_for(60 * NS_PER_SECOND)
+    paused = scheduler.wakeups
+    runner.resume()
+    scheduler.wakeups = 0
+    scheduler.run_for(60 * NS_PER_SECOND)
+    results.append(("Despertares por minuto (inactivo / pausa / en marcha)", f"{idle} / {paused} / {scheduler.wakeups}"))
+
+    results.append(("Latencia tick-a-pantalla (p50 / p99)", _benchmark_display()))
+    results.append(("Latencia expiración-a-alarma (reloj real)", _benchmark_alarm()))
+
+    width = max(len(name) for name, _ in results)
+    for name, value in results:
+        print(f"{name:<{width}}  {value}")
+
+def _benchmark_display(samples=2000):
+    """
+    Times what every tick does on screen: remaining time to clock text to a
+    redrawn Label. Needs a display.
+    """
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        return f"no disponible ({e})"
+    try:
+        label = tk.Label(root, font=('Helvetica', 47, 'bold'))
+        label.pack()
+        root.update()
+        countdown = Countdown()
+        countdown.start(3600)
+        latencies = []
+        for _ in range(samples):
+            start = time.monotonic_ns()
+            label.config(text=format_clock(countdown.remaining_ns(), 2))
+            root.update_idletasks()
+            latencies.append(time.monotonic_ns() - start)
+    finally:
+        root.destroy()
+    latencies.sort()
+    return f"{latencies[len(latencies) // 2] / 1000:.1f} / {latencies[len(latencies) * 99 // 100] / 1000:.1f} µs"
+
+def _benchmark_alarm():
+    """
+    Times a real 1 s countdown from its deadline until AlarmPlayer has handed
+    the sound to the mixer, the same span the 'alarm' tick metric records.
+    """
+    try:
+        pygame = import_pygame()
+        pygame.mixer.init()
+        loop = SelectScheduler()
+        alarm = AlarmPlayer(loop, pygame, ALARMA)
+    except Exception as e:
+        return f"no disponible ({e})"
+    countdown = Countdown()
+    latencies = []
+
+    def on_expire():
+        alarm.play(1)
+        latencies.append(countdown.clock.now_ns() - runner.expired_deadline_ns)
+        alarm.stop()
+        loop.stop()
+
+    runner = CountdownRunner(loop, countdown, lambda remaining: None, on_expire)
+    runner.start(1)
+    loop.run()
+    return f"{latencies[0] / 1e6:.2f} ms"
+
+def _duration_arg(text):
+    """argparse type for --start."""
+    try:
+        return parse_duration(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def print_error(title, message):
+    """Reports a problem on stderr; stands in for the Tk dialogs where there is no window."""
+    print(f"{title}: {message}", file=sys.stderr)
+
+def resolve_start_duration(args, settings, report_error=None):
+    """
+    Returns the seconds requested with --start/--preset, or None to show the setup
+    screen. An unknown preset is reported with `report_error(title, message)`, a
+    Tk dialog by default, and also returns None.
+    """
+    if args.start:
+        return args.start
+    if args.preset:
+        duration = settings.presets.get(args.preset.lower())
+        if duration is None:
+            if report_error is None:
+                from tkinter import messagebox
+                report_error = messagebox.showerror
+            report_error("Preajuste", f"No existe el preajuste '{args.preset}' en la sección [Presets] de config.ini.")
+        return duration
+    return None
+
+def resolve_start_sequence(args, settings):
+    """Returns the (name, stages) requested with --sequence, or None."""
+    if not args.sequence:
+        return None
+    name = args.sequence.lower()
+    stages = settings.sequences.get(name)
+    if stages is None:
+        from tkinter import messagebox
+        messagebox.showerror("Secuencia", f"No existe la secuencia '{args.sequence}' en la sección [Sequences] de config.ini.")
+        return None
+    return (name, stages)
+
+def _date_arg(text):
+    """argparse type for --since/--until: a local date as YYYY-MM-DD, in Unix seconds."""
+    try:
+        return int(time.mktime(time.strptime(text, "%Y-%m-%d")))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha no válida: {text!r} (use AAAA-MM-DD)")
+
+def parse_args(argv=None):
+    """Parses the command-line options."""
+    parser = argparse.ArgumentParser(description="Temporizador de cuenta regresiva.")
+    parser.add_argument("--multi", action="store_true",
+                        help="Abre un tablero con varios temporizadores en un solo proceso.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Muestra el tiempo hasta el primer cuadro y termina.")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Mide el motor de cuenta regresiva sin interfaz gráfica y termina.")
+    start_group = parser.add_mutually_exclusive_group()
+    start_group.add_argument("--start", metavar="DURACIÓN", type=_duration_arg,
+                             help="Inicia la cuenta regresiva de inmediato, p. ej. 1h30m, 25m, 90s o 1:30:00.")
+    start_group.add_argument("--preset", metavar="NOMBRE",
+                             help="Inicia de inmediato un preajuste de la sección [Presets] de config.ini.")
+    start_group.add_argument("--sequence", metavar="NOMBRE",
+                             help="Inicia de inmediato una secuencia de la sección [Sequences] de config.ini.")
+    parser.add_argument("--control-socket", metavar="RUTA",
+                        help="Activa la API de control en este socket Unix (reemplaza control_socket de config.ini).")
+    parser.add_argument("--control-send", metavar="JSON", action="append",
+                        help='Envía un comando a la API de control y muestra la respuesta, p. ej. \'{"cmd": "remaining"}\'.')
+    parser.add_argument("--metrics-dump", metavar="RUTA", nargs="?", const="-",
+                        help="Al cerrar, escribe las estadísticas de precisión de los ticks (p50/p99/máx) en RUTA o en la salida estándar.")
+    parser.add_argument("--sync", choices=("source", "follower"),
+                        help="Publica (source) o refleja (follower) una cuenta regresiva en la red local (reemplaza sync_role de config.ini).")
+    parser.add_argument("--sync-group", metavar="GRUPO:PUERTO",
+                        help="Grupo multicast de la sincronización (reemplaza sync_group de config.ini).")
+    parser.add_argument("--stopwatch", action="store_true",
+                        help="Abre un cronómetro con vueltas en lugar del temporizador.")
+    parser.add_argument("--terminal", action="store_true",
+                        help="Muestra el temporizador en la terminal (curses), sin ventana ni pygame.")
+    parser.add_argument("--stats", action="store_true",
+                        help="Muestra las estadísticas del historial de temporizadores y termina.")
+    parser.add_argument("--since", metavar="FECHA", type=_date_arg,
+                        help="Con --stats, cuenta solo los temporizadores iniciados desde esta fecha (AAAA-MM-DD).")
+    parser.add_argument("--until", metavar="FECHA", type=_date_arg,
+                        help="Con --stats, cuenta solo los temporizadores iniciados antes de esta fecha (AAAA-MM-DD).")
+    return parser.parse_args(argv)
+
+class TerminalTimer:
+    """
+    Curses frontend for SSH sessions and containers. It runs the same TimerEngine
+    as the Tk window (countdown, warning stages and [Actions]) from a
+    SelectScheduler and rings a BellAlarm. Every draw goes through curses'
+    virtual screen, so only the characters that changed are sent to the terminal.
+    """
+    def __init__(self, screen, settings, curses):
+        self.screen = screen
+        self.settings = settings
+        self.curses = curses
+        self.loop = SelectScheduler()
+        self.engine = TimerEngine(self.loop, settings, self._on_tick, self._on_stage, self._on_expire)
+        self.countdown = self.engine.countdown
+        self.runner = self.engine.runner
+        self.thresholds = settings.thresholds
+        self.alarm = BellAlarm(self.loop, curses.beep, settings.terminal_alarm_command)
+        self.text = ""
+        self.pair = 0
+        self.status = ""
+        self.expired = False
+        self.resize_r = self.resize_w = None
+
+    def run(self, duration_seconds):
+        """Counts down from `duration_seconds` until it ends or the user quits."""
+        curses = self.curses
+        curses.curs_set(0)
+        self.screen.nodelay(True)
+        self.pairs = self._init_colors()
+        self.glyph_char = "█" if "█".encode(sys.stdout.encoding or 'ascii', 'replace') != b'?' else "#"
+
+        # SIGWINCH only writes to a pipe; the resize itself runs on the loop
+        self.resize_r, self.resize_w = os.pipe()
+        os.set_blocking(self.resize_w, False)
+        previous_handler = signal.signal(signal.SIGWINCH, lambda signum, frame: self._wake_resize())
+        self.loop.add_reader(self.resize_r, self._on_resize)
+        self.loop.add_reader(sys.stdin.fileno(), self._on_keys)
+        try:
+            self.status = "ESPACIO: pausar · Q: salir"
+            self.runner.start(duration_seconds)
+            self.engine.sync_stage()
+            self.loop.run()
+        finally:
+            signal.signal(signal.SIGWINCH, previous_handler)
+            os.close(self.resize_r)
+            os.close(self.resize_w)
+            self.alarm.stop()
+            self.engine.actions.shutdown()
+
+    def _init_colors(self):
+        """Returns the curses color pair of each warning stage (0 = default)."""
+        curses = self.curses
+        pairs = [0] * len(self.thresholds)
+        if not curses.has_colors():
+            return pairs
+        curses.start_color()
+        curses.use_default_colors()
+        for index in range(len(self.thresholds)):
+            curses.init_pair(index + 1, self._terminal_color(index), -1)
+            pairs[index] = index + 1
+        return pairs
+
+    def _terminal_color(self, index):
+        """Maps the color of a stage to one of the 8 basic terminal colors."""
+        color = self.thresholds.color(index, self.settings.colors).strip().lower()
+        if color in TERMINAL_COLORS:
+            return TERMINAL_COLORS[color]
+        if re.fullmatch(r'#[0-9a-f]{6}', color):
+            red, green, blue = (int(color[i:i + 2], 16) >= 128 for i in (1, 3, 5))
+            return red | green << 1 | blue << 2
+        return 1 if index == len(self.thresholds) - 1 else 3 # Unknown name: red for the last stage
+
+    def _on_tick(self, remaining):
+        self.text = format_hms(remaining)
+        self._draw()
+
+    def _on_stage(self, index, crossed):
+        self.pair = self.pairs[index] if index >= 0 else 0
+        if crossed and self.thresholds.stages[index][3]:
+            self.curses.beep()
+        self._draw()
+
+    def _on_expire(self):
+        self.expired = True
+        self.engine.end_stages()
+        self.text = format_hms(0)
+        self.pair = self.pairs[-1] if self.pairs else 0
+        self.status = "¡Tiempo! Pulsa cualquier tecla"
+        self._draw()
+        self.alarm.play(self.settings.alarm_repeat_count, self.loop.stop)
+        self.engine.run_expiry_actions()
+
+    def _draw(self):
+        """Draws the clock (large when it fits) and the status line."""
+        curses = self.curses
+        screen = self.screen
+        height, width = screen.getmaxyx()
+        screen.erase()
+        attributes = curses.color_pair(self.pair) | curses.A_BOLD
+        big_width = 4 * len(self.text) - 1
+        if height >= 7 and width > big_width:
+            top = max(0, (height - 6) // 2)
+            left = (width - big_width) // 2
+            for row in range(5):
+                line = " ".join(BIG_GLYPHS[ch][row] for ch in self.text).replace("█", self.glyph_char)
+                screen.addstr(top + row, left, line, attributes)
+        elif width > len(self.text):
+            screen.addstr(max(0, height // 2 - 1), (width - len(self.text)) // 2, self.text, attributes)
+        if height >= 2 and width > len(self.status):
+            screen.addstr(height - 1, (width - len(self.status)) // 2, self.status, curses.A_DIM)
+        screen.noutrefresh()
+        curses.doupdate()
+
+    def _on_keys(self):
+        while True:
+            key = self.screen.getch()
+            if key == -1:
+                return
+            if self.expired:
+                self.alarm.stop()
+                self.loop.stop()
+            elif key in (ord('q'), ord('Q'), 27):
+                self.runner.stop()
+                self.loop.stop()
+            elif key in (ord(' '), ord('p'), ord('P')):
+                if self.countdown.running:
+                    self.runner.pause()
+                    self.engine.cancel_stage()
+                    self.status = "En pausa · ESPACIO: reanudar · Q: salir"
+                else:
+                    self.runner.resume()
+                    self.engine.sync_stage()
+                    self.status = "ESPACIO: pausar · Q: salir"
+                self._draw()
+
+    def _wake_resize(self):
+        try:
+            os.write(self.resize_w, b'x')
+        except BlockingIOError:
+            pass # A wakeup is already pending
+
+    def _on_resize(self):
+        os.read(self.resize_r, 512)
+        size = os.get_terminal_size(sys.stdout.fileno())
+        self.curses.resizeterm(size.lines, size.columns)
+        self._draw()
+
+def run_terminal(args):
+    """Runs the countdown in the terminal with curses: no Tk window and no pygame."""
+    try:
+        import curses
+        import locale
+    except ImportError:
+        print("El modo terminal necesita el módulo curses, que no está disponible en este sistema.", file=sys.stderr)
+        return 2
+    if args.sequence:
+        print("Las secuencias solo están disponibles en la ventana, no con --terminal.", file=sys.stderr)
+        return 2
+    settings = load_settings(warn=print_error)
+    duration = resolve_start_duration(args, settings, print_error)
+    if args.preset and duration is None:
+        return 2
+    while not duration:
+        try:
+            duration = parse_duration(input("Duración (p. ej. 25m, 1h30m o 90): "))
+        except ValueError as e:
+            print(e)
+        except (EOFError, KeyboardInterrupt):
+            return 1
+    locale.setlocale(locale.LC_ALL, '')
+    try:
+        curses.wrapper(lambda screen: TerminalTimer(screen, settings, curses).run(duration))
+    except KeyboardInterrupt:
+        return 130
+    return 0
+
+class LapWriter:
+    """
+    Streams laps to a CSV file as they are recorded. Lines go through the file's
+    buffer and are flushed every LAPS_FLUSH_EVERY laps and on pause, so the
+    export never holds more than a few lines in memory.
+    """
+    HEADER = "numero,vuelta_ns,total_ns,vuelta,total\n"
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.unflushed = 0
+
+    def write(self, number, lap_ns, total_ns):
+        """Appends one lap line, opening the file on the first lap."""
+        if self.file is None:
+            self.file = open(self.path, 'w', encoding='utf-8', newline='')
+            self.file.write(self.HEADER)
+        self.file.write(f"{number},{lap_ns},{total_ns},{format_elapsed(lap_ns, 3)},{format_elapsed(total_ns, 3)}\n")
+        self.unflushed += 1
+        if self.unflushed >= LAPS_FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Pushes the buffered lines to the file."""
+        if self.file is not None and self.unflushed:
+            self.file.flush()
+            self.unflushed = 0
+
+    def close(self):
+        """Flushes and closes the file; the next lap starts a new one."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.unflushed = 0
+
+def dump_metrics(path):
+    """Writes the tick statistics as text, to stdout when `path` is '-'."""
+    text = TickMetrics.shared().format() + "\n"
+    if path == '-':
+        sys.stdout.write(text)
+        return
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except OSError as e:
+        print(f"No se pudieron guardar las métricas: {e}", file=sys.stderr)
+
+def run_control_client(args):
+    """Sends the --control-send commands and prints the replies."""
+    path = args.control_socket or load_settings().control_socket
+    if not path:
+        print("No hay socket de control: use --control-socket o control_socket en config.ini.", file=sys.stderr)
+        return 2
+    try:
+        commands = [json.loads(command) for command in args.control_send]
+        if not all(isinstance(command, dict) for command in commands):
+            raise ValueError("cada comando debe ser un objeto JSON")
+        for reply in send_control_commands(path, commands):
+            print(json.dumps(reply, ensure_ascii=False), flush=True)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def run_stats(args):
+    """Prints the per-day history aggregates for --stats."""
+    try:
+        days = history_stats(HISTORY_FILE, args.since, args.until)
+    except Exception as e: # sqlite3.Error; the module is imported lazily
+        print(f"Error al leer el historial: {e}", file=sys.stderr)
+        return 1
+    if not days:
+        print("No hay temporizadores registrados en ese período.")
+        return 0
+    print(f"{'Día':<10}  {'Usos':>5}  {'Completados':>11}  {'Cancelados':>10}  {'Tiempo':>9}")
+    for day, sessions, completed, cancelled, focused_ms in days:
+        print(f"{day:<10}  {sessions:>5}  {completed:>11}  {cancelled:>10}  {format_hms(focused_ms // 1000):>9}")
+    sessions = sum(day[1] for day in days)
+    completed = sum(day[2] for day in days)
+    cancelled = sum(day[3] for day in days)
+    print(f"{'Total':<10}  {sessions:>5}  {completed:>11}  {cancelled:>10}  {format_hms(sum(day[4] for day in days) // 1000):>9}")
+    if completed + cancelled:
+        print(f"Completados: {completed / (completed + cancelled):.0%} de los que terminaron o se cancelaron.")
+    return 0
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    root.geometry("285x112")
-    root.minsize(MIN_WIDTH, MIN_HEIGHT)
-    root.attributes("-topmost", True)
-    
-    # Temporarily create an instance to load colors for the root window
-    temp_timer_instance = Timer(root)
-    root.configure(bg=temp_timer_instance.colors['bg_dark'])
-    
-    root.title("Temporizador")
-    
-    if os.path.exists(ICON):
-        root.iconbitmap(ICON)
+    # The Tk frontend imports this module by name: let it find this copy
+    # instead of loading the file a second time
+    sys.modules.setdefault("Temporizador", sys.modules[__name__])
+    args = parse_args()
+    if args.benchmark:
+        run_benchmarks()
+    elif args.stats:
+        sys.exit(run_stats(args))
+    elif args.terminal:
+        sys.exit(run_terminal(args))
+    elif args.control_send:
+        sys.exit(run_control_client(args))
+    elif args.multi:
+        from temporizador_tk import run_board
+        run_board()
+    elif args.stopwatch:
+        from temporizador_tk import run_stopwatch
+        run_stopwatch()
     else:
-        messagebox.showwarning("Advertencia", f"No se encontró el archivo de icono: {ICON}")
-    
-    # Re-instantiate the Timer with the now correctly configured root
-    timer = Timer(root)
-    timer.pack(fill=tk.BOTH, expand=1)
-    
-    root.mainloop()
\ No newline at end of file
+        from temporizador_tk import run_timer
+        run_timer(args)
@@ -0,0 +1,1838 @@
+"""
+Tk frontend of Temporizador: the countdown window, the multi-timer board and
+the stopwatch. Only the graphical modes import it, so --terminal, --stats,
+--benchmark and --control-send never load tkinter.
+"""
+import math
+import os
+import sys
+import time
+from collections import OrderedDict
+from threading import Thread
+import tkinter as tk
+from tkinter import messagebox
+from tkinter.font import Font
+
+from Temporizador import (
+    ALARMA, AUDIO_POLL_MS, AlarmPlayer, BLINK_INTERVAL_MS, CONFIG_FILE, ConfigWatcher,
+    ControlServer, DISPLAY_PRECISIONS, FONT_CACHE_SIZE, FRAME_INTERVAL_MS, HISTORY_FILE, ICON,
+    INSTRUCTIONS_BYTES, INSTRUCTIONS_FILE, JOURNAL_FILE, LapWriter, MAIN_DIR,
+    MAX_DURATION_SECONDS, METRICS_OVERLAY_MS, MIN_HEIGHT, MIN_WIDTH, NS_PER_SECOND,
+    SCHEDULE_RECHECK_MS, SEQUENCE_CUE_MS, SLOT_PAUSED, SLOT_RUNNING, STARTUP_T0,
+    STOPWATCH_FRAME_MS, SYNC_TOLERANCE_NS, ScheduleQueue, SessionHistory, SingleInstance,
+    StateJournal, Stopwatch, SyncFollower, SyncSource, ThresholdTable, TickMetrics, TimerEngine,
+    TimerTable, dump_metrics, format_clock, format_elapsed, format_hms, import_pygame,
+    load_settings, parse_args, parse_sync_group, resolve_start_duration, resolve_start_sequence
+)
+
+class FontCache:
+    """
+    LRU cache of tkinter Font objects keyed by (family, size, weight), so resizing
+    reuses named fonts instead of creating new ones on every <Configure>.
+    """
+    def __init__(self, maxsize=FONT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.fonts = OrderedDict()
+
+    def get(self, family, size, weight='normal'):
+        """Returns the cached Font for the given properties, creating it if needed."""
+        key = (family, size, weight)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.fonts.move_to_end(key)
+            return font
+
+        font = Font(family=family, size=size, weight=weight)
+        self.fonts[key] = font
+        if len(self.fonts) > self.maxsize:
+            self.fonts.popitem(last=False)
+        return font
+
+class CanvasClock(tk.Canvas):
+    """
+    Clock face drawn on a Canvas as one text item per glyph and position. Each
+    glyph ('0'-'9', ':' and '.') is created once per position at the current
+    font and then only shown or hidden, so a tick that changes the last digit
+    costs two state changes regardless of the font size. The glyph items are
+    rebuilt only when the font or the text layout changes.
+
+    It accepts the text/fg/font options of the Label it replaces, so callers can
+    configure either widget the same way.
+    """
+    def __init__(self, parent, text, font, fg, bg):
+        tk.Canvas.__init__(self, parent, bg=bg, highlightthickness=0, borderwidth=0)
+        self.text = ""
+        self.font = font
+        self.fg = fg
+        self.glyphs = {} # (position, char) -> canvas item
+        self.shown = [] # Item currently visible at each position
+        self.layout = None # (font, layout key) the cached glyphs were built for
+        self.cells = [] # x offset of each position's center
+        self.text_width = 0
+        self.origin = (0, 0)
+        self.bind("<Configure>", self._on_resize)
+        self._set_text(text)
+
+    def config(self, **options):
+        """Handles text/fg/font like a Label and passes the rest to the Canvas."""
+        font = options.pop('font', None)
+        fg = options.pop('fg', None)
+        text = options.pop('text', None)
+        if options:
+            tk.Canvas.config(self, **options)
+        if font is not None and font is not self.font:
+            self.font = font
+            self.layout = None
+        if fg is not None and fg != self.fg:
+            self.fg = fg
+            self.itemconfigure('glyph', fill=fg)
+        if text is not None or self.layout is None:
+            self._set_text(self.text if text is None else text)
+
+    configure = config
+
+    def _layout_key(self, text):
+        """Text shape that decides the cell positions: digits are interchangeable."""
+        return ''.join(ch if ch in ':.' else '0' for ch in text)
+
+    def _rebuild(self, text):
+        """Drops the cached glyphs and measures the cells for the current font."""
+        self.delete('glyph')
+        self.glyphs.clear()
+        key = self._layout_key(text)
+        digit_width = max(self.font.measure(d) for d in "0123456789")
+        widths = [self.font.measure(ch) if ch in ':.' else digit_width for ch in key]
+        self.cells = []
+        x = 0
+        for width in widths:
+            self.cells.append(x + width / 2)
+            x += width
+        self.text_width = x
+        self.shown = [None] * len(key)
+        self.layout = (self.font, key)
+        # Ask for the size the equivalent Label would have requested
+        tk.Canvas.config(self, width=x, height=self.font.metrics('linespace'))
+        self.origin = self._origin()
+
+    def _origin(self):
+        """Top-left corner that centers the text in the canvas."""
+        width = self.winfo_width() if self.winfo_ismapped() else int(float(self.cget('width')))
+        height = self.winfo_height() if self.winfo_ismapped() else int(float(self.cget('height')))
+        return ((width - self.text_width) / 2, (height - self.font.metrics('linespace')) / 2)
+
+    def _set_text(self, text):
+        self.text = text
+        if self.layout is None or self.layout != (self.font, self._layout_key(text)):
+            self._rebuild(text)
+        x0, y0 = self.origin
+        for position, ch in enumerate(text):
+            item = self.glyphs.get((position, ch))
+            if item is None:
+                item = self.create_text(x0 + self.cells[position], y0, text=ch, font=self.font, fill=self.fg,
+                                        anchor='n', state='hidden', tags='glyph')
+                self.glyphs[(position, ch)] = item
+            previous = self.shown[position]
+            if previous != item:
+                if previous is not None:
+                    self.itemconfigure(previous, state='hidden')
+                self.itemconfigure(item, state='normal')
+                self.shown[position] = item
+
+    def _on_resize(self, event):
+        """Recenters the cached glyphs with a single move of all items."""
+        if self.layout is None:
+            return
+        x0, y0 = self._origin()
+        self.move('glyph', x0 - self.origin[0], y0 - self.origin[1])
+        self.origin = (x0, y0)
+
+def tk_color_checker(widget):
+    """Returns a predicate telling whether Tk accepts a color name or code."""
+    def is_color(value):
+        try:
+            widget.winfo_rgb(value)
+        except tk.TclError:
+            return False
+        return True
+    return is_color
+
+class Timer(tk.Frame):
+    """
+    A customizable desktop timer application with advanced window controls and
+    color customization via an INI file.
+    """
+    def __init__(self, parent, settings=None, clock=None, timer_id=0, initial_duration=None, initial_sequence=None):
+        self.root = parent
+        self.timer_id = timer_id
+
+        # --- Load Configuration ---
+        self.settings = settings if settings is not None else load_settings()
+        self.colors = self.settings.colors
+        self.alarm_repeat_count = self.settings.alarm_repeat_count
+        
+        tk.Frame.__init__(self, parent, bg=self.colors['bg_dark'])
+        
+        self.active = False
+        self.playing = False
+        self.show_title = True
+        self.siempre_en_primer_plano = True
+
+        # --- Countdown, Warning Stages and Actions (shared with the terminal frontend) ---
+        self.metrics = TickMetrics.shared()
+        self.engine = TimerEngine(self.root, self.settings, self._on_tick, self._on_stage, self._timer_end,
+                                  clock, timer_id, self.metrics)
+        self.countdown = self.engine.countdown
+        self.runner = self.engine.runner
+        self.action_runner = self.engine.actions
+
+        # --- Timer Variables ---
+        self.hours_left = 0
+        self.minutes_left = 0
+        self.seconds_left = 0
+        self.time_remaining = "00:00:00"
+        self.clock = None
+
+        # --- Warning Stage Display ---
+        self.blink_job = None
+        self.clock_fg = self.colors['clock_color_normal']
+
+        # --- Chained Sequence (each stage starts at the previous stage's deadline) ---
+        self.sequence = None # (name, stages) while a [Sequences] entry runs
+        self.sequence_index = 0
+        self.cue_job = None
+        self.on_ring_end = None # Called once when a ring_now() alarm is over
+
+        # --- Sub-second Display (frame-paced, only while running and visible) ---
+        self.precision = self.settings.display_precision
+        self.frame_job = None
+        self.visible = True
+
+        # --- Rendering State ---
+        self.fonts = FontCache()
+        self.applied_options = {}
+        self.text_font = self.fonts.get('Helvetica', 10)
+        self.spin_font = self.fonts.get('Helvetica', 34, 'bold')
+
+        # --- UI Elements Creation ---
+        # The setup widgets (spinboxes) are only built when first needed, so an
+        # instant start from the command line goes straight to the clock view
+        self.setup_built = False
+        self._create_widgets()
+        if not initial_duration and not initial_sequence:
+            self._pack_initial_widgets()
+
+        # --- Tick Metrics ---
+        self.metrics_overlay = None
+        self.metrics_job = None
+        self.journal = StateJournal.shared(JOURNAL_FILE, self.root)
+        self.history = SessionHistory.shared(HISTORY_FILE)
+        self.session = None # Start time, pauses and planned length of the current countdown
+        self.listeners = [] # Callables that receive tick/state events as dicts
+
+        # --- Window Event Bindings ---
+        self.resize_delay = None
+        self.last_height = 1
+        self.last_width = 1 # Initialize last_width
+        self.dragging = False
+        self.pending_geometry = None
+        self.applied_geometry = None
+        self.geometry_job = None
+        self.root.bind("<Configure>", self._on_window_resize)
+        self.root.bind("<Control-Up>", self._adjust_transparency)
+        self.root.bind("<Control-Down>", self._adjust_transparency)
+        self.root.bind("<Control-t>", self._toggle_title_bar)
+        self.root.bind("<Control-T>", self._toggle_title_bar)
+        self.root.bind("<Control-f>", self._toggle_always_on_top)
+        self.root.bind("<Control-F>", self._toggle_always_on_top)
+        self.root.bind("<Control-m>", self._toggle_metrics_overlay)
+        self.root.bind("<Control-M>", self._toggle_metrics_overlay)
+        self.root.bind("<Control-d>", self._cycle_precision)
+        self.root.bind("<Control-D>", self._cycle_precision)
+        self.root.bind("<Map>", self._on_visibility_change)
+        self.root.bind("<Unmap>", self._on_visibility_change)
+        
+        self.root.bind("<Button-1>", self._start_move)
+        self.root.bind("<B1-Motion>", self._do_move)
+        self.root.bind("<ButtonRelease-1>", self._stop_move)
+        
+        self.root.bind("<ButtonPress-3>", self._start_resize)
+        self.root.bind("<B3-Motion>", self._do_resize)
+        self.root.bind("<ButtonRelease-3>", self._stop_resize)
+
+        self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+
+        # pygame is imported and its mixer initialized lazily (see _init_audio)
+        self.pygame = None
+        self.alarm = None
+        self.audio_failed = False # Set once the sound file or the mixer could not be loaded
+        self.alarm_enabled = self.alarm_repeat_count > 0
+
+        if initial_sequence:
+            self.start_sequence(*initial_sequence)
+        elif initial_duration:
+            self._begin_countdown(initial_duration * NS_PER_SECOND)
+
+        self.root.update_idletasks()
+        self._update_text_size()
+
+        # Non-essential startup work runs once the first frame has been drawn
+        self.root.after_idle(lambda: self.root.after(0, self._finish_startup))
+
+    def _finish_startup(self):
+        """Runs the startup work that is not needed for the first frame."""
+        self._restore_from_journal()
+        self._create_instructions_file()
+        self._preload_audio()
+
+    def _preload_audio(self):
+        """
+        Imports pygame and opens the mixer on a worker thread, then builds the
+        alarm on the Tk thread once that is done, so input is never blocked.
+        """
+        if self.pygame is not None or not self.alarm_enabled or not os.path.exists(ALARMA):
+            self._init_audio() # Nothing slow to do, or a warning to show
+            return
+        loader = Thread(target=self._load_pygame, daemon=True)
+        loader.start()
+        self._wait_for_audio(loader)
+
+    @staticmethod
+    def _load_pygame():
+        try:
+            import_pygame().mixer.init()
+        except Exception:
+            pass # _init_audio tries again on the Tk thread and reports the error
+
+    def _wait_for_audio(self, loader):
+        if loader.is_alive():
+            self.root.after(AUDIO_POLL_MS, self._wait_for_audio, loader)
+        else:
+            self._init_audio()
+
+    def _restore_from_journal(self):
+        """Restores a countdown that was still running when the program last stopped."""
+        state = self.journal.load().get(self.timer_id)
+        if state is None or self.active or self.playing:
+            return
+
+        event, value = state
+        if event == 'S':
+            remaining_ns = value - time.time_ns()
+            if remaining_ns <= 0:
+                # The deadline passed while the program was not running
+                self._enter_countdown_view()
+                self._timer_end()
+                return
+            self._begin_countdown(remaining_ns)
+        elif event == 'P' and value > 0:
+            self._begin_countdown(value)
+            self.pause()
+
+    def _init_audio(self):
+        """
+        Imports pygame and initializes its mixer once. Returns True if the alarm can play.
+        """
+        if self.pygame is not None or not self.alarm_enabled:
+            return self.alarm_enabled
+
+        if not os.path.exists(ALARMA):
+            messagebox.showwarning("Advertencia", f"No se encontró el archivo de alarma: {ALARMA}\nLa alarma podría no funcionar.")
+            self.audio_failed = True
+            self.alarm_enabled = False
+            return False
+
+        try:
+            pygame = import_pygame()
+            pygame.mixer.init()
+            self.alarm = AlarmPlayer(self.root, pygame, ALARMA)
+        except Exception as e:
+            messagebox.showerror("Error de Audio", f"No se pudo inicializar Pygame Mixer: {e}\nLa alarma podría no funcionar.")
+            self.audio_failed = True
+            self.alarm_enabled = False
+            return False
+
+        self.pygame = pygame
+        return True
+
+    def _silence_alarm(self):
+        """Stops the alarm sound immediately if it is playing."""
+        if self.alarm is not None:
+            self.alarm.stop()
+
+    def _create_instructions_file(self):
+        """Writes instrucciones.txt unless it already holds the current text."""
+        try:
+            if os.path.exists(INSTRUCTIONS_FILE) and os.path.getsize(INSTRUCTIONS_FILE) == len(INSTRUCTIONS_BYTES):
+                with open(INSTRUCTIONS_FILE, 'rb') as f:
+                    if f.read() == INSTRUCTIONS_BYTES:
+                        return
+            with open(INSTRUCTIONS_FILE, 'wb') as f:
+                f.write(INSTRUCTIONS_BYTES)
+        except Exception as e:
+            messagebox.showwarning("Error de Archivo", f"No se pudo crear instrucciones.txt: {e}")
+
+    def _create_widgets(self):
+        """Creates the clock and button widgets used in every phase."""
+        self.button_frame = tk.Frame(self, bg=self.colors['bg_dark'])
+        self.active_button = tk.Button(self.button_frame, text="Iniciar", command=self.start, 
+                                       bg=self.colors['button_color'], fg="white", relief="raised", anchor="center", 
+                                       activebackground=self.colors['button_active_color'])
+        self.stop_button = tk.Button(self.button_frame, text="Cancelar", command=self.stop, 
+                                     bg=self.colors['button_color'], fg="white", relief="raised", anchor="center", 
+                                     activebackground=self.colors['button_active_color'])
+        self.pause_button = tk.Button(self.button_frame, text="  Pausar   ", command=self.pause, 
+                                      bg=self.colors['button_color'], fg="white", relief="raised", anchor="center", 
+                                      activebackground=self.colors['button_active_color'])
+        
+        if self.settings.clock_renderer == 'canvas':
+            self.clock = CanvasClock(self, text=self.time_remaining, font=self.fonts.get('Helvetica', 36, 'bold'), bg=self.colors['bg_dark'], fg=self.colors['clock_color_normal'])
+        else:
+            self.clock = tk.Label(self, text=self.time_remaining, font=self.fonts.get('Helvetica', 36, 'bold'), bg=self.colors['bg_dark'], fg=self.colors['clock_color_normal'])
+        self.clock.bind("<Double-Button-1>", self._toggle_buttons_visibility)
+        # Only packed while a sequence runs
+        self.stage_label = tk.Label(self, font=self.text_font, bg=self.colors['bg_dark'], fg="white")
+
+    def _ensure_setup_widgets(self):
+        """Creates the spinbox setup widgets the first time they are needed."""
+        if self.setup_built:
+            return
+        self.setup_built = True
+
+        self.start_hours = tk.StringVar(value="0")
+        self.start_minutes = tk.StringVar(value="0")
+        self.start_seconds = tk.StringVar(value="0")
+        
+        self.start_hours.trace("w", lambda name, index, mode, var=self.start_hours: self._validate_time_input(var, 99))
+        self.start_minutes.trace("w", lambda name, index, mode, var=self.start_minutes: self._validate_time_input(var, 59))
+        self.start_seconds.trace("w", lambda name, index, mode, var=self.start_seconds: self._validate_time_input(var, 59))
+
+        self.spinbox_frame = tk.Frame(self, bg=self.colors['bg_dark'])
+        
+        self.hours_frame = tk.LabelFrame(self.spinbox_frame, text="Horas:", fg="white", bg=self.colors['bg_lighter'])
+        self.hours_select = tk.Spinbox(self.hours_frame, from_=0, to=99, width=2, textvariable=self.start_hours, 
+                                       font=self.spin_font,
+                                       bg=self.colors['bg_dark'], fg=self.colors['spinbox_text_color'], justify='center', wrap=True)
+        
+        self.minutes_frame = tk.LabelFrame(self.spinbox_frame, text="Minutos:", fg="white", bg=self.colors['bg_lighter'])
+        self.minutes_select = tk.Spinbox(self.minutes_frame, from_=0, to=59, textvariable=self.start_minutes,
+                                         font=self.spin_font,
+                                         width=2, bg=self.colors['bg_dark'], fg=self.colors['spinbox_text_color'], justify='center', wrap=True)
+        
+        self.seconds_frame = tk.LabelFrame(self.spinbox_frame, text="Segundos:", fg="white", bg=self.colors['bg_lighter'])
+        self.seconds_select = tk.Spinbox(self.seconds_frame, from_=0, to=59, textvariable=self.start_seconds,
+                                         font=self.spin_font,
+                                         width=2, bg=self.colors['bg_dark'], fg=self.colors['spinbox_text_color'], justify='center', wrap=True)
+
+        for widget in (self.hours_frame, self.minutes_frame, self.seconds_frame):
+            self._apply(widget, font=self.text_font)
+            widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=1, padx=2, pady=2)
+        for widget in (self.hours_select, self.minutes_select, self.seconds_select):
+            self._apply(widget, font=self.spin_font)
+            widget.pack(fill=tk.BOTH, expand=4)
+
+    def _pack_initial_widgets(self):
+        """Packs the initial widgets for the timer setup phase."""
+        self._ensure_setup_widgets()
+        self.spinbox_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=5)
+
+        self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
+        self.active_button.pack(fill=tk.BOTH, expand=1)
+
+    def _validate_time_input(self, var, max_val):
+        """
+        Validates spinbox input to ensure it's numeric and within bounds.
+        """
+        current_val = var.get()
+        cleaned_val = "".join(filter(str.isdigit, current_val))
+        
+        if not cleaned_val:
+            var.set("0")
+            return
+
+        try:
+            num_val = int(cleaned_val)
+            if num_val > max_val:
+                var.set(str(max_val))
+            elif num_val < 0:
+                var.set("0")
+            else:
+                var.set(str(num_val))
+        except ValueError:
+            var.set("0")
+
+    def _on_tick(self, remaining):
+        """
+        Updates the countdown display; called by the runner on the Tk main loop.
+        """
+        if self.clock is not None:
+            started = time.monotonic_ns()
+            self._set_time_left(remaining)
+            self._update_clock_display()
+            self.metrics.record('render', time.monotonic_ns() - started)
+            self._schedule_frame()
+        self._notify({'event': 'tick', 'remaining': remaining})
+
+    def _schedule_frame(self):
+        """
+        Schedules the next sub-second redraw at the next tenth/hundredth boundary
+        (at most one per frame). Nothing is scheduled in whole-second mode, while
+        paused or while the window is hidden: the runner's one tick per second
+        keeps the clock right in those cases.
+        """
+        if self.frame_job is not None or not (self.precision and self.active and self.visible):
+            return
+        unit_ns = NS_PER_SECOND // 10 ** self.precision
+        delay_ms = max(FRAME_INTERVAL_MS, math.ceil(self.countdown.time_to_next_tick(unit_ns) * 1000))
+        self.frame_job = self.root.after(delay_ms, self._on_frame)
+
+    def _on_frame(self):
+        # The next frame is scheduled from the time this one finished drawing, so a
+        # busy loop drops frames instead of running a backlog of them
+        self.frame_job = None
+        if self.active and self.countdown.running:
+            started = time.monotonic_ns()
+            self._update_clock_display()
+            self.metrics.record('render', time.monotonic_ns() - started)
+            self._schedule_frame()
+
+    def _cancel_frame(self):
+        """Cancels the pending sub-second redraw, if any."""
+        if self.frame_job is not None:
+            self.root.after_cancel(self.frame_job)
+            self.frame_job = None
+
+    def _on_visibility_change(self, event):
+        """Stops the sub-second redraws while the window is minimized or hidden."""
+        if event.widget is not self.root:
+            return
+        self.visible = event.type == tk.EventType.Map
+        if self.visible:
+            self._update_clock_display()
+            self._schedule_frame()
+        else:
+            self._cancel_frame()
+
+    def _cycle_precision(self, event=None):
+        """Switches the clock between seconds, tenths and hundredths."""
+        self._set_precision((self.precision + 1) % len(DISPLAY_PRECISIONS))
+
+    def _set_precision(self, precision):
+        self.precision = precision
+        self._cancel_frame()
+        self._update_clock_display()
+        self.last_height = 1 # Force the clock font to be recomputed for the new text length
+        self._update_text_size()
+        self._schedule_frame()
+
+    def apply_settings(self, changed):
+        """
+        Applies reloaded settings to the live window without rebuilding it;
+        `changed` holds the names returned by Settings.update().
+        """
+        if 'alarm_repeat_count' in changed:
+            self.alarm_repeat_count = self.settings.alarm_repeat_count
+            self.alarm_enabled = self.alarm_repeat_count > 0 and not self.audio_failed
+            if self.alarm_enabled and self.pygame is None:
+                self._preload_audio()
+        if 'suspend_aware' in changed:
+            self.countdown.suspend_aware = self.settings.suspend_aware
+            self.countdown._anchor()
+        if 'display_precision' in changed:
+            self._set_precision(self.settings.display_precision)
+        if 'thresholds' in changed:
+            self.engine.set_thresholds(self.settings.thresholds)
+        if changed & {'actions', 'action_timeout', 'action_workers'}:
+            self.action_runner.reconfigure(self.settings.actions, self.settings.action_timeout, self.settings.action_workers)
+        if changed & self.colors.keys():
+            self._restyle(changed)
+
+    def _restyle(self, changed):
+        """Reapplies the colors named in `changed` to the widgets that use them."""
+        buttons = (self.active_button, self.pause_button, self.stop_button)
+        if 'bg_dark' in changed:
+            for widget in (self.root, self, self.button_frame, self.clock, self.stage_label):
+                self._apply(widget, bg=self.colors['bg_dark'])
+        if 'button_color' in changed:
+            for widget in buttons:
+                self._apply(widget, bg=self.colors['button_color'])
+        if 'button_active_color' in changed:
+            for widget in buttons:
+                self._apply(widget, activebackground=self.colors['button_active_color'])
+        if self.setup_built:
+            spinboxes = (self.hours_select, self.minutes_select, self.seconds_select)
+            if 'bg_dark' in changed:
+                for widget in (self.spinbox_frame,) + spinboxes:
+                    self._apply(widget, bg=self.colors['bg_dark'])
+            if 'bg_lighter' in changed:
+                for widget in (self.hours_frame, self.minutes_frame, self.seconds_frame):
+                    self._apply(widget, bg=self.colors['bg_lighter'])
+            if 'spinbox_text_color' in changed:
+                for widget in spinboxes:
+                    self._apply(widget, fg=self.colors['spinbox_text_color'])
+        if self.playing:
+            self._apply(self.clock, fg=self.colors['clock_color_red'])
+        else:
+            self._show_stage()
+
+    def apply_sync(self, message, offset_ns):
+        """
+        Mirrors a sync source's state on this window. `offset_ns` is the source's
+        clock minus ours, so its deadline becomes a deadline on our own clock.
+        """
+        state = message.get('state')
+        if state == 'running':
+            deadline = message['deadline'] - offset_ns
+            remaining = deadline - self.countdown.clock.now_ns()
+            if remaining <= 0:
+                return # Already over here too; our own tick handles the expiry
+            if self.playing:
+                self._cancel()
+            if self._state() == 'idle':
+                self._begin_countdown(remaining)
+            elif self._state() == 'paused':
+                self.resume()
+            if abs(self.countdown.deadline_ns - deadline) > SYNC_TOLERANCE_NS:
+                self.countdown.set_deadline_ns(deadline)
+                self.runner.reschedule()
+                self.engine.sync_stage()
+        elif state == 'paused':
+            if self.playing:
+                self._cancel()
+            if self._state() == 'idle':
+                self._begin_countdown(message['remaining'])
+            if self.active:
+                self.pause()
+            self.countdown.set_paused_ns(message['remaining'])
+            self._set_time_left(self.countdown.remaining_seconds())
+            self._update_clock_display()
+        elif state == 'idle' and self._state() in ('running', 'paused'):
+            self._cancel()
+        # 'expired' needs nothing: this window reaches the same deadline by itself
+
+    def _notify(self, event):
+        """Sends an event to every registered listener."""
+        for listener in self.listeners:
+            listener(event)
+
+    def handle_control(self, request):
+        """
+        Executes one control API command on the Tk main loop and returns the reply.
+        """
+        cmd = request.get('cmd')
+        if cmd == 'start':
+            seconds = request.get('seconds')
+            if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not 0 < seconds <= MAX_DURATION_SECONDS:
+                return {'ok': False, 'error': f"'seconds' debe ser un número entre 1 y {MAX_DURATION_SECONDS}"}
+            self.start_countdown(seconds)
+        elif cmd == 'sequence':
+            name = str(request.get('name', '')).lower()
+            stages = self.settings.sequences.get(name)
+            if stages is None:
+                return {'ok': False, 'error': f"no existe la secuencia {name!r}"}
+            self.start_sequence(name, stages)
+        elif cmd == 'pause':
+            if not self.active:
+                return {'ok': False, 'error': "no hay una cuenta regresiva en marcha"}
+            self.pause()
+        elif cmd == 'resume':
+            if self._state() != 'paused':
+                return {'ok': False, 'error': "no hay una cuenta regresiva en pausa"}
+            self.resume()
+        elif cmd == 'cancel':
+            self._cancel()
+        elif cmd != 'remaining':
+            return {'ok': False, 'error': f"comando desconocido: {cmd!r}"}
+        return {'ok': True, 'state': self._state(), 'remaining': self.countdown.remaining_ns() / NS_PER_SECOND}
+
+    def _state(self):
+        """Returns 'running', 'paused', 'alarm' or 'idle'."""
+        if self.playing:
+            return 'alarm'
+        if self.active:
+            return 'running'
+        if self.countdown.paused_remaining_ns > 0:
+            return 'paused'
+        return 'idle'
+
+    def _set_time_left(self, total_seconds):
+        """Splits a number of seconds into the hours/minutes/seconds fields."""
+        self.hours_left, rest = divmod(total_seconds, 3600)
+        self.minutes_left, self.seconds_left = divmod(rest, 60)
+
+    def _update_clock_display(self):
+        """
+        Updates the clock text. Its color belongs to the current warning stage and
+        only changes when a stage begins (see _show_stage).
+        """
+        if self.clock:
+            if self.precision and (self.countdown.running or self.countdown.paused_remaining_ns):
+                self.time_remaining = format_clock(self.countdown.remaining_ns(), self.precision)
+            elif self.precision:
+                total_seconds = self.hours_left * 3600 + self.minutes_left * 60 + self.seconds_left
+                self.time_remaining = format_clock(total_seconds * NS_PER_SECOND, self.precision)
+            else:
+                hours = f"{self.hours_left:02}"
+                minutes = f"{self.minutes_left:02}"
+                seconds = f"{self.seconds_left:02}"
+                self.time_remaining = f"{hours}:{minutes}:{seconds}"
+            self._apply(self.clock, text=self.time_remaining)
+
+    # --- Warning Stages (scheduled by the engine) ---
+    def _on_stage(self, index, crossed):
+        """Shows the stage the engine entered, announcing it if the clock reached it."""
+        self._show_stage()
+        if crossed:
+            if self.engine.thresholds.stages[index][3]:
+                self._announce()
+            self._notify({'event': 'stage', 'remaining': self.countdown.remaining_seconds()})
+
+    def _show_stage(self):
+        """Applies the color of the current stage and starts or stops its blinking."""
+        thresholds, index = self.engine.thresholds, self.engine.stage_index
+        self.clock_fg = thresholds.color(index, self.colors)
+        if self.active and index >= 0 and thresholds.stages[index][2]:
+            if self.blink_job is None:
+                self.blink_job = self.root.after(BLINK_INTERVAL_MS, self._blink)
+        else:
+            self._stop_blink()
+        self._apply(self.clock, fg=self.clock_fg)
+
+    def _blink(self):
+        lit = self.applied_options[self.clock].get('fg') == self.clock_fg
+        self._apply(self.clock, fg=self.colors['bg_dark'] if lit else self.clock_fg)
+        self.blink_job = self.root.after(BLINK_INTERVAL_MS, self._blink)
+
+    def _stop_blink(self):
+        if self.blink_job is not None:
+            self.root.after_cancel(self.blink_job)
+            self.blink_job = None
+
+    def _end_stages(self):
+        """Drops the stage state when the countdown ends or is cancelled."""
+        self.engine.end_stages()
+        self._stop_blink()
+        self.clock_fg = self.colors['clock_color_normal']
+
+    def _announce(self):
+        """Plays the alarm sound once to announce a stage."""
+        if not self.playing and self._init_audio():
+            self.alarm.play(1)
+        else:
+            self.root.bell()
+
+    # --- Chained Sequences ---
+    def start_sequence(self, name, stages):
+        """Runs the (label, seconds) stages of a [Sequences] entry back to back."""
+        self._cancel()
+        self.sequence = (name, stages)
+        self.sequence_index = 0
+        self._begin_countdown(stages[0][1] * NS_PER_SECOND)
+        self._show_sequence_stage()
+        self.stage_label.pack(side=tk.TOP, fill=tk.X, before=self.clock)
+
+    def _advance_sequence(self):
+        """
+        Starts the next stage when a sequence stage expires, touching only the
+        clock, its color and the stage label. Returns False when there is no
+        sequence or its last stage just ended, so the alarm rings as usual.
+        """
+        if self.sequence is None:
+            return False
+        name, stages = self.sequence
+        following = stages[self.sequence_index + 1:]
+        if not following:
+            return False
+        # Stages that also ended meanwhile are skipped at once: no session, no
+        # cue and no stack frame for each of them
+        skipped = self.runner.skip_ended_ns([seconds * NS_PER_SECOND for _, seconds in following])
+        self.sequence_index += skipped
+        if skipped == len(following):
+            self._show_sequence_stage()
+            return False # The last stage is over as well
+        self.sequence_index += 1
+        duration_ns = stages[self.sequence_index][1] * NS_PER_SECOND
+        self._end_session('completed')
+        self.session = {'started_at': int(time.time()), 'planned_ns': duration_ns,
+                        'pauses': 0, 'paused_ns': 0, 'paused_at': None}
+        self._end_stages()
+        self._show_sequence_stage()
+        self.runner.chain_ns(duration_ns)
+        if self.active and self.countdown.running:
+            self._notify({'event': 'started', 'seconds': duration_ns / NS_PER_SECOND,
+                          'sequence': name, 'stage': self.sequence_index})
+            self.engine.sync_stage()
+            self.journal.record('S', self.timer_id, self.countdown.wall_deadline_ns())
+            if self.settings.sequence_cue:
+                self._cue()
+        return True
+
+    def _show_sequence_stage(self):
+        name, stages = self.sequence
+        label = stages[self.sequence_index][0] or name
+        self._apply(self.stage_label, text=f"{label} ({self.sequence_index + 1}/{len(stages)})")
+
+    def _end_sequence(self):
+        """Drops the sequence state and hides the stage label."""
+        self.sequence = None
+        self._cancel_cue()
+        if self.stage_label.winfo_ismapped():
+            self.stage_label.pack_forget()
+
+    def _cue(self):
+        """Plays the start of the alarm sound to mark a new stage."""
+        if self.playing or not self._init_audio():
+            self.root.bell()
+            return
+        self._cancel_cue()
+        self.alarm.play(1)
+        self.cue_job = self.root.after(SEQUENCE_CUE_MS, self._end_cue)
+
+    def _end_cue(self):
+        self.cue_job = None
+        if not self.playing:
+            self._silence_alarm()
+
+    def _cancel_cue(self):
+        if self.cue_job is not None:
+            self.root.after_cancel(self.cue_job)
+            self.cue_job = None
+
+    def _apply(self, widget, **options):
+        """
+        Configures only the widget options whose values differ from the ones
+        already applied, skipping the Tk call entirely when nothing changed.
+        """
+        applied = self.applied_options.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if applied.get(key) != value}
+        if changed:
+            widget.config(**changed)
+            applied.update(changed)
+
+    def _timer_end(self):
+        """
+        Handles the actions when the timer reaches zero (plays alarm, changes UI).
+        """
+        if self._advance_sequence():
+            return
+        self.active = False
+        self._cancel_cue()
+        self._end_session('completed')
+        self.journal.record('C', self.timer_id)
+        self._notify({'event': 'expired'})
+        self.countdown.stop()
+        self._cancel_frame()
+        self._end_stages()
+        if self._ring() and self.runner.expired_deadline_ns:
+            self.metrics.record('alarm', self.countdown.clock.now_ns() - self.runner.expired_deadline_ns)
+
+        # Queued after the alarm has started; the actions run on worker threads
+        self.engine.run_expiry_actions()
+
+    def start_countdown(self, seconds):
+        """Starts counting down from `seconds`, replacing any countdown or alarm."""
+        self._cancel()
+        self._begin_countdown(int(seconds * NS_PER_SECOND))
+
+    def is_idle(self):
+        """Returns True if no countdown, pause or alarm is in progress."""
+        return self._state() == 'idle'
+
+    def ring_now(self, on_end=None):
+        """
+        Rings the alarm at once without a countdown, for a [Schedules] rule
+        without `start`. Nothing expired, so no session is logged and no expiry
+        actions run. `on_end` is called once the alarm is over. Ignored unless
+        the timer is idle.
+        """
+        if not self.is_idle():
+            return
+        self.on_ring_end = on_end
+        self._enter_countdown_view()
+        self._ring()
+
+    def _ring(self):
+        """Shows 00:00:00 with the Stop button and plays the alarm; False if there is no audio."""
+        self._set_time_left(0)
+        self.time_remaining = format_clock(0, self.precision)
+        self._apply(self.clock, text=self.time_remaining, fg=self.colors['clock_color_red'])
+        
+        self.playing = True
+        
+        self.clock.unbind("<Double-Button-1>")
+
+        self.pause_button.pack_forget()
+        self.stop_button.pack_forget()
+        self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
+        self.active_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+        self._apply(self.active_button, text="Detener", command=self._stop_alarm)
+
+        if not self._init_audio():
+            self.playing = False
+            self._reset_interface()
+            return False
+        self.alarm.play(self.alarm_repeat_count, self._on_alarm_finished)
+        return True
+
+    def _on_alarm_finished(self):
+        """Called by the alarm engine once every repeat has been played."""
+        if self.playing:
+            self.playing = False
+            self._reset_interface()
+
+    def _stop_alarm(self):
+        """
+        Stops the alarm sound and resets the interface.
+        """
+        self.playing = False
+        self._silence_alarm()
+        self._reset_interface()
+
+    def _reset_interface(self):
+        """Resets the UI to its initial state for setting a new timer."""
+        self._end_sequence()
+        if self.clock.winfo_ismapped():
+            self.clock.pack_forget()
+        
+        self._ensure_setup_widgets()
+        self.spinbox_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=5)
+        self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
+        self.active_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+        self.pause_button.pack_forget()
+        self.stop_button.pack_forget()
+        
+        self._apply(self.active_button, text="Iniciar", command=self.start,
+                    bg=self.colors['button_color'], fg="white", relief="raised", anchor="center")
+        
+        self.start_hours.set("0")
+        self.start_minutes.set("0")
+        self.start_seconds.set("0")
+        self._apply(self.clock, fg=self.colors['clock_color_normal'])
+
+        self.clock.bind("<Double-Button-1>", self._toggle_buttons_visibility)
+        
+        self.root.overrideredirect(False)
+        self.root.attributes("-alpha", 1.0)
+        self.show_title = True
+        self.siempre_en_primer_plano = True
+        self.root.wm_attributes("-topmost", 1)
+
+        self.root.update_idletasks()
+        self._update_text_size()
+
+        on_ring_end, self.on_ring_end = self.on_ring_end, None
+        if on_ring_end is not None:
+            on_ring_end()
+
+    def _toggle_buttons_visibility(self, event=None):
+        """
+        Toggles the visibility of pause/stop buttons and adjusts clock display.
+        """
+        if self.active and not self.playing:
+            if self.pause_button.winfo_ismapped():
+                self.pause_button.pack_forget()
+                self.stop_button.pack_forget()
+                self.button_frame.pack_forget()
+                self.clock.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+            else:
+                self.button_frame.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=1)
+                self.stop_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+                self.pause_button.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+                self.clock.pack(side=tk.TOP, fill=tk.BOTH, expand=3)
+
+    def start(self):
+        """
+        Initiates the timer countdown. Validates input and changes UI state.
+        """
+        try:
+            hours = int(self.start_hours.get())
+            minutes = int(self.start_minutes.get())
+            seconds = int(self.start_seconds.get())
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "Por favor, ingrese solo números válidos en los campos de tiempo.")
+            return
+
+        if hours == 0 and minutes == 0 and seconds == 0:
+            return
+
+        self._begin_countdown((hours * 3600 + minutes * 60 + seconds) * NS_PER_SECOND)
+
+    def _enter_countdown_view(self):
+        """Switches the window to the compact clock view."""
+        if self.setup_built:
+            self.spinbox_frame.pack_forget()
+        self.active_button.pack_forget()
+        self.button_frame.pack_forget()
+        
+        self.clock.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self._apply(self.pause_button, text="  Pausar   ", command=self.pause)
+
+        self.root.overrideredirect(True)
+        self._update_text_size()
+
+    def _begin_countdown(self, duration_ns):
+        """Shows the compact clock and starts counting down from `duration_ns`."""
+        self._set_time_left(-(-duration_ns // NS_PER_SECOND))
+        self._enter_countdown_view()
+
+        self.active = True
+        self.session = {'started_at': int(time.time()), 'planned_ns': duration_ns,
+                        'pauses': 0, 'paused_ns': 0, 'paused_at': None}
+        self.runner.start_ns(duration_ns)
+        if self.active:
+            # Listeners such as SyncSource read the countdown, so it must be running
+            self._notify({'event': 'started', 'seconds': duration_ns / NS_PER_SECOND})
+            self.engine.sync_stage()
+            self.journal.record('S', self.timer_id, self.countdown.wall_deadline_ns())
+
+    def pause(self):
+        """Pauses the timer countdown."""
+        if self.active:
+            self.active = False
+            self.runner.pause()
+            self._cancel_frame()
+            self.engine.cancel_stage()
+            self._show_stage() # Stops blinking while paused
+            if self.session is not None:
+                self.session['pauses'] += 1
+                self.session['paused_at'] = self.countdown.clock.now_ns()
+            self._update_clock_display()
+            self.journal.record('P', self.timer_id, self.countdown.remaining_ns())
+            self._apply(self.pause_button, text="Reanudar", command=self.resume)
+            self._notify({'event': 'paused'})
+
+    def resume(self):
+        """Resumes the timer countdown."""
+        if not self.active:
+            self.active = True
+            self.runner.resume()
+            self._schedule_frame()
+            self.engine.sync_stage()
+            if self.session is not None and self.session['paused_at'] is not None:
+                self.session['paused_ns'] += self.countdown.clock.now_ns() - self.session['paused_at']
+                self.session['paused_at'] = None
+            self.journal.record('S', self.timer_id, self.countdown.wall_deadline_ns())
+            self._apply(self.pause_button, text="  Pausar   ", command=self.pause)
+            self._notify({'event': 'resumed'})
+            if self.pause_button.winfo_ismapped():
+                self._toggle_buttons_visibility()
+
+    def stop(self):
+        """Stops the timer and asks for confirmation."""
+        response = messagebox.askyesno("Confirmación", "¿Estás seguro de que deseas cancelar el temporizador?")
+        if response:
+            self._cancel()
+
+    def _cancel(self):
+        """Cancels the countdown or alarm without confirmation."""
+        if self._state() == 'idle':
+            return
+        self.active = False
+        self.playing = False
+        self._end_session('cancelled')
+        self.runner.stop()
+        self._cancel_frame()
+        self._end_stages()
+        self.journal.record('C', self.timer_id)
+        self._silence_alarm()
+        self._reset_interface()
+        self._notify({'event': 'cancelled'})
+
+    def _end_session(self, reason):
+        """Queues the current countdown for the history; call before stopping it."""
+        session, self.session = self.session, None
+        if session is None:
+            return
+        paused_ns = session['paused_ns']
+        if session['paused_at'] is not None:
+            paused_ns += self.countdown.clock.now_ns() - session['paused_at']
+        focused_ns = max(0, session['planned_ns'] - self.countdown.remaining_ns())
+        self.history.record(session['started_at'], int(time.time()), session['planned_ns'] // 1_000_000,
+                            focused_ns // 1_000_000, paused_ns // 1_000_000, session['pauses'], reason)
+
+    def _on_closing(self):
+        """Handles the graceful shutdown of the application."""
+        # A live countdown stays in the journal: the window may be closing for a
+        # logout or shutdown, and the next launch restores it
+        live = self._state() in ('running', 'paused')
+        self.active = False
+        self.playing = False
+        self._end_session('closed')
+        self.runner.stop()
+        self._cancel_frame()
+        self._end_stages()
+        self._cancel_cue()
+        if not live:
+            self.journal.record('C', self.timer_id)
+        self.journal.flush()
+        self.history.close()
+        self._silence_alarm()
+        if self.metrics_overlay is not None:
+            self._toggle_metrics_overlay()
+
+        # The mixer and the action runner are shared by every window of the
+        # process; only the main one stops them
+        if isinstance(self.root, tk.Tk):
+            self.action_runner.shutdown()
+            if self.pygame is not None and self.pygame.mixer.get_init():
+                self.pygame.mixer.quit()
+
+        self.root.destroy()
+
+    # --- Window Control Functions ---
+
+    def _toggle_always_on_top(self, event=None):
+        """Toggles the 'always on top' attribute of the window."""
+        self.siempre_en_primer_plano = not self.siempre_en_primer_plano
+        self.root.wm_attributes("-topmost", 1 if self.siempre_en_primer_plano else 0)
+        
+    def _toggle_title_bar(self, event=None):
+        """Toggles the visibility of the window's title bar."""
+        self.show_title = not self.show_title
+        self.root.overrideredirect(not self.show_title)
+
+    def _toggle_metrics_overlay(self, event=None):
+        """Shows or hides the tick latency statistics over the window."""
+        if self.metrics_overlay is None:
+            self.metrics_overlay = tk.Label(self, justify=tk.LEFT, anchor="nw", font=self.fonts.get('Helvetica', 8),
+                                            bg=self.colors['bg_lighter'], fg="white")
+            self.metrics_overlay.place(x=0, y=0)
+            self._refresh_metrics_overlay()
+        else:
+            self.root.after_cancel(self.metrics_job)
+            self.metrics_job = None
+            self.metrics_overlay.destroy()
+            self.metrics_overlay = None
+
+    def _refresh_metrics_overlay(self):
+        self.metrics_overlay.config(text=self.metrics.format())
+        self.metrics_overlay.lift()
+        self.metrics_job = self.root.after(METRICS_OVERLAY_MS, self._refresh_metrics_overlay)
+
+    def _adjust_transparency(self, event):
+        """Adjusts the window's transparency."""
+        current_alpha = self.root.attributes("-alpha")
+        step = 0.05
+        if event.keysym == "Up":
+            self.root.attributes("-alpha", min(current_alpha + step, 1.0))
+        elif event.keysym == "Down":
+            self.root.attributes("-alpha", max(current_alpha - step, 0.2))
+
+    def _start_move(self, event):
+        """
+        Records the initial mouse and window positions for dragging; the window
+        position is then tracked locally instead of queried on every motion event.
+        """
+        self.x_offset = event.x_root
+        self.y_offset = event.y_root
+        self.move_x = self.root.winfo_x()
+        self.move_y = self.root.winfo_y()
+        self.dragging = True
+
+    def _do_move(self, event):
+        """Moves the window based on mouse drag."""
+        x = self.move_x + (event.x_root - self.x_offset)
+        y = self.move_y + (event.y_root - self.y_offset)
+        self._request_geometry(f"+{x}+{y}")
+
+    def _stop_move(self, event):
+        """Finalizes the window dragging."""
+        self._end_drag()
+
+    def _request_geometry(self, geometry):
+        """
+        Stores the latest requested geometry and applies it at most once per frame,
+        so bursts of motion events collapse into a single window update.
+        """
+        self.pending_geometry = geometry
+        if self.geometry_job is None:
+            self.geometry_job = self.root.after(FRAME_INTERVAL_MS, self._flush_geometry)
+
+    def _flush_geometry(self):
+        """Applies the pending geometry, if it differs from the last one applied."""
+        if self.geometry_job is not None:
+            self.root.after_cancel(self.geometry_job)
+            self.geometry_job = None
+        if self.pending_geometry is not None and self.pending_geometry != self.applied_geometry:
+            self.root.geometry(self.pending_geometry)
+            self.applied_geometry = self.pending_geometry
+        self.pending_geometry = None
+
+    def _end_drag(self):
+        """Applies the final geometry and resumes font rescaling."""
+        if not self.dragging:
+            return
+        self._flush_geometry()
+        self.applied_geometry = None
+        self.dragging = False
+        self._on_window_resize(None)
+
+    def _on_window_resize(self, event):
+        """Debounces window resize events to update text size efficiently."""
+        if self.dragging:
+            # Font rescaling waits until the drag ends
+            return
+        if self.resize_delay:
+            self.root.after_cancel(self.resize_delay)
+        self.resize_delay = self.root.after(50, self._update_text_size)
+
+    def _update_text_size(self, event=None):
+        """
+        Updates the font sizes of various widgets based on the current window height.
+        """
+        current_height = self.root.winfo_height()
+        current_width = self.root.winfo_width()
+
+        if ((abs(current_height - self.last_height) < 5 and self.last_height != 1 and current_height != 0) and 
+            (abs(current_width - self.last_width) < 5 and self.last_width != 1 and current_width != 0)):
+            return
+        
+        font_size_buttons = max(10, min(53, int(current_height / 14)))
+        font_size_spin = max(28, min(220, int(current_height / 7)))
+        font_size_text = max(10, min(50, int(current_height / 23)))
+        
+        button_font = self.fonts.get('Helvetica', font_size_buttons, 'bold')
+        self.text_font = self.fonts.get('Helvetica', font_size_text)
+        self.spin_font = self.fonts.get('Helvetica', font_size_spin, 'bold')
+
+        for widget in (self.active_button, self.stop_button, self.pause_button):
+            self._apply(widget, font=button_font)
+        self._apply(self.stage_label, font=self.text_font)
+
+        if self.setup_built:
+            for widget in (self.hours_frame, self.minutes_frame, self.seconds_frame):
+                self._apply(widget, font=self.text_font)
+
+            for widget in (self.hours_select, self.minutes_select, self.seconds_select):
+                self._apply(widget, font=self.spin_font)
+
+        if self.clock is not None:
+            font_size_clock = max(47, int(current_height / 4))
+            if self.precision:
+                # Keep the longer HH:MM:SS.dd text inside the same width
+                font_size_clock = max(47, font_size_clock * 8 // (9 + self.precision))
+            self._apply(self.clock, font=self.fonts.get('Helvetica', font_size_clock, 'bold'))
+        
+        self.last_height = current_height
+        self.last_width = current_width
+
+    def _start_resize(self, event):
+        """
+        Records the initial position and determines the corner for resizing.
+        """
+        margin = 25
+        self.start_x = event.x_root
+        self.start_y = event.y_root
+
+        self.win_x = self.root.winfo_x()
+        self.win_y = self.root.winfo_y()
+        self.win_width = self.root.winfo_width()
+        self.win_height = self.root.winfo_height()
+
+        self.resize_corner = None
+        self.dragging = True
+        if event.x <= margin and event.y <= margin:
+            self.resize_corner = "top_left"
+        elif event.x >= self.win_width - margin and event.y <= margin:
+            self.resize_corner = "top_right"
+        elif event.x <= margin and event.y >= self.win_height - margin:
+            self.resize_corner = "bottom_left"
+        elif event.x >= self.win_width - margin and event.y >= self.win_height - margin:
+            self.resize_corner = "bottom_right"
+
+    def _do_resize(self, event):
+        """
+        Performs the window resizing based on the detected corner.
+        """
+        if not self.resize_corner:
+            return
+
+        dx = event.x_root - self.start_x
+        dy = event.y_root - self.start_y
+
+        new_width = self.win_width
+        new_height = self.win_height
+        new_x = self.win_x
+        new_y = self.win_y
+
+        if self.resize_corner == "bottom_right":
+            new_width = max(self.win_width + dx, MIN_WIDTH)
+            new_height = max(self.win_height + dy, MIN_HEIGHT)
+        elif self.resize_corner == "top_left":
+            new_width = max(self.win_width - dx, MIN_WIDTH)
+            new_height = max(self.win_height - dy, MIN_HEIGHT)
+            new_x = self.win_x + (self.win_width - new_width)
+            new_y = self.win_y + (self.win_height - new_height)
+        elif self.resize_corner == "top_right":
+            new_width = max(self.win_width + dx, MIN_WIDTH)
+            new_height = max(self.win_height - dy, MIN_HEIGHT)
+            new_y = self.win_y + (self.win_height - new_height)
+        elif self.resize_corner == "bottom_left":
+            new_width = max(self.win_width - dx, MIN_WIDTH)
+            new_height = max(self.win_height + dy, MIN_HEIGHT)
+            new_x = self.win_x + (self.win_width - new_width)
+
+        self._request_geometry(f"{new_width}x{new_height}+{int(new_x)}+{int(new_y)}")
+
+    def _stop_resize(self, event):
+        """Finalizes the resizing process."""
+        self.resize_corner = None
+        self._end_drag()
+
+class TimerRow(tk.Frame):
+    """
+    Lightweight row widget that renders one timer of a TimerTable.
+    """
+    def __init__(self, parent, board, timer_id, colors):
+        tk.Frame.__init__(self, parent, bg=colors['bg_dark'])
+        self.board = board
+        self.timer_id = timer_id
+        self.colors = colors
+        self.text = ""
+        self.color = ""
+
+        self.label = tk.Label(self, anchor="w", font=('Helvetica', 14, 'bold'), bg=colors['bg_dark'])
+        self.pause_button = tk.Button(self, text="Pausar", width=8, command=self._toggle_pause,
+                                      bg=colors['button_color'], fg="white", activebackground=colors['button_active_color'])
+        self.cancel_button = tk.Button(self, text="X", width=2, command=lambda: board.cancel(timer_id),
+                                       bg=colors['button_color'], fg="white", activebackground=colors['button_active_color'])
+        self.cancel_button.pack(side=tk.RIGHT, padx=1)
+        self.pause_button.pack(side=tk.RIGHT, padx=1)
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=1)
+
+    def _toggle_pause(self):
+        """Pauses or resumes the timer of this row."""
+        table = self.board.table
+        if table.state(self.timer_id) == SLOT_RUNNING:
+            table.pause(self.timer_id)
+            self.pause_button.config(text="Reanudar")
+        elif table.state(self.timer_id) == SLOT_PAUSED:
+            table.resume(self.timer_id)
+            self.pause_button.config(text="Pausar")
+        self.board.reschedule()
+
+    def render(self, remaining_seconds, label):
+        """Updates the row, touching the widget only when something changed."""
+        text = f"{label}  {format_hms(remaining_seconds)}" if label else format_hms(remaining_seconds)
+        thresholds = self.board.thresholds
+        color = thresholds.color(thresholds.index_for(remaining_seconds), self.colors)
+        if text != self.text or color != self.color:
+            self.text = text
+            self.color = color
+            self.label.config(text=text, fg=color)
+
+class TimerBoard(tk.Frame):
+    """
+    Window content that runs many countdowns in a single process. All timers share
+    one TimerTable and one after() job aimed at the next expiry or display update.
+    """
+    def __init__(self, parent, colors, thresholds=None):
+        self.root = parent
+        self.colors = colors
+        self.thresholds = thresholds if thresholds is not None else ThresholdTable.default()
+        tk.Frame.__init__(self, parent, bg=colors['bg_dark'])
+
+        self.table = TimerTable()
+        self.rows = {}
+        self.job = None
+
+        self.entry_frame = tk.Frame(self, bg=colors['bg_lighter'])
+        self.label_entry = tk.Entry(self.entry_frame, width=12, bg=colors['bg_dark'], fg="white", insertbackground="white")
+        self.hours_select = tk.Spinbox(self.entry_frame, from_=0, to=99, width=2, bg=colors['bg_dark'],
+                                       fg=colors['spinbox_text_color'], justify='center', wrap=True)
+        self.minutes_select = tk.Spinbox(self.entry_frame, from_=0, to=59, width=2, bg=colors['bg_dark'],
+                                         fg=colors['spinbox_text_color'], justify='center', wrap=True)
+        self.seconds_select = tk.Spinbox(self.entry_frame, from_=0, to=59, width=2, bg=colors['bg_dark'],
+                                         fg=colors['spinbox_text_color'], justify='center', wrap=True)
+        self.add_button = tk.Button(self.entry_frame, text="Agregar", command=self._add_from_entry,
+                                    bg=colors['button_color'], fg="white", activebackground=colors['button_active_color'])
+        self.label_entry.pack(side=tk.LEFT, fill=tk.X, expand=1, padx=2, pady=2)
+        for widget in (self.hours_select, self.minutes_select, self.seconds_select):
+            widget.pack(side=tk.LEFT, padx=1, pady=2)
+        self.add_button.pack(side=tk.LEFT, padx=2, pady=2)
+        self.entry_frame.pack(side=tk.TOP, fill=tk.X)
+
+        self.rows_frame = tk.Frame(self, bg=colors['bg_dark'])
+        self.rows_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+    def _add_from_entry(self):
+        """Reads the entry widgets and adds a new timer."""
+        try:
+            hours = min(99, max(0, int(self.hours_select.get())))
+            minutes = min(59, max(0, int(self.minutes_select.get())))
+            seconds = min(59, max(0, int(self.seconds_select.get())))
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "Por favor, ingrese solo números válidos en los campos de tiempo.")
+            return
+        self.add(hours * 3600 + minutes * 60 + seconds, self.label_entry.get().strip())
+
+    def add(self, duration_seconds, label=""):
+        """Adds a timer to the board and returns its ID."""
+        if duration_seconds <= 0:
+            return None
+        timer_id = self.table.add(duration_seconds, label)
+        row = TimerRow(self.rows_frame, self, timer_id, self.colors)
+        row.pack(side=tk.TOP, fill=tk.X)
+        self.rows[timer_id] = row
+        row.render(duration_seconds, label)
+        self.reschedule()
+        return timer_id
+
+    def cancel(self, timer_id):
+        """Removes a timer and its row."""
+        self.table.cancel(timer_id)
+        row = self.rows.pop(timer_id, None)
+        if row is not None:
+            row.destroy()
+        self.reschedule()
+
+    def reschedule(self):
+        """
+        Schedules one wakeup for the earliest of the next expiry and the next
+        whole-second display update. Nothing is scheduled when no timer runs.
+        """
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+        next_deadline = self.table.next_deadline_ns()
+        if next_deadline is None:
+            return
+        now = self.table.clock.now_ns()
+        wake_at = min(next_deadline, now + NS_PER_SECOND - now % NS_PER_SECOND)
+        delay_ms = max(1, math.ceil((wake_at - now) / 1_000_000))
+        self.job = self.root.after(delay_ms, self._on_wakeup)
+
+    def _on_wakeup(self):
+        """Fires expired timers and refreshes the running rows."""
+        self.job = None
+        table = self.table
+        now = table.clock.now_ns()
+        for timer_id in table.pop_expired(now):
+            row = self.rows.get(timer_id)
+            if row is not None:
+                row.render(0, table.labels[timer_id])
+                row.pause_button.config(state=tk.DISABLED)
+            self.root.bell()
+
+        for timer_id, row in self.rows.items():
+            if table.state(timer_id) == SLOT_RUNNING:
+                remaining = -(-table.remaining_ns(timer_id, now) // NS_PER_SECOND)
+                row.render(remaining, table.labels[timer_id])
+        self.reschedule()
+
+class StopwatchView(tk.Frame):
+    """
+    Stopwatch window content. The clock is redrawn at most every
+    STOPWATCH_FRAME_MS while running and visible. The lap list is virtualized:
+    it keeps only as many row labels as fit in the window and fills them from
+    the lap array for the current scroll position.
+    """
+    def __init__(self, parent, colors):
+        self.root = parent
+        self.colors = colors
+        tk.Frame.__init__(self, parent, bg=colors['bg_dark'])
+
+        self.stopwatch = Stopwatch()
+        self.writer = None
+        self.frame_job = None
+        self.visible = True
+        self.first_row = 0 # Index of the lap shown in the first row
+        self.follow = True # Keep the newest lap in view
+
+        self.clock = tk.Label(self, text=format_elapsed(0), font=('Helvetica', 32, 'bold'),
+                              bg=colors['bg_dark'], fg=colors['clock_color_normal'])
+        self.clock.pack(side=tk.TOP, fill=tk.X)
+
+        button_frame = tk.Frame(self, bg=colors['bg_dark'])
+        button_options = {'bg': colors['button_color'], 'fg': "white", 'activebackground': colors['button_active_color']}
+        self.start_button = tk.Button(button_frame, text="Iniciar", command=self.toggle, **button_options)
+        self.lap_button = tk.Button(button_frame, text="Vuelta", command=self.lap, **button_options)
+        self.reset_button = tk.Button(button_frame, text="Reiniciar", command=self.reset, **button_options)
+        for button in (self.start_button, self.lap_button, self.reset_button):
+            button.pack(side=tk.LEFT, fill=tk.X, expand=1)
+        button_frame.pack(side=tk.TOP, fill=tk.X)
+
+        list_frame = tk.Frame(self, bg=colors['bg_dark'])
+        self.scrollbar = tk.Scrollbar(list_frame, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.rows_frame = tk.Frame(list_frame, bg=colors['bg_dark'])
+        self.rows_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+        list_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self.row_font = Font(family='Courier', size=11)
+        self.row_height = self.row_font.metrics('linespace') + 2
+        self.row_labels = []
+
+        self.rows_frame.bind("<Configure>", self._on_list_resize)
+        self.rows_frame.bind("<MouseWheel>", self._on_wheel)
+        self.rows_frame.bind("<Button-4>", lambda event: self._scroll_to(self.first_row - 3))
+        self.rows_frame.bind("<Button-5>", lambda event: self._scroll_to(self.first_row + 3))
+        parent.bind("<space>", lambda event: self.toggle())
+        parent.bind("<Return>", lambda event: self.lap())
+        for key in ("l", "L"): # Also with Caps Lock or Shift
+            parent.bind(key, lambda event: self.lap())
+        for key in ("r", "R"):
+            parent.bind(key, lambda event: self.reset())
+        parent.bind("<Map>", self._on_visibility_change)
+        parent.bind("<Unmap>", self._on_visibility_change)
+
+    # --- Controls ---
+    def toggle(self):
+        """Starts, pauses or resumes the stopwatch."""
+        if self.stopwatch.running:
+            self.stopwatch.pause()
+            self._cancel_frame()
+            self._draw_clock()
+            if self.writer is not None:
+                self.writer.flush()
+            self.start_button.config(text="Reanudar")
+        else:
+            self.stopwatch.start()
+            self.start_button.config(text="Pausar")
+            self._schedule_frame()
+
+    def lap(self):
+        """Records a lap and streams it to the CSV file."""
+        if not self.stopwatch.running:
+            return
+        index = self.stopwatch.lap()
+        if self.writer is None:
+            self.writer = LapWriter(os.path.join(MAIN_DIR, time.strftime("vueltas-%Y%m%d-%H%M%S.csv")))
+        try:
+            self.writer.write(index + 1, self.stopwatch.lap_ns(index), self.stopwatch.laps[index])
+        except OSError as e:
+            self.writer = None
+            messagebox.showwarning("Vueltas", f"No se pudo guardar el archivo de vueltas: {e}")
+        if self.follow:
+            self.first_row = max(0, len(self.stopwatch.laps) - len(self.row_labels))
+        self._draw_rows()
+
+    def reset(self):
+        """Clears the stopwatch; the next lap starts a new CSV file."""
+        self.stopwatch.reset()
+        self._cancel_frame()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.first_row = 0
+        self.follow = True
+        self.start_button.config(text="Iniciar")
+        self._draw_clock()
+        self._draw_rows()
+
+    def close(self):
+        """Flushes the lap file; call before destroying the window."""
+        self._cancel_frame()
+        if self.writer is not None:
+            self.writer.close()
+
+    # --- Clock ---
+    def _draw_clock(self):
+        self.clock.config(text=format_elapsed(self.stopwatch.elapsed_ns()))
+
+    def _schedule_frame(self):
+        if self.frame_job is None and self.stopwatch.running and self.visible:
+            self.frame_job = self.root.after(STOPWATCH_FRAME_MS, self._on_frame)
+
+    def _on_frame(self):
+        # Scheduled after drawing, so a busy loop drops frames instead of queueing them
+        self.frame_job = None
+        self._draw_clock()
+        self._schedule_frame()
+
+    def _cancel_frame(self):
+        if self.frame_job is not None:
+            self.root.after_cancel(self.frame_job)
+            self.frame_job = None
+
+    def _on_visibility_change(self, event):
+        """Stops redrawing the clock while the window is minimized or hidden."""
+        if event.widget is not self.root:
+            return
+        self.visible = event.type == tk.EventType.Map
+        if self.visible:
+            self._draw_clock()
+            self._schedule_frame()
+        else:
+            self._cancel_frame()
+
+    # --- Virtualized lap list ---
+    def _on_list_resize(self, event):
+        """Creates or destroys row labels so exactly the visible rows exist."""
+        count = max(1, event.height // self.row_height)
+        while len(self.row_labels) < count:
+            label = tk.Label(self.rows_frame, anchor="w", font=self.row_font, bg=self.colors['bg_dark'], fg="white")
+            label.place(x=0, y=len(self.row_labels) * self.row_height, relwidth=1, height=self.row_height)
+            label.bind("<MouseWheel>", self._on_wheel)
+            label.bind("<Button-4>", lambda event: self._scroll_to(self.first_row - 3))
+            label.bind("<Button-5>", lambda event: self._scroll_to(self.first_row + 3))
+            self.row_labels.append(label)
+        while len(self.row_labels) > count:
+            self.row_labels.pop().destroy()
+        if self.follow:
+            self.first_row = max(0, len(self.stopwatch.laps) - count)
+        self._draw_rows()
+
+    def _draw_rows(self):
+        """Fills the row labels from the lap array and updates the scrollbar."""
+        laps = self.stopwatch.laps
+        total = len(laps)
+        self.first_row = max(0, min(self.first_row, total - len(self.row_labels)))
+        for offset, label in enumerate(self.row_labels):
+            index = self.first_row + offset
+            text = ""
+            if index < total:
+                text = f"{index + 1:>7}  {format_elapsed(self.stopwatch.lap_ns(index))}  {format_elapsed(laps[index])}"
+            if label.cget('text') != text:
+                label.config(text=text)
+        if total:
+            self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + len(self.row_labels)) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _scroll_to(self, first_row):
+        self.first_row = first_row
+        self._draw_rows()
+        self.follow = self.first_row + len(self.row_labels) >= len(self.stopwatch.laps)
+
+    def _on_scroll(self, *args):
+        """Implements the Scrollbar's yview protocol over the lap indices."""
+        if args[0] == 'moveto':
+            self._scroll_to(int(float(args[1]) * len(self.stopwatch.laps)))
+        elif args[0] == 'scroll':
+            step = len(self.row_labels) if args[2] == 'pages' else 1
+            self._scroll_to(self.first_row + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        self._scroll_to(self.first_row - (3 if event.delta > 0 else -3))
+
+def run_stopwatch():
+    """Runs the stopwatch window."""
+    settings = load_settings()
+    colors = settings.colors
+    root = tk.Tk()
+    settings.drop_invalid_colors(tk_color_checker(root))
+    root.title("Cronómetro")
+    root.geometry("340x320")
+    root.minsize(MIN_WIDTH, 200)
+    root.configure(bg=colors['bg_dark'])
+    view = StopwatchView(root, colors)
+    view.pack(fill=tk.BOTH, expand=1)
+
+    def close():
+        view.close()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", close)
+    root.mainloop()
+
+def run_board():
+    """Runs the multi-timer board window."""
+    settings = load_settings()
+    colors = settings.colors
+    root = tk.Tk()
+    settings.drop_invalid_colors(tk_color_checker(root))
+    root.title("Temporizadores")
+    root.geometry("420x300")
+    root.configure(bg=colors['bg_dark'])
+    board = TimerBoard(root, colors, settings.thresholds)
+    board.pack(fill=tk.BOTH, expand=1)
+    root.mainloop()
+
+class TimerWindows:
+    """
+    Tracks the timer windows of this process: the main one plus one Toplevel per
+    launch forwarded in single-instance mode or restored from the journal.
+    """
+    def __init__(self, root, settings, main_timer):
+        self.root = root
+        self.settings = settings
+        self.main_timer = main_timer
+        self.timers = []
+        self.next_id = 1
+        self.schedule_queue = None
+        self.schedule_job = None
+        root.protocol("WM_DELETE_WINDOW", self.close_all)
+
+    def open(self, timer_id=None, duration=None, sequence=None):
+        """Opens a new timer window and returns its Timer."""
+        if timer_id is None:
+            timer_id = self.next_id
+        self.next_id = max(self.next_id, timer_id + 1)
+
+        window = tk.Toplevel(self.root)
+        window.geometry("285x112")
+        window.minsize(MIN_WIDTH, MIN_HEIGHT)
+        window.attributes("-topmost", True)
+        window.configure(bg=self.settings.colors['bg_dark'])
+        window.title("Temporizador")
+
+        timer = Timer(window, self.settings, timer_id=timer_id, initial_duration=duration, initial_sequence=sequence)
+        timer.pack(fill=tk.BOTH, expand=1)
+        self.timers.append(timer)
+        window.bind("<Destroy>", lambda event: self._forget(event, window, timer), add="+")
+        return timer
+
+    def _forget(self, event, window, timer):
+        """Drops a timer once its window has been destroyed."""
+        if event.widget is window and timer in self.timers:
+            self.timers.remove(timer)
+
+    def open_forwarded(self, argv):
+        """Opens a window for a launch forwarded by another process."""
+        try:
+            args = parse_args(argv)
+        except SystemExit:
+            return # Invalid arguments; argparse already reported them
+        self.open(duration=resolve_start_duration(args, self.settings),
+                  sequence=resolve_start_sequence(args, self.settings))
+
+    def restore(self):
+        """Reopens a window for every other timer still live in the journal."""
+        for timer_id in StateJournal.shared(JOURNAL_FILE).load():
+            if timer_id != self.main_timer.timer_id:
+                self.open(timer_id=timer_id)
+
+    def reload_settings(self):
+        """Re-reads config.ini and applies what changed to every open window."""
+        new = load_settings(previous=self.settings)
+        new.drop_invalid_colors(tk_color_checker(self.root), self.settings.colors) # Invalid colors keep the current ones
+        changed = self.settings.update(new)
+        if changed:
+            for timer in [self.main_timer] + self.timers:
+                timer.apply_settings(changed)
+        if 'schedules' in changed:
+            self.start_schedules()
+
+    def start_schedules(self):
+        """(Re)builds the queue of [Schedules] rules and waits for the first one."""
+        if self.schedule_job is not None:
+            self.root.after_cancel(self.schedule_job)
+            self.schedule_job = None
+        self.schedule_queue = ScheduleQueue(self.settings.schedules, time.time()) if self.settings.schedules else None
+        self._arm_schedules()
+
+    def _arm_schedules(self):
+        timestamp = self.schedule_queue.next_timestamp() if self.schedule_queue is not None else None
+        if timestamp is not None:
+            delay_ms = max(1, math.ceil((timestamp - time.time()) * 1000))
+            # after() runs on the monotonic clock; waking up now and then catches
+            # wall-clock changes and suspends that would otherwise delay the rule
+            self.schedule_job = self.root.after(min(delay_ms, SCHEDULE_RECHECK_MS), self._on_schedule)
+
+    def _idle_timer(self):
+        """Returns an idle window to reuse, the main one first, or None."""
+        for timer in [self.main_timer] + self.timers:
+            if timer.is_idle():
+                return timer
+        return None
+
+    def _on_schedule(self):
+        self.schedule_job = None
+        for rule in self.schedule_queue.pop_due(time.time()):
+            # Recurring rules reuse idle windows instead of piling up new ones
+            timer = self._idle_timer()
+            if rule.start_seconds:
+                if timer is not None:
+                    timer.start_countdown(rule.start_seconds)
+                else:
+                    self.open(duration=rule.start_seconds)
+            elif timer is not None:
+                timer.ring_now() # A rule without a duration just rings the alarm
+            else:
+                # Every window is busy: ring in a new one that closes with its alarm
+                timer = self.open()
+                timer.ring_now(lambda timer=timer: self.root.after_idle(timer._on_closing))
+        self._arm_schedules()
+
+    def close_all(self):
+        """Closes every window, ending with the main one."""
+        for timer in list(self.timers):
+            timer._on_closing()
+        self.main_timer._on_closing()
+
+def run_timer(args):
+    """Runs the main countdown window."""
+    settings = load_settings()
+
+    instance = None
+    if settings.single_instance and not args.profile_startup:
+        instance = SingleInstance()
+        if not instance.acquire():
+            if instance.forward(sys.argv[1:]):
+                return
+            instance = None # The running instance did not answer: start normally
+
+    root = tk.Tk()
+    settings.drop_invalid_colors(tk_color_checker(root))
+    root.geometry("285x112")
+    root.minsize(MIN_WIDTH, MIN_HEIGHT)
+    root.attributes("-topmost", True)
+    root.configure(bg=settings.colors['bg_dark'])
+    root.title("Temporizador")
+
+    if os.path.exists(ICON):
+        root.iconbitmap(ICON)
+    else:
+        messagebox.showwarning("Advertencia", f"No se encontró el archivo de icono: {ICON}")
+
+    timer = Timer(root, settings, initial_duration=resolve_start_duration(args, settings),
+                  initial_sequence=resolve_start_sequence(args, settings))
+    timer.pack(fill=tk.BOTH, expand=1)
+
+    if args.profile_startup:
+        root.wait_visibility(root)
+        root.update_idletasks()
+        print(f"Tiempo hasta el primer cuadro: {(time.perf_counter() - STARTUP_T0) * 1000:.1f} ms")
+        root.destroy()
+        return
+
+    windows = TimerWindows(root, settings, timer)
+    root.after_idle(lambda: root.after(0, windows.restore))
+    windows.start_schedules()
+    watcher = ConfigWatcher(root, CONFIG_FILE, windows.reload_settings)
+    watcher.start()
+    if instance is not None:
+        instance.serve(root, windows.open_forwarded)
+
+    control_server = None
+    socket_path = args.control_socket or settings.control_socket
+    if socket_path:
+        if ControlServer.is_supported():
+            control_server = ControlServer(root, timer.handle_control, socket_path)
+            try:
+                control_server.start()
+            except OSError as e:
+                messagebox.showwarning("API de Control", f"No se pudo abrir el socket de control: {e}")
+                control_server = None
+            else:
+                timer.listeners.append(control_server.publish)
+        else:
+            messagebox.showwarning("API de Control", "La API de control requiere sockets Unix y no está disponible en este sistema.")
+
+    sync = None
+    sync_role = args.sync or settings.sync_role
+    if sync_role != 'off':
+        try:
+            group = parse_sync_group(args.sync_group or settings.sync_group)
+            if sync_role == 'source':
+                sync = SyncSource(root, timer.countdown, group)
+                sync.start()
+                timer.listeners.append(sync.publish)
+            else:
+                sync = SyncFollower(root, timer.apply_sync, group)
+                sync.start()
+        except (OSError, ValueError) as e:
+            messagebox.showwarning("Sincronización", f"No se pudo iniciar la sincronización: {e}")
+            sync = None
+
+    try:
+        root.mainloop()
+    finally:
+        watcher.close()
+        if sync is not None:
+            sync.close()
+        if args.metrics_dump:
+            dump_metrics(args.metrics_dump)
+        if control_server is not None:
+            control_server.close()
+        if instance is not None:
+            instance.close()
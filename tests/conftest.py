@@ -0,0 +1,36 @@
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+# Temporizador.py is a single module at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pump(interp, until, timeout=5):
+    import tkinter as tk
+    deadline = time.monotonic() + timeout
+    while not until() and time.monotonic() < deadline:
+        interp.dooneevent(tk._tkinter.DONT_WAIT)
+        time.sleep(0.005)
+
+
+@pytest.fixture(autouse=True)
+def collect_on_main_thread():
+    # A Tcl interpreter left in a reference cycle must be freed on the thread
+    # that created it, not by a collection that happens to run on a worker
+    yield
+    gc.collect()
+
+
+@pytest.fixture
+def tk_root():
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"no display: {e}")
+    yield root
+    root.destroy()
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+import Temporizador as T
+
+
+@pytest.fixture(autouse=True)
+def log_to_tmp(tmp_path, monkeypatch):
+    monkeypatch.setattr(T, "LOG_FILE", str(tmp_path / "temporizador.log"))
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class Gate:
+    """Stands in for ActionRunner._execute: 'command' actions wait until it opens."""
+    def __init__(self, execute):
+        self.execute = execute
+        self.opened = Event()
+        self.finished = []
+
+    def __call__(self, kind, argument, context):
+        if kind != 'command':
+            return self.execute(kind, argument, context)
+        self.opened.wait(5)
+        self.finished.append(argument)
+
+
+def accepted_batch(runner, caplog):
+    """Queues one action per slot while the worker is held; returns how many were accepted."""
+    gate = runner._execute = Gate(runner._execute)
+    capacity = runner.workers * T.ACTION_QUEUE_PER_WORKER
+    dropped = caplog.text.count("descartada")
+    runner.run({'event': 'expired'}, [('espera', 'command', '')] * capacity)
+    accepted = capacity - (caplog.text.count("descartada") - dropped)
+    gate.opened.set()
+    assert wait_for(lambda: len(gate.finished) == accepted)
+    runner._execute = gate.execute
+    return accepted
+
+
+def test_one_runner_per_process(monkeypatch):
+    monkeypatch.setattr(T.ActionRunner, "instance", None)
+    settings = T.Settings({}, 30)
+    assert T.ActionRunner.shared(settings) is T.ActionRunner.shared(settings)
+
+
+def test_file_action_appends_the_event(tmp_path, caplog):
+    target = tmp_path / "fin.txt"
+    runner = T.ActionRunner([('registro', 'file', str(target))])
+    with caplog.at_level(logging.INFO, logger="temporizador"):
+        runner.run({'event': 'expired', 'timer': 3})
+        assert wait_for(lambda: "registro terminada" in caplog.text)
+        # Its slot is free again: a full batch is accepted
+        assert accepted_batch(runner, caplog) == runner.workers * T.ACTION_QUEUE_PER_WORKER
+    assert json.loads(target.read_text(encoding='utf-8')) == {'event': 'expired', 'timer': 3}
+    runner.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_a_stuck_file_action_is_abandoned_after_the_timeout(tmp_path, caplog):
+    fifo = tmp_path / "fifo"
+    os.mkfifo(fifo) # open() blocks until a reader shows up
+    runner = T.ActionRunner([('registro', 'file', str(fifo))], timeout=1)
+    capacity = runner.workers * T.ACTION_QUEUE_PER_WORKER
+    with caplog.at_level(logging.INFO, logger="temporizador"):
+        started = time.monotonic()
+        runner.run({'event': 'expired'})
+        assert wait_for(lambda: "abandonada" in caplog.text)
+        assert time.monotonic() - started < 3
+        # The stuck write keeps its slot until it really returns
+        assert accepted_batch(runner, caplog) == capacity - 1
+        with open(fifo, 'rb') as reader:
+            reader.read()
+        # The slot comes back once the write returns, just after the reader sees EOF
+        assert wait_for(lambda: accepted_batch(runner, caplog) == capacity)
+    runner.shutdown()
+
+
+def test_a_failed_submit_releases_its_slot(caplog):
+    runner = T.ActionRunner([('aviso', 'command', 'true')])
+    runner.run({'event': 'expired'}, [])
+    with caplog.at_level(logging.INFO, logger="temporizador"):
+        runner.run({'event': 'expired'})
+        assert wait_for(lambda: "aviso terminada" in caplog.text)
+        runner.executor.shutdown()
+        for _ in range(runner.workers * T.ACTION_QUEUE_PER_WORKER):
+            with pytest.raises(RuntimeError):
+                runner.run({'event': 'expired'})
+        # Same slots, working pool: none of the failed submits kept a slot
+        runner.executor = ThreadPoolExecutor(max_workers=runner.workers)
+        assert accepted_batch(runner, caplog) == runner.workers * T.ACTION_QUEUE_PER_WORKER
+    runner.shutdown()
@@ -0,0 +1,54 @@
+import Temporizador as T
+
+
+class FakeChannel:
+    def __init__(self, sound):
+        self.sound = sound
+
+    def get_busy(self):
+        return False
+
+    def get_sound(self):
+        return self.sound
+
+    def stop(self):
+        pass
+
+
+class FakeSound:
+    def __init__(self, path):
+        self.plays = []
+
+    def get_length(self):
+        return 0.5
+
+    def play(self, loops=0):
+        self.plays.append(loops)
+        return FakeChannel(self)
+
+
+class FakePygame:
+    class mixer:
+        Sound = FakeSound
+
+
+def make_player():
+    scheduler = T.VirtualScheduler(T.FakeClock())
+    return scheduler, T.AlarmPlayer(scheduler, FakePygame, "alarma.wav")
+
+
+def test_repeats_are_queued_in_the_mixer_and_reported_once():
+    scheduler, alarm = make_player()
+    finished = []
+    alarm.play(3, lambda: finished.append(True))
+    assert alarm.sound.plays == [2]
+    scheduler.run_for(2 * T.NS_PER_SECOND)
+    assert finished == [True]
+
+
+def test_zero_repeats_do_not_play():
+    scheduler, alarm = make_player()
+    finished = []
+    alarm.play(0, lambda: finished.append(True))
+    assert alarm.sound.plays == []
+    assert finished == [True]
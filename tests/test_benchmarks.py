@@ -0,0 +1,74 @@
+"""Timing benchmarks of the countdown path; run with pytest-benchmark installed."""
+import pytest
+
+import Temporizador as T
+
+pytest.importorskip("pytest_benchmark")
+
+SECOND = T.NS_PER_SECOND
+
+
+def fast_forward(seconds):
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    countdown = T.Countdown(clock)
+    runner = T.CountdownRunner(scheduler, countdown, lambda remaining: None, lambda: None)
+    runner.start(seconds)
+    scheduler.jump(countdown.deadline_ns - SECOND)
+    scheduler.run_until(countdown.deadline_ns + SECOND)
+    return scheduler.wakeups
+
+
+def simulate_ticks(seconds):
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    countdown = T.Countdown(clock)
+    runner = T.CountdownRunner(scheduler, countdown, lambda remaining: T.format_clock(remaining * SECOND), lambda: None)
+    runner.start(seconds)
+    scheduler.run_until(countdown.deadline_ns + SECOND)
+    return scheduler.wakeups
+
+
+def test_fast_forward_longest_countdown(benchmark):
+    assert benchmark(fast_forward, T.MAX_DURATION_SECONDS) <= 3
+
+
+def test_one_hour_of_ticks(benchmark):
+    assert benchmark(simulate_ticks, 3600) == 3600
+
+
+def test_tick_to_display(benchmark):
+    tk = pytest.importorskip("tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("needs a display")
+    label = tk.Label(root)
+    label.pack()
+    countdown = T.Countdown()
+    countdown.start(3600)
+
+    def redraw():
+        label.config(text=T.format_clock(countdown.remaining_ns(), 2))
+        root.update_idletasks()
+
+    try:
+        benchmark(redraw)
+    finally:
+        root.destroy()
+
+
+def test_expiry_to_alarm(benchmark):
+    pygame = pytest.importorskip("pygame")
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pytest.skip("no audio device")
+    loop = T.SelectScheduler()
+    alarm = T.AlarmPlayer(loop, pygame, T.ALARMA)
+
+    def play():
+        alarm.play(1)
+        alarm.stop()
+
+    benchmark(play)
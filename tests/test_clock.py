@@ -0,0 +1,42 @@
+import temporizador_tk as TK
+
+
+class FakeFont:
+    def __init__(self, family, size, weight):
+        self.key = (family, size, weight)
+
+
+def test_font_cache_reuses_and_evicts_the_least_recent(monkeypatch):
+    monkeypatch.setattr(TK, 'Font', FakeFont)
+    cache = TK.FontCache(maxsize=2)
+    small = cache.get('Helvetica', 10)
+    large = cache.get('Helvetica', 36, 'bold')
+    assert cache.get('Helvetica', 10) is small
+    cache.get('Helvetica', 20)
+    # The 36 pt font was the least recently used one
+    assert list(cache.fonts) == [('Helvetica', 10, 'normal'), ('Helvetica', 20, 'normal')]
+    assert cache.get('Helvetica', 36, 'bold') is not large
+
+
+def test_ticks_reuse_glyph_items(tk_root):
+    fonts = TK.FontCache()
+    clock = TK.CanvasClock(tk_root, "00:00:10", fonts.get('Helvetica', 36, 'bold'), "white", "black")
+    items = dict(clock.glyphs)
+    clock.config(text="00:00:09")
+    clock.config(text="00:00:10")
+    # Only the glyphs that were never shown are new; the rest are the same items
+    assert {key: clock.glyphs[key] for key in items} == items
+    assert set(clock.glyphs) - set(items) == {(6, '0'), (7, '9')}
+    assert [clock.itemcget(item, 'text') for item in clock.shown] == list("00:00:10")
+
+
+def test_font_or_layout_change_rebuilds_the_glyphs(tk_root):
+    fonts = TK.FontCache()
+    clock = TK.CanvasClock(tk_root, "00:00:10", fonts.get('Helvetica', 36, 'bold'), "white", "black")
+    items = set(clock.glyphs.values())
+    clock.config(font=fonts.get('Helvetica', 48, 'bold'))
+    assert items.isdisjoint(clock.glyphs.values())
+    items = set(clock.glyphs.values())
+    clock.config(text="00:00:10.5")
+    assert items.isdisjoint(clock.glyphs.values())
+    assert len(clock.shown) == len("00:00:10.5")
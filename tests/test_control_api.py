@@ -0,0 +1,29 @@
+import threading
+import time
+import tkinter as tk
+
+import Temporizador as T
+
+
+def test_commands_run_on_the_main_loop(tmp_path):
+    interp = tk.Tcl()
+    seen = []
+
+    def handler(request):
+        seen.append(threading.current_thread() is threading.main_thread())
+        return {'ok': True, 'cmd': request['cmd']}
+
+    server = T.ControlServer(interp, handler, str(tmp_path / "control.sock"))
+    server.start()
+    replies = []
+    client = threading.Thread(target=lambda: replies.extend(
+        T.send_control_commands(server.path, [{'cmd': 'remaining'}, {'cmd': 'pause'}])))
+    client.start()
+    deadline = time.monotonic() + 5
+    while client.is_alive() and time.monotonic() < deadline:
+        interp.dooneevent(tk._tkinter.DONT_WAIT)
+        time.sleep(0.005)
+    client.join()
+    server.close()
+    assert replies == [{'ok': True, 'cmd': 'remaining'}, {'ok': True, 'cmd': 'pause'}]
+    assert seen == [True, True]
@@ -0,0 +1,35 @@
+import pytest
+
+import Temporizador as T
+
+
+@pytest.mark.parametrize("text, seconds", [
+    ("1h30m", 5400), ("25m", 1500), ("90s", 90), ("90", 90), ("1:30:00", 5400),
+    ("2:05", 125), (" 1H 5S ", 3605),
+])
+def test_parse_duration(text, seconds):
+    assert T.parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "0", "abc", "1:2:3:4", "1h-5m", "m", str(T.MAX_DURATION_SECONDS + 1)])
+def test_parse_duration_rejects(text):
+    with pytest.raises(ValueError):
+        T.parse_duration(text)
+
+
+def test_start_option_is_parsed_into_seconds():
+    assert T.parse_args(["--start", "25m"]).start == 1500
+    with pytest.raises(SystemExit):
+        T.parse_args(["--start", "pronto"])
+    with pytest.raises(SystemExit):
+        T.parse_args(["--start", "5m", "--preset", "te"])
+
+
+def test_presets_come_from_the_config_and_skip_bad_values(tmp_path, monkeypatch):
+    path = tmp_path / 'config.ini'
+    path.write_text("[Presets]\nTe = 3m\nlargo = 1:00:00\nroto = nunca\n", encoding='utf-8')
+    monkeypatch.setattr(T, 'CONFIG_FILE', str(path))
+    settings = T.load_settings(warn=lambda title, message: None)
+    assert settings.presets == {'te': 180, 'largo': 3600}
+    args = T.parse_args(["--preset", "TE"])
+    assert T.resolve_start_duration(args, settings) == 180
@@ -0,0 +1,148 @@
+import random
+
+import Temporizador as T
+
+SECOND = T.NS_PER_SECOND
+
+
+def start_runner(clock, scheduler, seconds):
+    countdown = T.Countdown(clock)
+    ticks = []
+    expired = []
+    runner = T.CountdownRunner(scheduler, countdown, ticks.append, lambda: expired.append(clock.now_ns()))
+    runner.start(seconds)
+    return runner, countdown, ticks, expired
+
+
+def test_fake_clock_only_moves_when_advanced():
+    clock = T.FakeClock(5)
+    assert clock.now_ns() == 5
+    clock.advance(10)
+    clock.suspend(100)
+    assert clock.now_ns() == 15
+    assert clock.since_boot_ns() == 115
+
+
+def test_virtual_scheduler_runs_jobs_in_order_and_skips_cancelled():
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    calls = []
+    scheduler.after(20, calls.append, 'b')
+    scheduler.after(10, calls.append, 'a')
+    job = scheduler.after(15, calls.append, 'x')
+    scheduler.after_cancel(job)
+    scheduler.run_for(30 * 1_000_000)
+    assert calls == ['a', 'b']
+    assert scheduler.wakeups == 2
+    assert clock.now_ns() == 30 * 1_000_000
+
+
+def test_runner_ticks_once_per_second_and_expires_on_the_deadline():
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    runner, countdown, ticks, expired = start_runner(clock, scheduler, 5)
+    deadline = countdown.deadline_ns
+    scheduler.run_until(deadline + SECOND)
+    assert ticks == [5, 4, 3, 2, 1]
+    assert expired == [deadline]
+
+
+def test_late_wakeups_do_not_accumulate():
+    rng = random.Random(1)
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock, lambda: rng.randrange(0, 30_000_000))
+    runner, countdown, ticks, expired = start_runner(clock, scheduler, 3600)
+    deadline = countdown.deadline_ns
+    scheduler.run_until(deadline + SECOND)
+    assert len(expired) == 1
+    assert 0 <= expired[0] - deadline < 30_000_000
+
+
+def test_paused_countdown_has_no_wakeups_and_keeps_its_time():
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    runner, countdown, ticks, expired = start_runner(clock, scheduler, 600)
+    scheduler.run_for(10 * SECOND)
+    runner.pause()
+    scheduler.wakeups = 0
+    scheduler.run_for(60 * SECOND)
+    assert scheduler.wakeups == 0
+    assert countdown.remaining_seconds() == 590
+    runner.resume()
+    scheduler.run_for(10 * SECOND)
+    assert countdown.remaining_seconds() == 580
+
+
+def test_suspend_is_subtracted_from_the_deadline():
+    clock = T.FakeClock()
+    countdown = T.Countdown(clock, suspend_aware=True)
+    countdown.start(60)
+    clock.suspend(20 * SECOND)
+    assert countdown.remaining_seconds() == 40
+
+
+def test_fast_forward_of_the_longest_countdown_takes_a_few_wakeups():
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    runner, countdown, ticks, expired = start_runner(clock, scheduler, T.MAX_DURATION_SECONDS)
+    deadline = countdown.deadline_ns
+    scheduler.jump(deadline - SECOND)
+    scheduler.run_until(deadline + SECOND)
+    assert expired == [deadline]
+    assert scheduler.wakeups <= 3
+
+
+def test_benchmark_mode_runs_headless(capsys):
+    T.run_benchmarks()
+    out = capsys.readouterr().out
+    assert "Avance rápido de 99:59:59" in out
+    assert "Latencia expiración-a-alarma" in out
+
+
+def test_engine_fires_each_stage_once_and_syncs_silently():
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    stages = [T.parse_threshold('10s', 'orange'), T.parse_threshold('5s', 'red, sound')]
+    settings = T.Settings(dict(T.DEFAULT_COLORS), 30, thresholds=T.ThresholdTable(stages))
+    changes = []
+    expired = []
+    engine = T.TimerEngine(scheduler, settings, lambda remaining: None,
+                           lambda index, crossed: changes.append((index, crossed)),
+                           lambda: expired.append(engine.stage_index), clock)
+    engine.runner.start(20)
+    engine.sync_stage()
+    scheduler.run_for(12 * SECOND)
+    engine.runner.pause()
+    engine.cancel_stage()
+    engine.runner.resume()
+    engine.sync_stage()
+    scheduler.run_for(9 * SECOND)
+    assert changes == [(-1, False), (0, True), (0, False), (1, True)]
+    assert expired == [1]
+
+
+def test_chained_countdown_skips_the_stages_that_ended_meanwhile():
+    clock = T.FakeClock()
+    scheduler = T.VirtualScheduler(clock)
+    stages = [10 * SECOND] * 4
+    current = [0]
+    chained = []
+
+    def on_expire():
+        following = stages[current[0] + 1:]
+        skipped = runner.skip_ended_ns(following)
+        chained.append(skipped)
+        if skipped < len(following):
+            current[0] += skipped + 1
+            runner.chain_ns(stages[current[0]])
+
+    countdown = T.Countdown(clock)
+    runner = T.CountdownRunner(scheduler, countdown, lambda remaining: None, on_expire)
+    runner.start_ns(stages[0])
+    start = countdown.deadline_ns - stages[0]
+    # The machine stalls through the first two stages and most of the third
+    scheduler.jump(25 * SECOND)
+    assert chained == [1]
+    assert current == [2]
+    assert countdown.deadline_ns == start + 30 * SECOND
+    assert countdown.remaining_seconds() == 5
@@ -0,0 +1,23 @@
+import Temporizador as T
+
+SECOND = T.NS_PER_SECOND
+
+
+def test_whole_seconds_round_up_like_the_clock():
+    assert T.format_clock(0) == "00:00:00"
+    assert T.format_clock(1) == "00:00:01"
+    assert T.format_clock(59 * SECOND + 1) == "00:01:00"
+    assert T.format_clock(3600 * SECOND) == "01:00:00"
+
+
+def test_fractions_round_up_to_the_precision():
+    assert T.format_clock(1_500_000_000, 1) == "00:00:01.5"
+    assert T.format_clock(1_500_000_001, 1) == "00:00:01.6"
+    assert T.format_clock(1_234_000_000, 2) == "00:00:01.24"
+    assert T.format_clock(59_990_000_001, 2) == "00:01:00.00"
+
+
+def test_elapsed_time_truncates_like_a_stopwatch():
+    assert T.format_elapsed(1_999_999_999) == "00:00:01.99"
+    assert T.format_elapsed(61_250_000_000, 3) == "00:01:01.250"
+    assert T.format_elapsed(0, 1) == "00:00:00.0"
@@ -0,0 +1,42 @@
+import time
+
+import Temporizador as T
+
+
+def day_start(text):
+    return int(time.mktime(time.strptime(text, "%Y-%m-%d")))
+
+
+def test_stats_aggregate_per_local_day(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    history = T.SessionHistory(path)
+    first, second = day_start("2026-05-04") + 3600, day_start("2026-05-05") + 3600
+    history.record(first, first + 600, 600_000, 600_000, 0, 0, 'completed')
+    history.record(first + 900, first + 1000, 1_500_000, 100_000, 30_000, 1, 'cancelled')
+    history.record(second, second + 60, 60_000, 60_000, 0, 0, 'completed')
+    history.close()
+    assert T.history_stats(path) == [("2026-05-04", 2, 1, 1, 700_000), ("2026-05-05", 1, 1, 0, 60_000)]
+    # --since/--until select [since, until)
+    assert T.history_stats(path, since=day_start("2026-05-05")) == [("2026-05-05", 1, 1, 0, 60_000)]
+    assert T.history_stats(path, until=day_start("2026-05-05")) == [("2026-05-04", 2, 1, 1, 700_000)]
+
+
+def test_stats_without_history(tmp_path, monkeypatch, capsys):
+    assert T.history_stats(str(tmp_path / "none.sqlite")) == []
+    monkeypatch.setattr(T, 'HISTORY_FILE', str(tmp_path / "none.sqlite"))
+    assert T.run_stats(T.parse_args(["--stats"])) == 0
+    assert "No hay temporizadores" in capsys.readouterr().out
+
+
+def test_stats_report_totals(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "history.sqlite")
+    history = T.SessionHistory(path)
+    start = day_start("2026-05-04") + 3600
+    history.record(start, start + 60, 60_000, 60_000, 0, 0, 'completed')
+    history.record(start + 120, start + 150, 60_000, 30_000, 0, 0, 'cancelled')
+    history.close()
+    monkeypatch.setattr(T, 'HISTORY_FILE', path)
+    assert T.run_stats(T.parse_args(["--stats", "--since", "2026-05-01"])) == 0
+    out = capsys.readouterr().out
+    assert "2026-05-04" in out and "00:01:30" in out
+    assert "Completados: 50%" in out
@@ -0,0 +1,26 @@
+import Temporizador as T
+
+
+def test_live_timers_survive_a_reload(tmp_path):
+    journal = T.StateJournal(str(tmp_path / "j"))
+    journal.record('S', 0, 123)
+    journal.record('P', 1, 456)
+    journal.record('S', 2, 789)
+    journal.record('C', 2)
+    assert T.StateJournal(journal.path).load() == {0: ('S', 123), 1: ('P', 456)}
+
+
+def test_each_process_claims_its_own_slot(tmp_path):
+    path = str(tmp_path / "j")
+    first, first_lock = T.StateJournal._claim_slot(path)
+    second, second_lock = T.StateJournal._claim_slot(path)
+    assert (first, second) == (path, path + ".1")
+
+    T.StateJournal(first).record('S', 0, 1)
+    T.StateJournal(second).record('S', 0, 2)
+    assert T.StateJournal(first).load() == {0: ('S', 1)}
+    assert T.StateJournal(second).load() == {0: ('S', 2)}
+
+    # A slot is free again once its owner is gone
+    first_lock.close()
+    assert T.StateJournal._claim_slot(path)[0] == path
@@ -0,0 +1,16 @@
+import csv
+
+import Temporizador as T
+
+
+def test_lap_file_has_unique_columns(tmp_path):
+    path = tmp_path / "vueltas.csv"
+    writer = T.LapWriter(str(path))
+    writer.write(1, 1_500_000_000, 1_500_000_000)
+    writer.write(2, 2_000_000_000, 3_500_000_000)
+    writer.close()
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == ['numero', 'vuelta_ns', 'total_ns', 'vuelta', 'total']
+    assert [row['numero'] for row in rows] == ['1', '2']
+    assert rows[1]['total_ns'] == '3500000000'
@@ -0,0 +1,27 @@
+import Temporizador as T
+
+
+def test_summary_reports_percentiles_and_the_total_count():
+    metrics = T.TickMetrics(size=100)
+    for value in range(1, 101):
+        metrics.record('lateness', value)
+    count, p50, p99, peak = metrics.summary()['lateness']
+    assert (count, p50, p99, peak) == (100, 50, 99, 100)
+    assert 'render' not in metrics.summary()
+
+
+def test_ring_buffer_keeps_only_the_latest_samples():
+    metrics = T.TickMetrics(size=4)
+    for value in (1000, 1000, 1000, 1000, 1, 2, 3):
+        metrics.record('alarm', value)
+    count, p50, p99, peak = metrics.summary()['alarm']
+    # Three of the four slots were overwritten; the count still includes every sample
+    assert count == 7
+    assert (p50, peak) == (2, 1000)
+
+
+def test_format_without_samples():
+    assert T.TickMetrics(size=4).format() == "Sin muestras todavía."
+    metrics = T.TickMetrics(size=4)
+    metrics.record('render', 2_000_000)
+    assert metrics.format().startswith("Dibujo: p50 2.00 ms")
@@ -0,0 +1,47 @@
+import datetime
+import time
+
+import pytest
+
+import Temporizador as T
+
+
+@pytest.fixture
+def madrid(monkeypatch):
+    if not hasattr(time, 'tzset'):
+        pytest.skip("time.tzset is not available")
+    monkeypatch.setenv('TZ', 'Europe/Madrid')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def local(*fields):
+    return datetime.datetime(*fields).timestamp()
+
+
+def test_time_in_the_spring_gap_fires_at_the_change(madrid):
+    rule = T.ScheduleRule('gap', 'at 02:30')
+    # 2026-03-29: 02:00 CET becomes 03:00 CEST at 01:00 UTC
+    change = datetime.datetime(2026, 3, 29, 1, tzinfo=datetime.timezone.utc).timestamp()
+    assert rule.next_fire(local(2026, 3, 29, 0, 0)) == change
+    assert rule.next_fire(change) == local(2026, 3, 30, 2, 30)
+
+
+def test_repeated_autumn_time_fires_once(madrid):
+    rule = T.ScheduleRule('fold', 'at 02:30')
+    # 2026-10-25: 03:00 CEST becomes 02:00 CET, so 02:30 happens twice
+    first = datetime.datetime(2026, 10, 25, 0, 30, tzinfo=datetime.timezone.utc).timestamp()
+    assert rule.next_fire(local(2026, 10, 25, 0, 0)) == first
+    assert rule.next_fire(first) == local(2026, 10, 26, 2, 30)
+
+
+def test_interval_rule_keeps_local_time_across_the_change(madrid):
+    rule = T.ScheduleRule('cada', 'every 30m from 01:00 to 04:00')
+    fires = []
+    now = local(2026, 3, 29, 0, 0)
+    for _ in range(5):
+        now = rule.next_fire(now)
+        fires.append(datetime.datetime.fromtimestamp(now).strftime('%H:%M'))
+    assert fires == ['01:00', '01:30', '03:00', '03:30', '04:00']
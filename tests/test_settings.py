@@ -0,0 +1,71 @@
+import Temporizador as T
+
+
+def is_color(value):
+    return value in ('white', 'orange', 'red', 'yellow') or value.startswith('#')
+
+
+def test_invalid_colors_fall_back_and_their_stages_are_skipped():
+    colors = dict(T.DEFAULT_COLORS, clock_color_red='rojizo')
+    stages = [T.parse_threshold('10m', 'yellow'), T.parse_threshold('5m', 'amarillo, blink'),
+              T.parse_threshold('1m', 'clock_color_red, sound')]
+    settings = T.Settings(colors, 30, thresholds=T.ThresholdTable(stages))
+    settings.drop_invalid_colors(is_color)
+    assert settings.colors['clock_color_red'] == 'red'
+    # The stage naming a [Colors] key follows the key's fallback
+    assert [stage[0] for stage in settings.thresholds.stages] == [600, 60]
+
+
+def test_reload_keeps_the_current_color():
+    settings = T.Settings(dict(T.DEFAULT_COLORS, bg_dark='nada'), 30)
+    settings.drop_invalid_colors(is_color, dict(T.DEFAULT_COLORS, bg_dark='#000000'))
+    assert settings.colors['bg_dark'] == '#000000'
+
+
+def test_parse_threshold_options():
+    seconds, color, blink, sound, action = T.parse_threshold('10s', 'red, blink, action: command: echo a, b')
+    assert (seconds, color, blink, sound) == (10, 'red', True, False)
+    assert action == ('10s', 'command', 'echo a, b')
+
+
+def fail_dialog(*args):
+    raise AssertionError("no Tk dialog expected")
+
+
+def test_load_settings_reports_through_the_callback(tmp_path, monkeypatch):
+    monkeypatch.setattr(T, 'CONFIG_FILE', str(tmp_path / 'missing' / 'config.ini'))
+    monkeypatch.setattr("tkinter.messagebox.showwarning", fail_dialog)
+    warnings = []
+    settings = T.load_settings(warn=lambda title, message: warnings.append(title))
+    assert warnings == ["Error de Archivo"]
+    assert settings.alarm_repeat_count == 30
+
+
+def test_unknown_preset_is_reported_through_the_callback(monkeypatch):
+    monkeypatch.setattr("tkinter.messagebox.showerror", fail_dialog)
+    args = T.parse_args(['--preset', 'nada'])
+    errors = []
+    duration = T.resolve_start_duration(args, T.Settings(None, 30), lambda title, message: errors.append(title))
+    assert duration is None
+    assert errors == ["Preajuste"]
+
+
+def test_existing_config_is_not_rewritten(tmp_path, monkeypatch):
+    path = tmp_path / 'config.ini'
+    text = "# Mis colores\n[Colors]\nbg_dark = #101010\n\n[Settings]\nalarm_repeat_count = 5\n"
+    path.write_text(text, encoding='utf-8')
+    monkeypatch.setattr(T, 'CONFIG_FILE', str(path))
+    settings = T.load_settings(warn=fail_dialog)
+    assert path.read_text(encoding='utf-8') == text
+    assert settings.colors['bg_dark'] == '#101010'
+    assert settings.alarm_repeat_count == 5
+    assert settings.colors['clock_color_red'] == T.DEFAULT_COLORS['clock_color_red']
+    assert settings.presets['pomodoro'] == 25 * 60
+
+
+def test_missing_config_is_created(tmp_path, monkeypatch):
+    path = tmp_path / 'config.ini'
+    monkeypatch.setattr(T, 'CONFIG_FILE', str(path))
+    T.load_settings(warn=fail_dialog)
+    written = path.read_text(encoding='utf-8')
+    assert '[Settings]' in written and '[Presets]' in written and '[Thresholds]' in written
@@ -0,0 +1,55 @@
+import threading
+import time
+import tkinter as tk
+
+import Temporizador as T
+from conftest import pump
+
+
+def test_forwarded_launches_reach_the_main_loop(tmp_path):
+    interp = tk.Tcl()
+    first = T.SingleInstance(str(tmp_path / "lock"), str(tmp_path / "instance"))
+    assert first.acquire()
+    launches = []
+    first.serve(interp, launches.append)
+
+    second = T.SingleInstance(str(tmp_path / "lock"), str(tmp_path / "instance"))
+    assert not second.acquire()
+    replies = []
+    for argv in (["--start", "5m"], ["--preset", "te"]):
+        sender = threading.Thread(target=lambda argv=argv: replies.append(second.forward(argv)))
+        sender.start()
+        # The reply only comes once the launch has run on the main loop
+        pump(interp, lambda: not sender.is_alive())
+        sender.join()
+    assert launches == [["--start", "5m"], ["--preset", "te"]]
+    assert replies == [True, True]
+    first.close()
+
+
+def test_a_failing_launch_does_not_stop_the_accept_loop(tmp_path):
+    interp = tk.Tcl()
+    first = T.SingleInstance(str(tmp_path / "lock"), str(tmp_path / "instance"))
+    assert first.acquire()
+    launches = []
+
+    def on_launch(argv):
+        launches.append(argv)
+        if len(launches) == 1:
+            raise RuntimeError("main thread is not in main loop")
+
+    first.serve(interp, on_launch)
+    second = T.SingleInstance(str(tmp_path / "lock"), str(tmp_path / "instance"))
+    for argv in (["a"], ["b"]):
+        sender = threading.Thread(target=second.forward, args=(argv,))
+        sender.start()
+        deadline = time.monotonic() + 5
+        while sender.is_alive() and time.monotonic() < deadline:
+            try:
+                interp.dooneevent(tk._tkinter.DONT_WAIT)
+            except RuntimeError:
+                pass
+            time.sleep(0.005)
+        sender.join()
+    assert launches == [["a"], ["b"]]
+    first.close()
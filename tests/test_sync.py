@@ -0,0 +1,45 @@
+import tkinter as tk
+
+import pytest
+
+import Temporizador as T
+from conftest import pump
+
+GROUP = ("239.255.42.99", 47998)
+
+
+def last_seq(received):
+    return max(message['seq'] for message, _ in received)
+
+
+def test_followers_mirror_the_source_deadline():
+    interp = tk.Tcl()
+    countdown = T.Countdown()
+    source = T.SyncSource(interp, countdown, GROUP)
+    updates = [[], []]
+    followers = [T.SyncFollower(interp, lambda message, offset_ns, received=received: received.append((message, offset_ns)),
+                                GROUP) for received in updates]
+    try:
+        for follower in followers:
+            follower.start()
+        source.start()
+    except OSError as e:
+        pytest.skip(f"multicast is not available: {e}")
+    try:
+        # The timer notifies 'started' once the countdown runs
+        countdown.start_ns(60 * T.NS_PER_SECOND)
+        source.publish({'event': 'started'})
+        pump(interp, lambda: all(any(m['state'] == 'running' for m, _ in received) for received in updates))
+        first_seqs = [last_seq(received) for received in updates]
+        # The heartbeat keeps publishing while the countdown runs
+        pump(interp, lambda: all(last_seq(received) > seq for received, seq in zip(updates, first_seqs)), timeout=3)
+        for received in updates:
+            running = [(m, offset) for m, offset in received if m['state'] == 'running']
+            assert len(running) >= 2
+            for message, offset_ns in running:
+                # Same machine: the follower's view of the deadline matches the source's
+                assert abs(message['deadline'] - offset_ns - countdown.deadline_ns) < T.SYNC_TOLERANCE_NS
+    finally:
+        source.close()
+        for follower in followers:
+            follower.close()
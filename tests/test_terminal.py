@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import Temporizador as T
+
+# Builds the --terminal frontend the way run_terminal() does, with stand-ins
+# for the curses screen, and reports whether tkinter got imported
+TERMINAL_PATH = textwrap.dedent("""
+    import sys
+    import Temporizador as T
+
+    class Screen:
+        def getmaxyx(self):
+            return (24, 80)
+
+    class Curses:
+        def beep(self):
+            pass
+
+    T.CONFIG_FILE = sys.argv[1]
+    settings = T.load_settings(warn=T.print_error)
+    args = T.parse_args(["--terminal", "--preset", "te"])
+    duration = T.resolve_start_duration(args, settings, T.print_error)
+    timer = T.TerminalTimer(Screen(), settings, Curses())
+    timer.engine.actions.shutdown()
+    print(duration, "tkinter" in sys.modules)
+""")
+
+
+def test_terminal_path_does_not_load_tkinter(tmp_path):
+    # A fresh interpreter, since this test session may already have imported tkinter
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(T.__file__)))
+    result = subprocess.run([sys.executable, "-c", TERMINAL_PATH, str(tmp_path / "config.ini")],
+                            capture_output=True, text=True, env=env, timeout=30)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["180", "False"]
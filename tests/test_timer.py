@@ -0,0 +1,57 @@
+import Temporizador as T
+import temporizador_tk as TK
+
+
+def test_expiry_without_audio_leaves_the_timer_idle(tk_root, tmp_path, monkeypatch):
+    for name in ('JOURNAL_FILE', 'HISTORY_FILE', 'INSTRUCTIONS_FILE'):
+        monkeypatch.setattr(TK, name, str(tmp_path / name.lower()))
+    # alarm_repeat_count = 0 is one of the ways the alarm cannot play
+    timer = TK.Timer(tk_root, T.Settings(dict(T.DEFAULT_COLORS), 0))
+    timer._begin_countdown(60 * T.NS_PER_SECOND)
+    assert timer._state() == 'running'
+    timer.runner.stop()
+    timer._timer_end()
+    assert not timer.playing
+    assert timer._state() == 'idle'
+    timer._begin_countdown(60 * T.NS_PER_SECOND)
+    assert timer._state() == 'running'
+    timer._cancel()
+
+
+class DueRules:
+    def __init__(self, rules):
+        self.rules = rules
+
+    def pop_due(self, now_ts):
+        rules, self.rules = self.rules, []
+        return rules
+
+    def next_timestamp(self):
+        return None
+
+
+def test_schedules_reuse_idle_windows(tk_root, tmp_path, monkeypatch):
+    for name in ('JOURNAL_FILE', 'HISTORY_FILE', 'INSTRUCTIONS_FILE'):
+        monkeypatch.setattr(TK, name, str(tmp_path / name.lower()))
+    settings = T.Settings(dict(T.DEFAULT_COLORS), 0)
+    windows = TK.TimerWindows(tk_root, settings, TK.Timer(tk_root, settings))
+    for _ in range(3):
+        windows.schedule_queue = DueRules([T.ScheduleRule('te', 'at 17:00')])
+        windows._on_schedule()
+        tk_root.update()
+    assert windows.timers == []
+    windows.schedule_queue = DueRules([T.ScheduleRule('te', 'at 17:00 start 3m')] * 2)
+    windows._on_schedule()
+    assert windows.main_timer._state() == 'running'
+    assert len(windows.timers) == 1 and windows.timers[0]._state() == 'running'
+    windows.close_all()
+
+
+def test_instant_start_defers_the_setup_widgets(tk_root, tmp_path, monkeypatch):
+    for name in ('JOURNAL_FILE', 'HISTORY_FILE', 'INSTRUCTIONS_FILE'):
+        monkeypatch.setattr(TK, name, str(tmp_path / name.lower()))
+    timer = TK.Timer(tk_root, T.Settings(dict(T.DEFAULT_COLORS), 0), initial_duration=60)
+    assert timer._state() == 'running'
+    assert not timer.setup_built
+    timer._cancel()
+    assert timer.setup_built
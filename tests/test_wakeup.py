@@ -0,0 +1,66 @@
+import threading
+
+import Temporizador as T
+
+
+class NoFileHandlerRoot:
+    """Tk root stand-in without createfilehandler, as on Windows."""
+    def __init__(self):
+        self.tk = object()
+        self.bindings = {}
+        self.idle = []
+        self.timers = 0
+        self.posted = []
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def unbind(self, sequence):
+        del self.bindings[sequence]
+
+    def after(self, ms, func):
+        self.timers += 1
+
+    def after_idle(self, func):
+        self.idle.append(func)
+        return 'idle'
+
+    def after_cancel(self, job):
+        pass
+
+    def event_generate(self, sequence, when):
+        self.posted.append(sequence)
+
+    def run_pending(self):
+        for func in self.idle:
+            func()
+        self.idle = []
+        posted, self.posted = self.posted, []
+        for sequence in posted:
+            self.bindings[sequence](None)
+
+
+def test_without_file_handlers_nothing_runs_until_a_wakeup():
+    root = NoFileHandlerRoot()
+    calls = []
+    wakeup = T.MainLoopWakeup(root, lambda: calls.append(threading.current_thread()))
+    wakeup.start()
+    root.run_pending()
+    assert calls == [] and root.timers == 0 # No polling while idle
+    worker = threading.Thread(target=wakeup.wake)
+    worker.start()
+    worker.join()
+    root.run_pending()
+    assert calls == [threading.main_thread()]
+    wakeup.close()
+    assert root.bindings == {}
+
+
+def test_wakeup_before_the_main_loop_is_kept():
+    root = NoFileHandlerRoot()
+    calls = []
+    wakeup = T.MainLoopWakeup(root, lambda: calls.append(1))
+    wakeup.start()
+    wakeup.pending.set() # wake() whose event could not be posted yet
+    root.run_pending()
+    assert calls == [1]